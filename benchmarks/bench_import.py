@@ -0,0 +1,80 @@
+"""
+Import-time benchmark: cumulative `-X importtime` cost of the package entry
+points, measured in fresh interpreters, against a fixed budget.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--budget-ms 150] [--top 10]
+
+Exits with status 1 if the best run of any module exceeds the budget or
+pulls in one of the heavy dependencies that must stay lazy.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = ["dcl_agent", "dcl_agent.agent"]
+
+# Only imported once an agent parses, loads YAML or builds a Gemini client.
+LAZY_DEPENDENCIES = ("google.genai", "lark", "yaml")
+
+def import_profile(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Imports module in a fresh interpreter under -X importtime.
+    Returns {imported module: (self us, cumulative us)}.
+    """
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT / "src"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, check=True
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+def measure(module: str, repeat: int) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Returns the best cumulative import time (ms) of module and that run's profile."""
+    best_ms, best_profile = float("inf"), {}
+    for _ in range(repeat):
+        profile = import_profile(module)
+        ms = profile[module][1] / 1000
+        if ms < best_ms:
+            best_ms, best_profile = ms, profile
+    return best_ms, best_profile
+
+def eager_dependencies(profile: Dict[str, Tuple[int, int]]) -> List[str]:
+    return sorted(
+        name for name in profile
+        if any(name == dep or name.startswith(dep + ".") for dep in LAZY_DEPENDENCIES)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module (best run is kept)")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="max cumulative import time per module")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports listed per module")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        ms, profile = measure(module, args.repeat)
+        eager = eager_dependencies(profile)
+        status = "OK" if ms <= args.budget_ms and not eager else "OVER BUDGET"
+        failed = failed or status != "OK"
+        print(f"{module:<20} {ms:8.1f} ms  (budget {args.budget_ms:.0f} ms)  {status}")
+        for name, (self_us, _) in sorted(profile.items(), key=lambda item: -item[1][0])[:args.top]:
+            print(f"    {self_us / 1000:7.2f} ms  {name}")
+        if eager:
+            print(f"    eagerly imported: {', '.join(eager)}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
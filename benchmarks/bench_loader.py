@@ -0,0 +1,105 @@
+"""
+Load-time benchmark: header-sniffing Loader vs. a full parse of every file
+(libyaml-backed safe loader when available, registered in one transaction).
+
+Usage:
+    python benchmarks/bench_loader.py [--files 2000] [--repeat 5]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from dcl_agent.exceptions import DuplicateIdWarning
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import PromptModule
+from synthetic import generate_bundle
+
+def load_full_parse(bundle_paths):
+    """Baseline: every file is read and parsed in full, one transaction per bundle."""
+    yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    registry = PromptModuleRegistry()
+    loader = Loader(registry)
+    for path in bundle_paths:
+        root = Path(path)
+        with registry.transaction(), warnings.catch_warnings():
+            warnings.simplefilter("ignore", DuplicateIdWarning)
+            for file_path in loader._scan(root):
+                content = file_path.read_text(encoding="utf-8")
+                module_id, module_type, version, metadata = None, "RESOURCE", "1.0", {}
+                if file_path.suffix in (".yaml", ".yml"):
+                    try:
+                        data = yaml.load(content, Loader=yaml_loader)
+                    except yaml.YAMLError:
+                        data = None
+                    if isinstance(data, dict):
+                        version = data.get("version", version)
+                        module_type = data.get("type", module_type)
+                        module_id = f"{data.get('id')}/{version}"
+                        metadata = data
+                module_id = module_id or Loader._fallback_id(file_path, root)
+                registry.register(PromptModule(
+                    id=module_id, version=str(version), type=str(module_type),
+                    content=content, metadata=metadata, path=str(file_path)
+                ))
+    return registry
+
+def load_loader(bundle_paths, **loader_kwargs):
+    registry = PromptModuleRegistry()
+    loader = Loader(registry, **loader_kwargs)
+    for path in bundle_paths:
+        loader.load_from_directory(path)
+    return registry
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def run(name, bundle_paths, repeat):
+    baseline = measure(lambda: load_full_parse(bundle_paths), repeat)
+    print(f"{name}")
+    print(f"  full parse per file          : {baseline * 1000:9.1f} ms")
+    for label, kwargs in [
+        ("Loader (header sniffing)", {}),
+        ("Loader lazy=True", {"lazy": True}),
+        ("Loader max_workers=4", {"max_workers": 4, "executor": "process"}),
+    ]:
+        elapsed = measure(lambda: load_loader(bundle_paths, **kwargs), repeat)
+        print(f"  {label:29}: {elapsed * 1000:9.1f} ms  (x{baseline / elapsed:.2f})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="files per synthetic bundle")
+    parser.add_argument("--duplicates", type=float, default=0.3, help="duplicate ID ratio")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"libyaml available: {yaml.__with_libyaml__}")
+    run("dcl-core + dcl-god-mode", [str(REPO_ROOT / "dcl-core"), str(REPO_ROOT / "dcl-god-mode")], args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # One bundle, nothing to shadow: headers are not sniffed.
+        single = generate_bundle(Path(tmp), "single", files=args.files, seed=3)
+        run(f"synthetic 1 x {args.files} files, no duplicates", [single], args.repeat)
+
+        # Two bundles sharing a namespace: the second one is mostly shadowed.
+        first = generate_bundle(Path(tmp), "base", files=args.files, duplicate_ratio=args.duplicates, seed=1)
+        second = generate_bundle(Path(tmp), "overlay", files=args.files, id_prefix="base", seed=2)
+        run(f"synthetic 2 x {args.files} files", [first, second], args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Multi-process memory benchmark: N worker processes each loading the bundle
+into their own registry vs. attaching one shared RegistryPack.
+
+Every worker reads all module contents once (as serving traffic would),
+then reports its private and proportional memory (Linux smaps_rollup).
+With a pack the bodies live in shared file pages, so private memory per
+worker stays flat as the bundle grows.
+
+Usage:
+    python benchmarks/bench_pack_workers.py [--workers 4] [--files 5000] [--file-size 4000]
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.pack import RegistryPack, pack_registry
+from dcl_agent.loader.registry import PromptModuleRegistry
+from synthetic import generate_bundle
+
+def memory_kb() -> dict:
+    """Private (Private_Clean + Private_Dirty) and proportional set size, in kB."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {"private": values["Private_Clean"] + values["Private_Dirty"], "pss": values["Pss"]}
+
+def worker(mode: str, source: str, queue) -> None:
+    registry = PromptModuleRegistry()
+    if mode == "pack":
+        registry.attach_pack(RegistryPack(source))
+    else:
+        Loader(registry).load_bundles([source])
+    for module_id in registry.list_modules():
+        registry.get(module_id)
+    queue.put(memory_kb())
+
+def run(mode: str, source: str, workers: int) -> list:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = [context.Process(target=worker, args=(mode, source, queue)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--file-size", type=int, default=4000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = generate_bundle(Path(tmp), "bench", files=args.files, file_size=args.file_size)
+        pack_path = str(Path(tmp) / "bench.pack")
+        registry = PromptModuleRegistry()
+        Loader(registry).load_bundles([bundle])
+        pack_registry(registry, pack_path)
+        content_mb = sum(len(registry.get(m).content or "") for m in registry.list_modules()) / 2**20
+
+        print(f"{args.files} modules, {content_mb:.1f} MB of content, {args.workers} workers")
+        for mode, source in (("directory", bundle), ("pack", pack_path)):
+            results = run(mode, source, args.workers)
+            private = sum(usage["private"] for usage in results) / 1024
+            pss = sum(usage["pss"] for usage in results) / 1024
+            print(f"  {mode:<10} private {private:8.1f} MB total ({private / args.workers:6.1f} MB/worker)   pss {pss:8.1f} MB total")
+
+if __name__ == "__main__":
+    main()
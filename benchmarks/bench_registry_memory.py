@@ -0,0 +1,90 @@
+"""
+Registry memory benchmark: bytes per module for the legacy model layout
+(dataclasses with a per-instance __dict__, full YAML metadata retained)
+vs. the slotted layout, with and without metadata.
+
+Usage:
+    python benchmarks/bench_registry_memory.py [--modules 100000] [--file-size 400]
+"""
+import argparse
+import dataclasses
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from dcl_agent.loader import loader as loader_module
+from dcl_agent.loader.content_store import ContentStore
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import PromptModule
+from synthetic import generate_bundle
+
+def legacy_layout(cls):
+    """
+    The same dataclass without slots (per-instance __dict__), as PromptModule
+    was before; derived from the model so both keep the same fields.
+    """
+    fields = []
+    for f in dataclasses.fields(cls):
+        field = dataclasses.field(default=f.default, default_factory=f.default_factory)
+        fields.append((f.name, f.type, field))
+    field_names = {f.name for f in dataclasses.fields(cls)}
+    namespace = {
+        name: value for name, value in vars(cls).items()
+        if not name.startswith("__") and name not in field_names
+    }
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", fields, namespace=namespace)
+
+LegacyPromptModule = legacy_layout(PromptModule)
+
+def measure(bundle: str, legacy: bool, keep_metadata: bool):
+    """Returns (modules, traced bytes held by registry + loader, load seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    patch = mock.patch.object(loader_module, "PromptModule", LegacyPromptModule) if legacy else mock.MagicMock()
+    with patch:
+        registry = PromptModuleRegistry(content_store=ContentStore())
+        loader = Loader(registry, keep_metadata=keep_metadata)
+        loader.load_bundles([bundle])
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    count = len(registry.list_modules())
+    del registry, loader
+    return count, held, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=100_000)
+    parser.add_argument("--file-size", type=int, default=400, help="approximate characters per module file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        bundle = generate_bundle(Path(tmp), "bench", files=args.modules, file_size=args.file_size, seed=1)
+        print(f"generated {args.modules} modules in {time.perf_counter() - start:.1f}s")
+
+        results = []
+        for label, legacy, keep_metadata in [
+            ("before: dict dataclasses + metadata", True, True),
+            ("after:  slotted + metadata", False, True),
+            ("after:  slotted, keep_metadata=False", False, False),
+        ]:
+            count, held, elapsed = measure(bundle, legacy, keep_metadata)
+            results.append(held / count)
+            print(f"  {label:37}: {held / count:8.0f} bytes/module  ({held / 2**20:7.1f} MiB, load {elapsed:.1f}s)")
+        print(f"  saved per module: {results[0] - results[2]:.0f} bytes ({1 - results[2] / results[0]:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Benchmark suite: load, parse, assemble and execute on a synthetic bundle.
+Prints a JSON report (or writes it with --output) and can compare it with
+a previous report.
+
+Usage:
+    python benchmarks/suite.py [--files 1000] [--file-size 2000] [--yaml-ratio 0.8]
+                               [--aliases 50] [--duplicates 0.1] [--repeat 5]
+                               [--output report.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from dcl_agent import __version__
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.exceptions import DuplicateIdWarning
+from dcl_agent.loader.loader import Loader, pack_bundle
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.parser.parser import DCLParser
+from dcl_agent.strategies.concat import ConcatenationStrategy
+from dcl_agent.strategies.gemini import GeminiNativeStrategy
+from synthetic import generate_bundle
+
+def timed(fn: Callable[[], object], repeat: int, ops: int = 1) -> Dict[str, float]:
+    """Runs fn `repeat` times; `ops` is the number of operations one run performs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "repeat": repeat,
+        "ops": ops,
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "per_op_us": median / ops * 1e6,
+    }
+
+def make_instructions(registry: PromptModuleRegistry, count: int, seed: int) -> List[str]:
+    """Distinct DCL instructions referencing modules of the synthetic bundle."""
+    rng = random.Random(seed)
+    operators = registry.list_modules(module_type="OPERATOR")
+    modifiers = registry.list_modules(module_type="MODIFIER")
+    goals = registry.list_modules(module_type="GOAL")
+    sources = registry.list_modules(module_type="RESOURCE")
+    instructions = []
+    for n in range(count):
+        text = f"{rng.choice(operators)} 'Topic {n}'"
+        if sources:
+            text += f" FROM '{rng.choice(sources)}'"
+        if modifiers:
+            text += f" USING '{rng.choice(modifiers)}', '{rng.choice(modifiers)}'"
+        if goals:
+            text += f" OPTIMIZING_FOR '{rng.choice(goals)}'"
+        instructions.append(text)
+    return instructions
+
+def run_suite(bundle: str, repeat: int, requests: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+
+    def load(path=bundle, **kwargs):
+        Loader(PromptModuleRegistry(), **kwargs).load_bundles([path])
+
+    results["load"] = timed(load, repeat)
+    results["load_lazy"] = timed(lambda: load(lazy=True), repeat)
+    results["load_parallel"] = timed(lambda: load(max_workers=4, executor="process"), repeat)
+    packed = str(Path(bundle).with_suffix(".dclpack"))
+    pack_bundle(bundle, packed)
+    results["load_packed"] = timed(lambda: load(packed), repeat)
+
+    registry = PromptModuleRegistry()
+    Loader(registry).load_bundles([bundle])
+    instructions = make_instructions(registry, requests, seed=0)
+
+    parser = DCLParser()
+    results["parse"] = timed(lambda: [parser.parse(text) for text in instructions], repeat, len(instructions))
+
+    parsed = [parser.parse(text) for text in instructions]
+    for name, strategy in [
+        ("assemble_gemini", GeminiNativeStrategy()),
+        ("assemble_gemini_prefix_stable", GeminiNativeStrategy(prefix_stable=True)),
+        ("assemble_concat", ConcatenationStrategy()),
+    ]:
+        view = registry.view()
+        results[name] = timed(lambda: [strategy.assemble(i, view) for i in parsed], repeat, len(parsed))
+
+    for name, cache_size in [("execute", 0), ("execute_context_cache", len(instructions))]:
+        agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(), context_cache_size=cache_size)
+        results[name] = timed(lambda: [agent.execute(text) for text in instructions], repeat, len(instructions))
+        agent.close()
+    return results
+
+def compare(report: dict, baseline: dict) -> None:
+    print(f"{'benchmark':32} {'baseline':>12} {'current':>12} {'change':>8}", file=sys.stderr)
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        change = result["per_op_us"] / before["per_op_us"] - 1
+        print(
+            f"{name:32} {before['per_op_us']:10.1f}us {result['per_op_us']:10.1f}us {change:+8.1%}",
+            file=sys.stderr
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000, help="module files in the synthetic bundle")
+    parser.add_argument("--file-size", type=int, default=2000, help="approximate characters per file")
+    parser.add_argument("--yaml-ratio", type=float, default=0.8, help="share of YAML modules (rest is raw text)")
+    parser.add_argument("--aliases", type=int, default=50, help="aliases in index.yaml")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="share of YAML modules with a duplicate ID")
+    parser.add_argument("--requests", type=int, default=200, help="distinct instructions for parse/assemble/execute")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="previous JSON report to print a comparison against")
+    args = parser.parse_args()
+
+    params = {
+        "files": args.files,
+        "file_size": args.file_size,
+        "yaml_ratio": args.yaml_ratio,
+        "aliases": args.aliases,
+        "duplicate_ratio": args.duplicates,
+        "requests": args.requests,
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+    with tempfile.TemporaryDirectory() as tmp, warnings.catch_warnings():
+        warnings.simplefilter("ignore", DuplicateIdWarning)
+        bundle = generate_bundle(
+            Path(tmp), "bench",
+            files=args.files,
+            file_size=args.file_size,
+            yaml_ratio=args.yaml_ratio,
+            duplicate_ratio=args.duplicates,
+            aliases=args.aliases,
+            seed=args.seed
+        )
+        results = run_suite(bundle, args.repeat, args.requests)
+
+    report = {
+        "meta": {
+            "dcl_agent_version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "params": params,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Synthetic bundle generator for benchmarks.
+"""
+import random
+from pathlib import Path
+from typing import List, Optional
+
+import yaml
+
+_WORDS = (
+    "context frame module operator modifier lens goal source entity instruction "
+    "registry bundle alias ontology grammar schema prompt agent invocation assemble"
+).split()
+
+def _text(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+def generate_bundle(
+    root: Path,
+    name: str,
+    files: int = 1000,
+    file_size: int = 2000,
+    yaml_ratio: float = 0.8,
+    duplicate_ratio: float = 0.0,
+    aliases: int = 0,
+    id_prefix: Optional[str] = None,
+    seed: int = 0
+) -> str:
+    """
+    Writes a bundle of synthetic prompt modules and returns its path.
+
+    Args:
+        root: Directory the bundle folder is created in.
+        name: Bundle folder name.
+        files: Number of module files.
+        file_size: Approximate size of every file in characters.
+        yaml_ratio: Share of YAML modules; the rest are raw `.txt` resources.
+        duplicate_ratio: Share of YAML modules reusing the ID of an earlier one
+            (they lose under First-Wins).
+        aliases: Number of index.yaml aliases pointing at YAML modules.
+        id_prefix: Namespace of module IDs (defaults to the bundle name).
+            Bundles sharing a prefix shadow each other's modules.
+        seed: Random seed, for reproducible bundles.
+    """
+    rng = random.Random(seed)
+    prefix = id_prefix or name
+    bundle = Path(root) / name
+    yaml_ids: List[str] = []
+
+    for i in range(files):
+        folder = bundle / f"group_{i % 16:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        if rng.random() < yaml_ratio:
+            if yaml_ids and rng.random() < duplicate_ratio:
+                module_id = rng.choice(yaml_ids)
+            else:
+                module_id = f"{prefix}/modules/m{i}"
+                yaml_ids.append(module_id)
+            document = {
+                "id": module_id,
+                "type": rng.choice(["OPERATOR", "MODIFIER", "GOAL", "ENTITY"]),
+                "version": "1.0",
+                "description": _text(rng, 80),
+                "sections": [
+                    {"title": _text(rng, 20), "body": _text(rng, max(1, file_size // 8))}
+                    for _ in range(4)
+                ],
+            }
+            (folder / f"m{i}.yaml").write_text(
+                yaml.safe_dump(document, sort_keys=False, allow_unicode=True), encoding="utf-8"
+            )
+        else:
+            (folder / f"r{i}.txt").write_text(_text(rng, file_size), encoding="utf-8")
+
+    if aliases:
+        targets = rng.sample(yaml_ids, min(aliases, len(yaml_ids)))
+        index = {"aliases": {f"ALIAS_{n}": f"{target}/1.0" for n, target in enumerate(targets)}}
+        (bundle / "index.yaml").write_text(yaml.safe_dump(index), encoding="utf-8")
+
+    return str(bundle)
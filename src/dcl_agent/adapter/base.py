@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Iterator
 from ..model import InvocationContext
 
+# Prefixes of the responses by which adapters report failures as text.
+ERROR_PREFIXES = ("Error:", "Gemini Error:")
+
 class ILLMAdapter(ABC):
     """
     Interface for LLM Adapters.
@@ -13,3 +16,30 @@ class ILLMAdapter(ABC):
         Invokes the LLM with the given context and returns the response string.
         """
         pass
+
+    async def ainvoke(self, context: InvocationContext) -> str:
+        """
+        Async variant of invoke().
+        The default runs invoke() in a worker thread; adapters with a native
+        async client should override it.
+        """
+        # asyncio is already loaded whenever a coroutine runs: import it here
+        # rather than at module level, which would cost every synchronous user.
+        import asyncio
+        return await asyncio.to_thread(self.invoke, context)
+
+    def invoke_stream(self, context: InvocationContext) -> Iterator[str]:
+        """
+        Streaming variant of invoke(): yields the response text in chunks
+        as they arrive. The default yields the whole invoke() result as a
+        single chunk; adapters with a streaming API should override it.
+        """
+        yield self.invoke(context)
+
+    def is_error_response(self, response: str) -> bool:
+        """
+        Whether a response reports a failure rather than an answer. Adapters
+        that return their errors as text (e.g. "Gemini Error: ...") let
+        callers tell them apart here.
+        """
+        return response.startswith(ERROR_PREFIXES)
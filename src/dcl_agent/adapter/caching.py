@@ -0,0 +1,185 @@
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterator, Optional
+from .base import ERROR_PREFIXES, ILLMAdapter
+from ..model import InvocationContext, digest_frames
+
+def is_error_response(response: str) -> bool:
+    """Adapters report failures as text; those responses are never cached."""
+    return response.startswith(ERROR_PREFIXES)
+
+class CachingLLMAdapter(ILLMAdapter):
+    """
+    Wraps any ILLMAdapter with a persistent response cache.
+    Responses are keyed by a digest of the context frames, tools and the
+    wrapped adapter's model name, and stored in SQLite (in memory by default).
+    Only useful for deterministic pipelines: a hit replays the stored answer.
+    Contexts whose tools have no stable representation (see digest_frames)
+    bypass the cache.
+    """
+    def __init__(
+        self,
+        adapter: ILLMAdapter,
+        path: str = ":memory:",
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        bypass: bool = False,
+        cache_filter: Callable[[str], bool] = lambda response: not is_error_response(response)
+    ):
+        """
+        Args:
+            adapter: Adapter whose responses are cached.
+            path: SQLite database file (":memory:" keeps the cache in-process).
+            ttl: Seconds a response stays valid (None = forever).
+            max_entries: Maximum number of stored responses; the least recently
+                used ones are evicted first (None = unbounded).
+            bypass: Skip cache lookups and always call the adapter. Fresh
+                responses are still stored. Can be toggled at runtime.
+            cache_filter: Decides whether a response may be stored.
+        """
+        self.adapter = adapter
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.cache_filter = cache_filter
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.adapter, "model_name", type(self.adapter).__name__)
+
+    def is_error_response(self, response: str) -> bool:
+        return self.adapter.is_error_response(response)
+
+    def cache_key(self, context: InvocationContext) -> Optional[str]:
+        """Key of the context's response; None if it cannot be cached."""
+        try:
+            return digest_frames(context.frames, context.tools, self.model_name)
+        except TypeError:
+            return None
+
+    def invoke(self, context: InvocationContext) -> str:
+        key = self.cache_key(context)
+        if key is None:
+            return self.adapter.invoke(context)
+        if not self.bypass:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+
+        response = self.adapter.invoke(context)
+        if self.cache_filter(response):
+            self._store(key, response)
+        return response
+
+    async def ainvoke(self, context: InvocationContext) -> str:
+        # SQLite lookups are sub-millisecond, so they stay on the event loop.
+        key = self.cache_key(context)
+        if key is None:
+            return await self.adapter.ainvoke(context)
+        if not self.bypass:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+
+        response = await self.adapter.ainvoke(context)
+        if self.cache_filter(response):
+            self._store(key, response)
+        return response
+
+    def invoke_stream(self, context: InvocationContext) -> Iterator[str]:
+        """
+        Streams from the wrapped adapter and stores the joined response once
+        the stream is exhausted. A hit is replayed as a single chunk; a stream
+        abandoned half-way is not cached.
+        """
+        key = self.cache_key(context)
+        if key is None:
+            yield from self.adapter.invoke_stream(context)
+            return
+        if not self.bypass:
+            cached = self._lookup(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        failed = False
+        for chunk in self.adapter.invoke_stream(context):
+            # Streaming adapters report mid-stream failures as a trailing chunk.
+            failed = failed or not self.cache_filter(chunk)
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+        if not failed and self.cache_filter(response):
+            self._store(key, response)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created = row
+            if self.ttl is not None and created + self.ttl <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return response
+
+    def _store(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            if self.max_entries is not None:
+                cursor = self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                self.evictions += max(cursor.rowcount, 0)
+
+    def purge_expired(self) -> int:
+        """Deletes expired responses and returns how many were removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM responses WHERE created <= ?", (time.time() - self.ttl,)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,6 +1,10 @@
 import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Set, Tuple
 from .base import ILLMAdapter
-from ..model import InvocationContext, TextFrame, BlobFrame
+from ..model import InvocationContext, TextFrame, BlobFrame, digest_frames
 # google-genai SDK imports
 try:
     from google import genai
@@ -8,11 +12,43 @@ try:
 except ImportError:
     genai = None
 
+@dataclass
+class CachedContentHandle:
+    """A provider-side cached-content resource holding a stable prompt prefix."""
+    name: str          # Resource name passed as GenerateContentConfig.cached_content
+    expires_at: float  # time.time() after which the handle is not reused
+    frames: int        # Number of leading frames it covers
+
+# API error codes meaning a cached-content handle is unusable (gone or not
+# ours). Other failures (rate limits, timeouts, server errors) keep the handle.
+_STALE_HANDLE_CODES = (403, 404)
+
 class GeminiAdapter(ILLMAdapter):
     """
     Adapter for Google Gemini API (using google-genai SDK 0.x/1.x).
     """
-    def __init__(self, api_key: str = None, model_name: str = "gemini-2.0-flash-exp"):
+    def __init__(
+        self,
+        api_key: str = None,
+        model_name: str = "gemini-2.0-flash-exp",
+        client=None,
+        cache_ttl: Optional[float] = None,
+        cache_min_chars: int = 0
+    ):
+        """
+        Args:
+            api_key: Gemini API key (defaults to $GOOGLE_API_KEY).
+            model_name: Model to call.
+            client: Pre-built genai.Client (or a stand-in with the same surface,
+                e.g. for offline tests). Built from api_key if omitted.
+            cache_ttl: Enables provider-side context caching: the stable leading
+                frames of a context (see InvocationContext.prefix_frames) are
+                uploaded once as cached content living this many seconds, and
+                later calls with the same prefix only send the remaining frames.
+                None disables caching.
+            cache_min_chars: Prefixes shorter than this are sent inline (the API
+                rejects caches below a model-specific token minimum).
+        """
         if not genai:
             raise ImportError("google-genai package is not installed.")
         
@@ -22,44 +58,257 @@ class GeminiAdapter(ILLMAdapter):
              # but invoke will fail.
              pass
 
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = client if client is not None else genai.Client(api_key=self.api_key)
         self.model_name = model_name
+        self.cache_ttl = cache_ttl
+        self.cache_min_chars = cache_min_chars
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._handles: Dict[str, CachedContentHandle] = {}
+        self._creating: Set[str] = set()       # Keys whose cache is being created
+        self._failed: Dict[str, float] = {}    # Key -> time.time() until which creation is not retried
+        self._handles_lock = threading.Lock()
 
     def invoke(self, context: InvocationContext) -> str:
         if not self.api_key:
              return "Error: GOOGLE_API_KEY not set."
 
-        # Convert InvocationContext to Gemini Content/Part objects
-        contents = []
-        
-        # In Gemini 2.0 / SDK, we usually send a list of contents or parts.
-        # We assume the Strategy has already ordered them correctly (System vs User).
-        # However, google-genai SDK might require specific 'role': 'user'/'model' structure if chat.
-        # For simple generate_content, we can pass a list of parts.
-        
-        parts = []
-        for frame in context.frames:
-            if isinstance(frame, TextFrame):
-                parts.append(types.Part.from_text(text=frame.content))
-            elif isinstance(frame, BlobFrame):
-                 parts.append(types.Part.from_bytes(data=frame.data, mime_type=frame.mime_type))
-        
-        # We wrap parts in a generic Content if needed, or pass list of parts directly if supported.
-        # generate_content usually takes 'contents'.
-        
+        contents, config = self._build_request(context, self._cached_prefix(context))
         try:
             response = self.client.models.generate_content(
                 model=self.model_name,
-                contents=[
-                    types.Content(
-                        parts=parts,
-                        role="user" 
-                    )
-                ],
-                config=types.GenerateContentConfig(
-                    tools=context.tools if context.tools else None
-                )
+                contents=contents,
+                config=config
             )
             return response.text
         except Exception as e:
+            self._drop_handle(config, e)
             return f"Gemini Error: {e}"
+
+    async def ainvoke(self, context: InvocationContext) -> str:
+        if not self.api_key:
+             return "Error: GOOGLE_API_KEY not set."
+
+        contents, config = self._build_request(context, await self._acached_prefix(context))
+        try:
+            # Native async client: no thread is held while waiting for Gemini.
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=contents,
+                config=config
+            )
+            return response.text
+        except Exception as e:
+            await self._adrop_handle(config, e)
+            return f"Gemini Error: {e}"
+
+    def invoke_stream(self, context: InvocationContext) -> Iterator[str]:
+        if not self.api_key:
+             yield "Error: GOOGLE_API_KEY not set."
+             return
+
+        contents, config = self._build_request(context, self._cached_prefix(context))
+        try:
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=contents,
+                config=config
+            ):
+                # Chunks carrying only metadata (e.g. the final usage report) have no text.
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            self._drop_handle(config, e)
+            yield f"Gemini Error: {e}"
+
+    def _build_request(self, context: InvocationContext, handle: Optional[CachedContentHandle] = None):
+        """
+        Converts an InvocationContext to Gemini contents and config.
+        Given a cached-content handle for the stable prefix (see
+        _cached_prefix), the prefix is replaced by it and only the remaining
+        frames are sent.
+        """
+        frames = context.frames
+        if handle is not None:
+            contents = [types.Content(parts=self._to_parts(frames[handle.frames:]), role="user")]
+            # Tools are part of the cached content; the API rejects them here.
+            return contents, types.GenerateContentConfig(cached_content=handle.name)
+
+        # We assume the Strategy has already ordered them correctly (System vs User).
+        # For simple generate_content, we wrap all parts in a single user Content.
+        contents = [
+            types.Content(
+                parts=self._to_parts(frames),
+                role="user" 
+            )
+        ]
+        config = types.GenerateContentConfig(
+            tools=context.tools if context.tools else None
+        )
+        return contents, config
+
+    @staticmethod
+    def _to_parts(frames):
+        parts = []
+        for frame in frames:
+            if isinstance(frame, TextFrame):
+                parts.append(types.Part.from_text(text=frame.content))
+            elif isinstance(frame, BlobFrame):
+                 # The request needs its own copy of the shared, read-only blob.
+                 parts.append(types.Part.from_bytes(data=bytes(frame.data), mime_type=frame.mime_type))
+        return parts
+
+    def _cached_prefix(self, context: InvocationContext) -> Optional[CachedContentHandle]:
+        """
+        Returns a live cached-content handle for the context's stable prefix,
+        creating it on first use. None if caching is disabled, the prefix is
+        too small, or the cache is not available (the request is then sent
+        in full): its creation failed less than cache_ttl seconds ago, or
+        another request is creating it. No lock is held while it is created.
+        """
+        key = self._prefix_key(context)
+        if key is None:
+            return None
+        handle, create = self._claim_handle(key)
+        if not create:
+            return handle
+        try:
+            cached = self.client.caches.create(model=self.model_name, config=self._cache_config(context))
+        except Exception as e:
+            print(f"Warning: Could not create Gemini context cache: {e}")
+            cached = None
+        except BaseException:
+            self._store_handle(key, None, context.prefix_frames, failed=False)
+            raise
+        return self._store_handle(key, cached, context.prefix_frames)
+
+    async def _acached_prefix(self, context: InvocationContext) -> Optional[CachedContentHandle]:
+        """_cached_prefix() for ainvoke(): creates the cache with the async client."""
+        key = self._prefix_key(context)
+        if key is None:
+            return None
+        handle, create = self._claim_handle(key)
+        if not create:
+            return handle
+        try:
+            cached = await self.client.aio.caches.create(model=self.model_name, config=self._cache_config(context))
+        except Exception as e:
+            print(f"Warning: Could not create Gemini context cache: {e}")
+            cached = None
+        except BaseException:
+            # Cancelled: not a failure of the cache, a later request may create it.
+            self._store_handle(key, None, context.prefix_frames, failed=False)
+            raise
+        return self._store_handle(key, cached, context.prefix_frames)
+
+    def _prefix_key(self, context: InvocationContext) -> Optional[str]:
+        """Cache key of the context's stable prefix; None if it is not to be cached."""
+        count = context.prefix_frames
+        # At least one frame must remain to be sent with the request.
+        if self.cache_ttl is None or count <= 0 or count >= len(context.frames):
+            return None
+        prefix = context.frames[:count]
+        size = sum(len(f.content) if isinstance(f, TextFrame) else len(f.data or b"") for f in prefix)
+        if size < self.cache_min_chars:
+            return None
+
+        try:
+            if context.prefix_fingerprint:
+                return digest_frames((), context.prefix_fingerprint, count, context.tools, self.model_name)
+            return digest_frames(prefix, context.tools, self.model_name)
+        except TypeError:
+            # Tools without a stable representation: keys would never match.
+            return None
+
+    def _claim_handle(self, key: str) -> Tuple[Optional[CachedContentHandle], bool]:
+        """
+        Returns (handle, False) for a live handle, (None, True) if the caller
+        is to create the cache (the key is then marked in flight until
+        _store_handle), or (None, False) if the prefix must be sent inline.
+        """
+        now = time.time()
+        with self._handles_lock:
+            handle = self._handles.get(key)
+            if handle is not None and handle.expires_at > now:
+                self.cache_hits += 1
+                return handle, False
+            self.cache_misses += 1
+            if key in self._creating or self._failed.get(key, 0) > now:
+                return None, False
+            self._creating.add(key)
+            return None, True
+
+    def _cache_config(self, context: InvocationContext):
+        return types.CreateCachedContentConfig(
+            contents=[types.Content(parts=self._to_parts(context.frames[:context.prefix_frames]), role="user")],
+            tools=context.tools if context.tools else None,
+            ttl=f"{int(self.cache_ttl)}s"
+        )
+
+    def _store_handle(self, key: str, cached, frames: int, failed: bool = True) -> Optional[CachedContentHandle]:
+        """
+        Records the outcome of a cache creation: the new handle, or (if
+        `cached` is None and `failed`) a failure not retried for cache_ttl
+        seconds. Expired handles and failures are pruned on the way; the
+        server deletes expired caches by itself.
+        """
+        now = time.time()
+        with self._handles_lock:
+            self._creating.discard(key)
+            for stale in [k for k, h in self._handles.items() if h.expires_at <= now]:
+                del self._handles[stale]
+            for stale in [k for k, until in self._failed.items() if until <= now]:
+                del self._failed[stale]
+            if cached is None:
+                if failed:
+                    self._failed[key] = now + self.cache_ttl
+                return None
+            # Stop reusing the handle slightly before the server expires it.
+            handle = CachedContentHandle(
+                name=cached.name,
+                expires_at=now + self.cache_ttl * 0.9,
+                frames=frames
+            )
+            self._handles[key] = handle
+            return handle
+
+    def _forget_handle(self, config, error: Exception) -> Optional[str]:
+        """
+        Forgets the handle a failed request used if the error says it is
+        unusable (see _STALE_HANDLE_CODES). Returns its name, to be deleted.
+        """
+        name = getattr(config, "cached_content", None)
+        if not name or getattr(error, "code", None) not in _STALE_HANDLE_CODES:
+            return None
+        with self._handles_lock:
+            for key, handle in list(self._handles.items()):
+                if handle.name == name:
+                    del self._handles[key]
+        return name
+
+    def _drop_handle(self, config, error: Exception) -> None:
+        """Forgets and deletes the handle of a request that failed because of it."""
+        name = self._forget_handle(config, error)
+        if name:
+            try:
+                self.client.caches.delete(name=name)
+            except Exception:
+                pass # Usually already gone server-side.
+
+    async def _adrop_handle(self, config, error: Exception) -> None:
+        name = self._forget_handle(config, error)
+        if name:
+            try:
+                await self.client.aio.caches.delete(name=name)
+            except Exception:
+                pass # Usually already gone server-side.
+
+    def clear_context_caches(self) -> None:
+        """Deletes every cached-content resource created by this adapter."""
+        with self._handles_lock:
+            handles, self._handles = list(self._handles.values()), {}
+        for handle in handles:
+            try:
+                self.client.caches.delete(name=handle.name)
+            except Exception as e:
+                print(f"Warning: Could not delete Gemini context cache {handle.name}: {e}")
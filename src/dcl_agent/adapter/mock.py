@@ -1,3 +1,5 @@
+import time
+from typing import Iterator, Optional
 from .base import ILLMAdapter
 from ..model import InvocationContext
 
@@ -6,11 +8,49 @@ class MockLLMAdapter(ILLMAdapter):
     Mock adapter for offline testing.
     Returns a predefined response or an echo of the context.
     """
-    def __init__(self, fixed_response: str = None):
+    def __init__(
+        self,
+        fixed_response: str = None,
+        delay: float = 0.0,
+        chunk_size: Optional[int] = None,
+        chunk_delay: float = 0.0
+    ):
+        """
+        Args:
+            fixed_response: Response to return (defaults to a context summary).
+            delay: Simulated latency in seconds (time.sleep / asyncio.sleep).
+                When streaming, this is the time to the first chunk.
+            chunk_size: Characters per streamed chunk (None = whole response).
+            chunk_delay: Simulated delay between two streamed chunks.
+        """
         self.fixed_response = fixed_response
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
         self.last_context = None
 
     def invoke(self, context: InvocationContext) -> str:
+        if self.delay:
+            time.sleep(self.delay)
+        return self._respond(context)
+
+    async def ainvoke(self, context: InvocationContext) -> str:
+        import asyncio
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._respond(context)
+
+    def invoke_stream(self, context: InvocationContext) -> Iterator[str]:
+        if self.delay:
+            time.sleep(self.delay)
+        response = self._respond(context)
+        size = self.chunk_size or len(response) or 1
+        for start in range(0, len(response), size):
+            if start and self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield response[start:start + size]
+
+    def _respond(self, context: InvocationContext) -> str:
         self.last_context = context
         if self.fixed_response:
             return self.fixed_response
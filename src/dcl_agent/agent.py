@@ -1,12 +1,31 @@
-from typing import Optional, Dict
-from .model import InvocationContext, Instruction
+import contextvars
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Hashable, Tuple
+from .batch import BatchItem, BatchResult, BatchStats
+from .exceptions import DCLAdapterError
+from .cache import CacheStats, LRUCache
+from .instrumentation import Instrumentation
+from .model import InvocationContext, Instruction, TextFrame
 from .loader.registry import PromptModuleRegistry
-from .loader.loader import Loader
-from .parser.parser import DCLParser
+from .loader.loader import Loader, ReloadResult
+from .loader.watcher import BundleWatcher
 from .strategies.base import IContextAssemblyStrategy
 from .strategies.gemini import GeminiNativeStrategy
 from .adapter.base import ILLMAdapter
-from .adapter.gemini import GeminiAdapter
+from .plugins import create_adapter, create_strategy
+
+# Quoted strings are kept verbatim when normalizing instruction text.
+_QUOTED = re.compile(r"""('[^']*'|"[^"]*")""")
+
+def normalize_instruction(text: str) -> str:
+    """Collapses whitespace outside of quoted strings."""
+    parts = _QUOTED.split(text)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", parts[i])
+    return "".join(parts).strip()
 
 class DCLAgent:
     """
@@ -16,17 +35,57 @@ class DCLAgent:
     def __init__(
         self, 
         bundles: list[str] | str,
-        adapter: ILLMAdapter = None,
-        strategy: IContextAssemblyStrategy = None
+        adapter: ILLMAdapter | str = None,
+        strategy: IContextAssemblyStrategy | str = None,
+        max_workers: Optional[int] = None,
+        snapshot_path: Optional[str] = None,
+        lazy: bool = False,
+        keep_metadata: bool = True,
+        content_cache_size: Optional[int] = None,
+        watch: bool = False,
+        watch_interval: float = 1.0,
+        parse_cache_size: int = 0,
+        context_cache_size: int = 0,
+        instrumentation: Optional[Instrumentation] = None
     ):
         """
         Args:
             bundles: List of root paths to load DCL artifacts from (or single path string).
-            adapter: LLM Adapter to use (defaults to GeminiAdapter).
-            strategy: Assembly Strategy to use (defaults to GeminiNativeStrategy).
+            adapter: LLM Adapter to use, or the name of a registered one
+                (see dcl_agent.plugins). Defaults to GeminiAdapter, which is
+                only built (and google-genai imported) on first use.
+            strategy: Assembly Strategy to use, or the name of a registered one
+                (defaults to GeminiNativeStrategy).
+            max_workers: Number of loader workers for parallel bundle loading
+                (None loads files sequentially).
+            snapshot_path: Optional registry snapshot file. Unchanged files are
+                served from it instead of being reparsed on startup.
+            lazy: Index modules at load time and read their content on first use.
+            keep_metadata: Keep the parsed YAML tree of modules (PromptModule.metadata).
+            content_cache_size: Max characters of lazily read content kept in memory.
+            watch: Poll the bundles in a background thread and hot-reload changes.
+            watch_interval: Seconds between two polls in watch mode.
+            parse_cache_size: Number of parsed instructions cached by text (0 = off).
+            context_cache_size: Number of assembled InvocationContexts kept in
+                an LRU cache (0 = off). Entries are keyed by the normalized
+                instruction text, the strategy and the registry generation.
+                Hits return the same InvocationContext object to every
+                caller, so only enable it if contexts are not modified.
+            instrumentation: Receives spans for every execute stage (dcl.execute,
+                dcl.build_context, dcl.parse, dcl.assemble, dcl.invoke) and
+                for loading (dcl.load, dcl.load_bundle, dcl.load_file).
+                Hooks can also be added later with instrumentation.add_hook().
         """
-        self.registry = PromptModuleRegistry()
-        self.loader = Loader(self.registry)
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.registry = PromptModuleRegistry(content_cache_size=content_cache_size)
+        self.loader = Loader(
+            self.registry,
+            max_workers=max_workers,
+            snapshot_path=snapshot_path,
+            lazy=lazy,
+            keep_metadata=keep_metadata,
+            instrumentation=self.instrumentation
+        )
         
         # Normalize to list
         if isinstance(bundles, str):
@@ -37,27 +96,222 @@ class DCLAgent:
         # Load artifacts immediately
         self.loader.load_bundles(bundle_paths)
         
-        self.parser = DCLParser()
-        self.adapter = adapter if adapter else GeminiAdapter()
+        # lark is imported with the parser, not with this module.
+        from .parser.parser import DCLParser
+        self.parser = DCLParser(cache_size=parse_cache_size)
+        self._adapter = create_adapter(adapter) if isinstance(adapter, str) else adapter
+        self._adapter_lock = threading.Lock()
+        if isinstance(strategy, str):
+            strategy = create_strategy(strategy)
         self.strategy = strategy if strategy else GeminiNativeStrategy()
         
-        # Simple Cache: Instruction Hash -> InvocationContext
-        # (Not implemented fully in v1, but placeholder)
-        self._context_cache: Dict[str, InvocationContext] = {}
+        # (normalized text, strategy, registry generation) -> InvocationContext
+        self.context_cache = LRUCache(max_weight=context_cache_size) if context_cache_size > 0 else None
+
+        self.watcher = BundleWatcher(self.loader, interval=watch_interval)
+        if watch:
+            self.watcher.start()
+
+    @property
+    def adapter(self) -> ILLMAdapter:
+        if self._adapter is None:
+            with self._adapter_lock:
+                if self._adapter is None:
+                    self._adapter = create_adapter("gemini")
+        return self._adapter
+
+    @adapter.setter
+    def adapter(self, adapter: ILLMAdapter) -> None:
+        self._adapter = adapter
 
     def execute(self, instruction_text: str) -> str:
         """
         Executes a DCL instruction text.
         Returns the LLM response.
         """
-        # 1. Parse
-        instruction = self.parser.parse(instruction_text)
-        
-        # 2. Assemble Context
-        context = self.strategy.assemble(instruction, self.registry)
-        
-        # 3. Invoke LLM
-        return self.adapter.invoke(context)
+        with self.instrumentation.span("dcl.execute"):
+            context = self.build_context(instruction_text)
+
+            # 3. Invoke LLM
+            with self.instrumentation.span("dcl.invoke") as span:
+                response = self.adapter.invoke(context)
+                if span.recording:
+                    span.set_attribute("adapter", type(self.adapter).__name__)
+                    span.set_attribute("response_chars", len(response))
+                return response
+
+    async def aexecute(self, instruction_text: str) -> str:
+        """
+        Async variant of execute().
+        Parsing and assembly are CPU-bound and run inline; only the LLM call
+        is awaited, so one event loop can drive many concurrent instructions.
+        """
+        with self.instrumentation.span("dcl.execute"):
+            context = self.build_context(instruction_text)
+            with self.instrumentation.span("dcl.invoke") as span:
+                response = await self.adapter.ainvoke(context)
+                if span.recording:
+                    span.set_attribute("adapter", type(self.adapter).__name__)
+                    span.set_attribute("response_chars", len(response))
+                return response
+
+    def execute_stream(self, instruction_text: str) -> Iterator[str]:
+        """
+        Streaming variant of execute(): yields response text chunks as the
+        LLM produces them. Parse and assembly errors are raised before the
+        first chunk.
+        """
+        context = self.build_context(instruction_text)
+        stream = self.adapter.invoke_stream(context)
+        if not self.instrumentation.enabled:
+            return stream
+        return self._instrumented_stream(stream)
+
+    def _instrumented_stream(self, stream: Iterator[str]) -> Iterator[str]:
+        with self.instrumentation.span("dcl.invoke_stream") as span:
+            span.set_attribute("adapter", type(self.adapter).__name__)
+            chunks = chars = 0
+            try:
+                for chunk in stream:
+                    if not chunks:
+                        span.set_attribute("first_chunk_seconds", span.duration)
+                    chunks += 1
+                    chars += len(chunk)
+                    yield chunk
+            finally:
+                span.set_attribute("chunks", chunks)
+                span.set_attribute("response_chars", chars)
+
+    def execute_many(self, instructions: Iterable[str], max_concurrency: int = 8) -> BatchResult:
+        """
+        Executes a batch of instructions.
+        All instructions are parsed and assembled first, then the adapter is
+        called from at most `max_concurrency` threads. Results come back in
+        input order; an exception in one item is recorded on that item and
+        does not abort the batch. So are responses the adapter reports as
+        errors (ILLMAdapter.is_error_response), as DCLAdapterError.
+        """
+        start = time.perf_counter()
+        items, contexts = self._prepare_batch(instructions)
+
+        def invoke(i: int):
+            item, context = items[i], contexts[i]
+            began = time.perf_counter()
+            try:
+                with self.instrumentation.span("dcl.invoke"):
+                    self._record_response(item, self.adapter.invoke(context))
+            except Exception as e:
+                item.error = e
+            item.latency += time.perf_counter() - began
+
+        pending = [i for i, context in enumerate(contexts) if context is not None]
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            # Each call runs in a copy of the caller's context, so its
+            # dcl.invoke span nests under the caller's current span.
+            futures = [pool.submit(contextvars.copy_context().run, invoke, i) for i in pending]
+            for future in futures:
+                future.result()
+
+        return BatchResult(items=items, stats=BatchStats.from_items(items, time.perf_counter() - start))
+
+    async def aexecute_many(self, instructions: Iterable[str], max_concurrency: int = 8) -> BatchResult:
+        """Async variant of execute_many(): adapter calls go through ainvoke()."""
+        import asyncio
+        start = time.perf_counter()
+        items, contexts = self._prepare_batch(instructions)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def invoke(item: BatchItem, context):
+            async with semaphore:
+                began = time.perf_counter()
+                try:
+                    with self.instrumentation.span("dcl.invoke"):
+                        self._record_response(item, await self.adapter.ainvoke(context))
+                except Exception as e:
+                    item.error = e
+                item.latency += time.perf_counter() - began
+
+        await asyncio.gather(*(
+            invoke(item, context) for item, context in zip(items, contexts) if context is not None
+        ))
+        return BatchResult(items=items, stats=BatchStats.from_items(items, time.perf_counter() - start))
+
+    def _record_response(self, item: BatchItem, response: str) -> None:
+        if self.adapter.is_error_response(response):
+            item.error = DCLAdapterError(response)
+        else:
+            item.response = response
+
+    def _prepare_batch(self, instructions: Iterable[str]):
+        """Parses and assembles a batch; failed items get their error and no context."""
+        items, contexts = [], []
+        for index, text in enumerate(instructions):
+            item = BatchItem(index=index, instruction=text)
+            began = time.perf_counter()
+            try:
+                contexts.append(self.build_context(text))
+            except Exception as e:
+                item.error = e
+                contexts.append(None)
+            item.latency = time.perf_counter() - began
+            items.append(item)
+        return items, contexts
+
+    def build_context(self, instruction_text: str) -> InvocationContext:
+        """
+        Parses and assembles an instruction, going through the context cache.
+        Whitespace-equivalent instructions share one cached context, whose
+        instruction frame carries the text of the first of them.
+        Cached contexts are shared and must be treated as read-only.
+        """
+        instrumentation = self.instrumentation
+        with instrumentation.span("dcl.build_context") as span:
+            # A single view per request: a concurrent reload cannot mix generations.
+            view = self.registry.view()
+            strategy = self.strategy
+            key: Optional[Tuple[Hashable, ...]] = None
+            if self.context_cache is not None:
+                key = (normalize_instruction(instruction_text), strategy, view.generation)
+                context = self.context_cache.get(key)
+                span.set_attribute("cache_hit", context is not None)
+                if context is not None:
+                    return context
+
+            # 1. Parse
+            with instrumentation.span("dcl.parse"):
+                instruction = self.parser.parse(instruction_text)
+
+            # 2. Assemble Context
+            with instrumentation.span("dcl.assemble") as assemble_span:
+                context = strategy.assemble(instruction, view)
+                if assemble_span.recording:
+                    assemble_span.set_attribute("strategy", type(strategy).__name__)
+                    assemble_span.set_attribute("frames", len(context.frames))
+                    assemble_span.set_attribute("chars", sum(
+                        len(f.content) if isinstance(f, TextFrame) else len(f.data or b"")
+                        for f in context.frames
+                    ))
+
+            if key is not None:
+                self.context_cache.put(key, context)
+            return context
+
+    def context_cache_stats(self) -> CacheStats:
+        """Hit, miss and eviction counters of the context cache."""
+        if self.context_cache is None:
+            return CacheStats()
+        return self.context_cache.stats()
+
+    def reload(self) -> ReloadResult:
+        """
+        Reloads changed, added and removed files of the bundles (hot reload).
+        In-flight executions keep the registry view they started with.
+        """
+        return self.loader.reload()
+
+    def close(self):
+        """Stops the bundle watcher, if running."""
+        self.watcher.stop()
         
     def get_registry(self) -> PromptModuleRegistry:
         return self.registry
@@ -0,0 +1,76 @@
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class BatchItem:
+    """Outcome of one instruction of a batch."""
+    index: int
+    instruction: str
+    response: Optional[str] = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0 # Seconds spent on this item (parse + assemble + invoke)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class BatchStats:
+    """Throughput and latency statistics of a batch run."""
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0    # Wall-clock seconds for the whole batch
+    throughput: float = 0.0 # Instructions per second
+    latency_mean: float = 0.0
+    latency_p50: float = 0.0
+    latency_p95: float = 0.0
+    latency_p99: float = 0.0
+    latency_max: float = 0.0
+
+    @classmethod
+    def from_items(cls, items: List[BatchItem], elapsed: float) -> "BatchStats":
+        latencies = sorted(item.latency for item in items)
+        failed = sum(1 for item in items if not item.ok)
+        stats = cls(
+            total=len(items),
+            succeeded=len(items) - failed,
+            failed=failed,
+            elapsed=elapsed,
+            throughput=len(items) / elapsed if elapsed > 0 else 0.0
+        )
+        if latencies:
+            stats.latency_mean = sum(latencies) / len(latencies)
+            stats.latency_p50 = _percentile(latencies, 50)
+            stats.latency_p95 = _percentile(latencies, 95)
+            stats.latency_p99 = _percentile(latencies, 99)
+            stats.latency_max = latencies[-1]
+        return stats
+
+    def summary(self) -> str:
+        return (
+            f"{self.succeeded}/{self.total} succeeded in {self.elapsed:.2f}s "
+            f"({self.throughput:.1f}/s); latency p50={self.latency_p50 * 1000:.1f}ms "
+            f"p95={self.latency_p95 * 1000:.1f}ms p99={self.latency_p99 * 1000:.1f}ms "
+            f"max={self.latency_max * 1000:.1f}ms"
+        )
+
+@dataclass
+class BatchResult:
+    """Results of DCLAgent.execute_many(), in input order."""
+    items: List[BatchItem] = field(default_factory=list)
+    stats: BatchStats = field(default_factory=BatchStats)
+
+    @property
+    def responses(self) -> List[Optional[str]]:
+        return [item.response for item in self.items]
+
+    @property
+    def errors(self) -> List[BatchItem]:
+        return [item for item in self.items if not item.ok]
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+@dataclass
+class CacheStats:
+    """Counters of an LRUCache."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0   # Number of entries currently held
+    weight: int = 0 # Total weight of entries currently held
+
+class LRUCache:
+    """
+    Thread-safe Least-Recently-Used cache.
+    Bounded by total weight; by default every entry weighs 1,
+    so max_weight is simply the maximum number of entries.
+    """
+    def __init__(
+        self,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None
+    ):
+        """
+        Args:
+            max_weight: Upper bound of the summed entry weights (None = unbounded).
+            weigher: Returns the weight of a value (defaults to 1 per entry).
+        """
+        self.max_weight = max_weight
+        self._weigher = weigher or (lambda value: 1)
+        self._data: "OrderedDict[Hashable, tuple[Any, int]]" = OrderedDict()
+        self._weight = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        weight = self._weigher(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._weight -= old[1]
+            if self.max_weight is not None and weight > self.max_weight:
+                # Would evict everything and still not fit: do not cache.
+                return
+            self._data[key] = (value, weight)
+            self._weight += weight
+            if self.max_weight is not None:
+                while self._weight > self.max_weight:
+                    _, (_, evicted_weight) = self._data.popitem(last=False)
+                    self._weight -= evicted_weight
+                    self._evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return default
+            self._weight -= entry[1]
+            return entry[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._data),
+                weight=self._weight
+            )
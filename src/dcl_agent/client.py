@@ -0,0 +1,158 @@
+import codecs
+import http.client
+import json
+import select
+import socket
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+from .exceptions import DCLServerError
+
+# Methods safe to send twice: a request whose response was lost to a
+# dropped connection is only retried for these (it may have run already).
+_IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class DCLClient:
+    """
+    Client of a DCL agent server (see dcl_agent.server).
+    Keeps one persistent connection per thread, so repeated calls cost a
+    round trip on an open socket rather than a new connection.
+    """
+    def __init__(
+        self,
+        url: str = "http://127.0.0.1:8765",
+        socket_path: Optional[str] = None,
+        timeout: Optional[float] = 300.0
+    ):
+        """
+        Args:
+            url: Base URL of an HTTP server.
+            socket_path: Unix domain socket of the server (takes precedence over url).
+            timeout: Socket timeout in seconds (None = wait forever).
+        """
+        self.url = url
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def execute(self, instruction: str) -> str:
+        return self._request("POST", "/execute", {"instruction": instruction})["response"]
+
+    def execute_stream(self, instruction: str) -> Iterator[str]:
+        """Yields response chunks as the server streams them."""
+        response = self._send("POST", "/execute", {"instruction": instruction, "stream": True})
+        if response.status != 200:
+            raise self._error(response)
+        # A multi-byte character may be split across two reads.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            while True:
+                # http.client undoes the chunked transfer encoding.
+                try:
+                    data = response.read1(65536)
+                except http.client.IncompleteRead:
+                    # The server aborted the stream (e.g. the LLM call failed mid-way).
+                    self.close()
+                    raise DCLServerError("Stream aborted by the server", status=502)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+        finally:
+            response.close()
+
+    def execute_many(self, instructions: List[str], max_concurrency: int = 8) -> Dict[str, Any]:
+        """Returns {"responses": [...], "errors": {index: message}, "stats": {...}}."""
+        return self._request("POST", "/execute_many", {
+            "instructions": list(instructions),
+            "max_concurrency": max_concurrency,
+        })
+
+    def reload(self) -> Dict[str, List[str]]:
+        return self._request("POST", "/reload", {})
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("GET", "/health")
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and connection.sock is not None:
+            # An idle keep-alive socket is never readable unless the server
+            # closed it: reconnect before sending rather than after.
+            if select.select([connection.sock], [], [], 0)[0]:
+                self.close()
+                connection = None
+        if connection is None:
+            if self.socket_path:
+                connection = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+            else:
+                parsed = urlparse(self.url)
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _send(self, method: str, path: str, payload: Optional[dict] = None) -> http.client.HTTPResponse:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in range(2):
+            connection = self._connection()
+            reused = connection.sock is not None
+            try:
+                connection.request(method, path, body=body, headers=headers)
+            except (ConnectionError, http.client.CannotSendRequest):
+                # The server dropped an idle keep-alive connection before the
+                # request went out: retry once on a new one.
+                self.close()
+                if attempt or not reused:
+                    raise
+                continue
+            try:
+                return connection.getresponse()
+            except ConnectionError:
+                # Also http.client.RemoteDisconnected. The request was sent and
+                # may have run (e.g. POST /execute): only idempotent ones are sent again.
+                self.close()
+                if attempt or not reused or method not in _IDEMPOTENT_METHODS:
+                    raise
+
+    def _request(self, method: str, path: str, payload: Optional[dict] = None) -> Dict[str, Any]:
+        response = self._send(method, path, payload)
+        if response.status != 200:
+            raise self._error(response)
+        return json.loads(response.read())
+
+    @staticmethod
+    def _error(response: http.client.HTTPResponse) -> DCLServerError:
+        try:
+            message = json.loads(response.read()).get("error", response.reason)
+        except ValueError:
+            message = response.reason
+        return DCLServerError(message, status=response.status)
+
+    def __enter__(self) -> "DCLClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
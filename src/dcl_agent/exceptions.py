@@ -25,3 +25,16 @@ class DuplicateIdWarning(DCLConfigurationWarning):
     Caught by Loader to implement 'First-Wins' strategy.
     """
     pass
+
+class DCLAdapterError(Exception):
+    """
+    An adapter reported a failed LLM call in its response text
+    (see ILLMAdapter.is_error_response). Recorded on batch items.
+    """
+    pass
+
+class DCLServerError(Exception):
+    """Raised by DCLClient when the agent server reports a failed request."""
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
@@ -0,0 +1,269 @@
+import bisect
+import contextvars
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("dcl_current_span", default=None)
+
+class InstrumentationHook:
+    """
+    Receives spans from an Instrumentation. Override either method.
+    Hooks run inline on the instrumented thread: keep them cheap.
+    """
+    def on_span_start(self, span: "Span") -> None:
+        pass
+
+    def on_span_end(self, span: "Span") -> None:
+        pass
+
+class Span:
+    """
+    A timed stage (e.g. dcl.parse), with attributes and its enclosing span.
+    Used as a context manager; `recording` is False for the disabled no-op span,
+    so callers can skip computing expensive attributes.
+    """
+    __slots__ = ("name", "attributes", "parent", "start", "end", "error", "data", "_hooks", "_token")
+    recording = True
+
+    def __init__(self, name: str, attributes: Dict[str, Any], hooks: Sequence[InstrumentationHook]):
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[Span] = None
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.data: Dict[Any, Any] = {} # Per-hook state (e.g. the exporter's native span)
+        self._hooks = hooks
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds between start and end (so far, if still open)."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        for hook in self._hooks:
+            _call_hook(hook.on_span_start, self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter()
+        # A generator closed early (e.g. an abandoned stream) is not a failure.
+        self.error = None if isinstance(exc, GeneratorExit) else exc
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from another context (e.g. a generator resumed elsewhere).
+            _current_span.set(self.parent)
+        for hook in self._hooks:
+            _call_hook(hook.on_span_end, self)
+
+class _NullSpan:
+    """Shared no-op span returned while no hook is installed."""
+    __slots__ = ()
+    recording = False
+    name = ""
+    attributes: Dict[str, Any] = {}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+NULL_SPAN = _NullSpan()
+
+def _call_hook(method, span: Span) -> None:
+    # A broken hook must never break the request it observes.
+    try:
+        method(span)
+    except Exception as e:
+        print(f"Warning: Instrumentation hook {method!r} failed: {e}")
+
+class Instrumentation:
+    """
+    Dispatches spans to hooks. With no hook installed span() returns a
+    shared no-op object, so instrumented code costs one attribute lookup
+    and a call per stage.
+    """
+    def __init__(self, hooks: Iterable[InstrumentationHook] = ()):
+        self._hooks = tuple(hooks)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._hooks)
+
+    def add_hook(self, hook: InstrumentationHook) -> None:
+        # Copy-on-write: spans already open keep the tuple they started with.
+        self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook: InstrumentationHook) -> None:
+        self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def span(self, name: str, **attributes: Any):
+        hooks = self._hooks
+        if not hooks:
+            return NULL_SPAN
+        return Span(name, attributes, hooks)
+
+# Seconds: 50us .. ~13s, doubling.
+DEFAULT_BUCKETS = tuple(50e-6 * 2 ** i for i in range(19))
+# Sizes and counts: 1 .. ~1M, powers of 4.
+_SIZE_BUCKETS = tuple(4 ** i for i in range(11))
+
+class Counter:
+    """Monotonic count."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def add(self, amount: float = 1) -> None:
+        self.value += amount
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1) # Last bucket: above the highest bound
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile (max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": dict(zip([*map(str, self.bounds), "+inf"], self.counts)),
+        }
+
+class MetricsAggregator(InstrumentationHook):
+    """
+    Aggregates finished spans, per span name:
+    `count`, `errors`, `duration` (a Histogram in seconds), plus a Counter
+    per true boolean attribute (e.g. cache_hit) and a Histogram per numeric
+    attribute (e.g. frames, chars).
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters: Dict[str, Counter] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters.setdefault(name, Counter())
+        return counter
+
+    def histogram(self, name: str, bounds: Optional[Sequence[float]] = None) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(name, Histogram(bounds or self.buckets))
+        return histogram
+
+    def on_span_end(self, span: Span) -> None:
+        with self._lock:
+            self.counter(f"{span.name}.count").add()
+            if span.error is not None:
+                self.counter(f"{span.name}.errors").add()
+            self.histogram(f"{span.name}.duration").observe(span.duration)
+            for key, value in span.attributes.items():
+                if isinstance(value, bool):
+                    if value:
+                        self.counter(f"{span.name}.{key}").add()
+                elif isinstance(value, (int, float)):
+                    self.histogram(f"{span.name}.{key}", _SIZE_BUCKETS).observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict copy of all metrics, e.g. for JSON export."""
+        with self._lock:
+            return {
+                "counters": {name: c.value for name, c in sorted(self.counters.items())},
+                "histograms": {name: h.snapshot() for name, h in sorted(self.histograms.items())},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+class OpenTelemetryHook(InstrumentationHook):
+    """
+    Exports spans through an OpenTelemetry tracer, preserving nesting.
+    Requires the opentelemetry-api package unless a tracer is given.
+    """
+    def __init__(self, tracer=None, tracer_name: str = "dcl_agent"):
+        """
+        Args:
+            tracer: OpenTelemetry Tracer (or a stand-in with start_span()).
+                Defaults to trace.get_tracer(tracer_name).
+            tracer_name: Instrumentation scope name of the default tracer.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            trace = None
+        if tracer is None:
+            if trace is None:
+                raise ImportError("opentelemetry-api package is not installed.")
+            tracer = trace.get_tracer(tracer_name)
+        self.tracer = tracer
+        self._trace = trace
+
+    def on_span_start(self, span: Span) -> None:
+        context = None
+        parent = span.parent.data.get(self) if span.parent is not None else None
+        if parent is not None and self._trace is not None:
+            context = self._trace.set_span_in_context(parent)
+        span.data[self] = self.tracer.start_span(span.name, context=context)
+
+    def on_span_end(self, span: Span) -> None:
+        native = span.data.pop(self, None)
+        if native is None:
+            return
+        for key, value in span.attributes.items():
+            if isinstance(value, (bool, int, float, str)):
+                native.set_attribute(f"dcl.{key}", value)
+        if span.error is not None:
+            native.record_exception(span.error)
+            if self._trace is not None:
+                native.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(span.error)))
+        native.end()
@@ -0,0 +1,53 @@
+import codecs
+import mimetypes
+from typing import Optional
+
+# Bytes inspected to tell binary from text files.
+BINARY_SNIFF_SIZE = 8192
+
+# application/* types that are text all the same.
+_TEXT_APPLICATION_TYPES = {
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/sql",
+    "application/x-sh",
+    "application/x-yaml",
+    "application/yaml",
+    "application/toml",
+}
+
+def is_binary_data(head: bytes) -> bool:
+    """
+    Checks the first bytes of a file (up to BINARY_SNIFF_SIZE): NUL bytes or
+    invalid UTF-8 mean binary.
+    """
+    head = head[:BINARY_SNIFF_SIZE]
+    if b"\0" in head:
+        return True
+    try:
+        # final=False: a multi-byte character may be cut at the sniff boundary.
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+def decode_text(data: bytes) -> str:
+    """Decodes file bytes as reading in text mode would: UTF-8, universal newlines."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+def blob_mime_type(name: str) -> str:
+    """MIME type of a binary file, from its name."""
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+def guess_blob_type(name: str) -> Optional[str]:
+    """
+    Classifies a file by its suffix alone, without reading it: the MIME type
+    if the suffix names a binary format, else None (text, or unknown).
+    """
+    mime_type = mimetypes.guess_type(name)[0]
+    if mime_type is None or mime_type.startswith("text/"):
+        return None
+    if mime_type in _TEXT_APPLICATION_TYPES or mime_type.endswith(("+xml", "+json")):
+        return None
+    return mime_type
@@ -0,0 +1,70 @@
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+@dataclass
+class DedupStats:
+    """Memory accounting of a ContentStore."""
+    unique: int = 0         # Distinct contents held
+    references: int = 0     # Modules sharing them
+    stored_bytes: int = 0   # Memory of the distinct strings
+    logical_bytes: int = 0  # Memory one string per module would take
+    saved_bytes: int = 0    # logical_bytes - stored_bytes
+
+class ContentStore:
+    """
+    Content-addressed, reference-counted store of module contents.
+    Equal contents (by hash and equality) are kept as a single str object
+    shared by every module that acquired it, in any registry using the store.
+    An entry is dropped when its last reference is released; modules that
+    are still in use keep their string alive regardless.
+    """
+    def __init__(self):
+        # content -> [canonical content, reference count]
+        self._entries: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, content: Optional[str]) -> Optional[str]:
+        """Returns the canonical copy of `content` and counts one more reference to it."""
+        if content is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(content)
+            if entry is None:
+                self._entries[content] = entry = [content, 0]
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, content: Optional[str]) -> None:
+        if content is None:
+            return
+        with self._lock:
+            entry = self._entries.get(content)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._entries[content]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> DedupStats:
+        with self._lock:
+            entries = list(self._entries.values())
+        stats = DedupStats(unique=len(entries))
+        for content, count in entries:
+            size = sys.getsizeof(content)
+            stats.references += count
+            stats.stored_bytes += size
+            stats.logical_bytes += size * count
+        stats.saved_bytes = stats.logical_bytes - stats.stored_bytes
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+# Shared by all registries of the process unless told otherwise.
+default_content_store = ContentStore()
@@ -0,0 +1,205 @@
+import bisect
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from ..model import PromptModule
+
+VersionKey = Tuple
+
+_VERSION = re.compile(r"^[vV]?(\d+(?:\.\d+)*)(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$")
+_COMPARATOR = re.compile(r"^(>=|<=|==|=|>|<|\^|~)?\s*(.+)$")
+
+def version_key(version: str) -> VersionKey:
+    """
+    Sort key of a version string, semver-style: numeric components compare
+    as numbers (8.10 > 8.2, 1.0 == 1.0.0) and a pre-release sorts before its
+    release (1.0-beta < 1.0). Non-numeric versions sort below all others.
+    """
+    match = _VERSION.match(str(version).strip())
+    if not match:
+        return ((), 1, str(version))
+    release = [int(part) for part in match.group(1).split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    prerelease = match.group(2)
+    return (tuple(release), 0 if prerelease else 1, prerelease or "")
+
+def _release(version: str) -> Optional[List[int]]:
+    match = _VERSION.match(version.strip())
+    if not match:
+        return None
+    return [int(part) for part in match.group(1).split(".")]
+
+def _bump(release: List[int], position: int) -> VersionKey:
+    """Lowest pre-release of the release after `release` bumped at `position`."""
+    bumped = release[:position] + [release[position] + 1]
+    return (tuple(bumped), 0, "")
+
+class VersionSpec:
+    """
+    A version constraint: "latest", an exact version, comparators joined by
+    commas or spaces (">=8.0,<9"), caret ("^8.1": >=8.1,<9), tilde
+    ("~8.1": >=8.1,<8.2) or wildcards ("8.x", "8.*").
+    As in semver ranges, pre-releases only match specs that name one.
+    A caret or tilde range around something that is not a version matches
+    nothing.
+    """
+    def __init__(self, spec: str):
+        self.spec = spec.strip()
+        self.lower: Optional[Tuple[VersionKey, bool]] = None # (key, inclusive)
+        self.upper: Optional[Tuple[VersionKey, bool]] = None
+        self.exact: Optional[VersionKey] = None
+        self.prerelease = "-" in self.spec
+        self.empty = False # Matches no version at all
+        if self.spec.lower() not in ("latest", "*", ""):
+            for part in re.split(r"[,\s]+", self.spec):
+                if part:
+                    self._add(part)
+
+    def _add(self, part: str) -> None:
+        op, version = _COMPARATOR.match(part).groups()
+        if re.fullmatch(r"[\d.]*\d(\.[xX*])+|[xX*]", version) and op in (None, "=", "=="):
+            release = [int(p) for p in version.split(".") if p not in ("x", "X", "*")]
+            if release:
+                self._bound_lower((tuple(release), 0, ""), True)
+                self._bound_upper(_bump(release, len(release) - 1), False)
+            return
+        key = version_key(version)
+        if op in (None, "=", "=="):
+            self.exact = key
+        elif op == ">=":
+            self._bound_lower(key, True)
+        elif op == ">":
+            self._bound_lower(key, False)
+        elif op == "<=":
+            self._bound_upper(key, True)
+        elif op == "<":
+            self._bound_upper(key, False)
+        elif op in ("^", "~") and _release(version) is None:
+            self.empty = True
+        elif op == "^":
+            release = _release(version)
+            # First non-zero component is the one that may not change.
+            position = next((i for i, n in enumerate(release) if n), len(release) - 1)
+            self._bound_lower(key, True)
+            self._bound_upper(_bump(release, position), False)
+        elif op == "~":
+            release = _release(version)
+            self._bound_lower(key, True)
+            self._bound_upper(_bump(release, min(1, len(release) - 1)), False)
+
+    def _bound_lower(self, key: VersionKey, inclusive: bool) -> None:
+        if self.lower is None or key > self.lower[0]:
+            self.lower = (key, inclusive)
+
+    def _bound_upper(self, key: VersionKey, inclusive: bool) -> None:
+        if self.upper is None or key < self.upper[0]:
+            self.upper = (key, inclusive)
+
+    def matches(self, key: VersionKey) -> bool:
+        if self.empty:
+            return False
+        if self.exact is not None and key != self.exact:
+            return False
+        if key[1] == 0 and not self.prerelease:
+            return False
+        if self.lower is not None and (key < self.lower[0] or (key == self.lower[0] and not self.lower[1])):
+            return False
+        if self.upper is not None and (key > self.upper[0] or (key == self.upper[0] and not self.upper[1])):
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"VersionSpec({self.spec!r})"
+
+def split_module_id(module: PromptModule) -> str:
+    """Base name of a module ID: `{id}/{version}` without the version segment."""
+    suffix = f"/{module.version}"
+    if module.id.endswith(suffix):
+        return module.id[:-len(suffix)]
+    return module.id
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: List[str] = [] # Module IDs whose base name ends at this node
+
+    def copy(self) -> "_TrieNode":
+        clone = _TrieNode()
+        clone.ids = list(self.ids)
+        clone.children = {segment: child.copy() for segment, child in self.children.items()}
+        return clone
+
+class RegistryIndex:
+    """
+    Secondary indexes over registered modules, maintained on register():
+    by type, by base name (the ID without its version) with versions kept
+    sorted, and a trie over the `/`-separated segments of base names.
+    """
+    __slots__ = ("_by_type", "_versions", "_trie")
+
+    def __init__(self):
+        self._by_type: Dict[str, List[str]] = {}
+        # base name -> [(version key, module ID)], ascending
+        self._versions: Dict[str, List[Tuple[VersionKey, str]]] = {}
+        self._trie = _TrieNode()
+
+    def add(self, module: PromptModule) -> None:
+        self._by_type.setdefault(module.type, []).append(module.id)
+        base = split_module_id(module)
+        bisect.insort(self._versions.setdefault(base, []), (version_key(module.version), module.id))
+        node = self._trie
+        for segment in base.split("/"):
+            node = node.children.setdefault(segment, _TrieNode())
+        node.ids.append(module.id)
+
+    def copy(self) -> "RegistryIndex":
+        """Independent copy, for building the next registry generation."""
+        clone = RegistryIndex.__new__(RegistryIndex)
+        clone._by_type = {module_type: list(ids) for module_type, ids in self._by_type.items()}
+        clone._versions = {base: list(entries) for base, entries in self._versions.items()}
+        clone._trie = self._trie.copy()
+        return clone
+
+    def by_type(self, module_type: str) -> List[str]:
+        return list(self._by_type.get(module_type, ()))
+
+    def types(self) -> List[str]:
+        return list(self._by_type)
+
+    def by_prefix(self, prefix: str) -> Iterator[str]:
+        """IDs of modules whose base name starts with the given path segments."""
+        node = self._trie
+        for segment in (s for s in prefix.strip("/").split("/") if s):
+            node = node.children.get(segment)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield from node.ids
+            stack.extend(reversed(list(node.children.values())))
+
+    def versions(self, base: str) -> List[str]:
+        """Module IDs of every version of a base name, oldest first."""
+        return [module_id for _, module_id in self._versions.get(base, ())]
+
+    def resolve(self, base: str, spec: VersionSpec) -> Optional[str]:
+        """ID of the highest version of `base` satisfying `spec`, found by bisection."""
+        entries = self._versions.get(base)
+        if not entries or spec.empty:
+            return None
+        end = len(entries)
+        if spec.exact is not None:
+            end = bisect.bisect_right(entries, (spec.exact, "\U0010ffff"))
+        elif spec.upper is not None:
+            key, inclusive = spec.upper
+            end = bisect.bisect_right(entries, (key, "\U0010ffff")) if inclusive else bisect.bisect_left(entries, (key,))
+        for i in range(end - 1, -1, -1):
+            key, module_id = entries[i]
+            if spec.matches(key):
+                return module_id
+            if spec.lower is not None and key < spec.lower[0]:
+                break
+        return None
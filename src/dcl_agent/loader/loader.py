@@ -1,66 +1,439 @@
 import os
-import yaml
+import re
+import threading
 import warnings
-from typing import List
+from dataclasses import dataclass, field, replace
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Collection, ContextManager, Dict, Iterator, List, Optional, Set, Tuple, Union
 from pathlib import Path
+from ..instrumentation import Instrumentation
 from ..model import PromptModule
+from ..tokens import estimate_tokens, estimate_tokens_from_size
 from ..exceptions import (
-    AliasAlreadyExistsWarning, 
+    AliasAlreadyExistsWarning,
     DuplicateIdWarning,
     DCLConfigurationError
 )
+from .blobs import BINARY_SNIFF_SIZE, blob_mime_type, decode_text, guess_blob_type, is_binary_data
+from .pack import PACK_MAGIC, RegistryPack, write_pack
 from .registry import PromptModuleRegistry
+from .snapshot import FileRecord, IndexRecord, RegistrySnapshot
+
+def load_yaml(text: str):
+    """
+    Parses a YAML document with PyYAML's safe loader, preferring the
+    libyaml-backed one. PyYAML is imported on first use, not with the module.
+    """
+    import yaml
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+YAML_SUFFIXES = ('.yaml', '.yml')
+
+# Top-level (unindented) `key: value` lines of the module header.
+_HEADER_LINE = re.compile(r"^(?:id|type|version)[ \t]*:.*$", re.MULTILINE)
+
+def is_binary_file(file_path: Path) -> bool:
+    """
+    Checks the first bytes of a file: NUL bytes or invalid UTF-8 mean binary.
+    """
+    with open(file_path, 'rb') as f:
+        return is_binary_data(f.read(BINARY_SNIFF_SIZE))
+
+def sniff_header(content: str) -> Optional[dict]:
+    """
+    Extracts the top-level id/type/version keys of a YAML module without
+    parsing its body. Only those lines are fed to the YAML parser, so scalar
+    typing (e.g. `version: 1.0`) is the same as for a full parse.
+
+    Returns None if there is no `id` line or the header is not made of plain
+    scalars (block scalars, nested values...); callers then parse in full.
+    """
+    lines = _HEADER_LINE.findall(content)
+    if not lines:
+        return None
+    for line in lines:
+        value = line.split(":", 1)[1].strip()
+        # Empty, block scalar, anchor/alias or tagged values may span more lines.
+        if not value or value[0] in "|>&*!":
+            return None
+    try:
+        header = load_yaml("\n".join(lines))
+    except Exception:
+        return None
+    if not isinstance(header, dict) or "id" not in header:
+        return None
+    if any(value is None or isinstance(value, (dict, list)) for value in header.values()):
+        return None
+    return header
+
+def is_yaml_mapping(text: str) -> bool:
+    """
+    Checks that text is a single well-formed YAML document with a mapping at
+    the top level (what a full parse needs to yield a module), by running
+    the parser over it without constructing any objects. Tags the safe
+    loader cannot construct count as invalid, as they fail a full parse.
+    """
+    import yaml
+    parser = getattr(yaml, "CSafeLoader", yaml.SafeLoader)(text)
+    known_tags = yaml.SafeLoader.yaml_constructors
+    try:
+        documents = 0
+        previous = None
+        while parser.check_event():
+            event = parser.get_event()
+            tag = getattr(event, "tag", None)
+            if tag is not None and tag not in known_tags:
+                return False
+            if isinstance(event, yaml.DocumentStartEvent):
+                documents += 1
+            elif isinstance(previous, yaml.DocumentStartEvent) and not isinstance(event, yaml.MappingStartEvent):
+                return False
+            previous = event
+        return documents == 1
+    except yaml.YAMLError:
+        return False
+    finally:
+        parser.dispose()
+
+@dataclass
+class ReloadResult:
+    """Module IDs and aliases affected by Loader.reload()."""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    aliases: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed or self.aliases)
+
+def pack_bundle(
+    bundle_path: str,
+    output_path: str,
+    compress: bool = False,
+    include_metadata: bool = False,
+    max_workers: Optional[int] = None
+) -> int:
+    """
+    Builds a packed bundle: one file holding the modules of a bundle
+    directory (after First-Wins within the bundle), the aliases of its
+    index.yaml and all module bodies (see loader.pack). Loading the file
+    gives the same module IDs and aliases as loading the directory, with
+    one open() instead of a stat and a read per file.
+
+    Args:
+        bundle_path: Bundle root directory.
+        output_path: Pack file to write (conventionally `<bundle>.dclpack`).
+        compress: zlib-compress bodies where that saves space.
+        include_metadata: Keep the parsed YAML tree of modules in the pack.
+        max_workers: Number of workers used to parse the bundle.
+
+    Returns the number of packed modules.
+    """
+    root_path = Path(bundle_path)
+    # A private registry: aliases are validated when the pack is loaded, as for directories.
+    registry = PromptModuleRegistry(content_store=None)
+    loader = Loader(registry, max_workers=max_workers, keep_metadata=include_metadata)
+    loader._populate(registry, [(root_path, loader._scan(root_path))])
+
+    view = registry.view()
+    modules = []
+    for module_id in view.list_modules():
+        module = view.get(module_id)
+        if module is None:
+            continue
+        if module.path:
+            # Stored relative to the bundle's parent, like module IDs.
+            module = replace(module, path=os.path.relpath(module.path, root_path.parent))
+        modules.append(module)
+    write_pack(
+        output_path,
+        modules,
+        view._aliases,
+        compress=compress,
+        include_metadata=include_metadata,
+        info={"bundle": root_path.name}
+    )
+    return len(modules)
+
+def is_pack_file(path: Path) -> bool:
+    """Whether a path is a packed bundle (see Loader.pack_bundle) rather than a directory."""
+    if not path.is_file():
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(PACK_MAGIC)) == PACK_MAGIC
 
 class Loader:
     """
     Scans directories and loads Prompt Modules into the Registry.
     Supports multi-bundle loading and index.yaml parsing.
+    A bundle may also be a single packed file (see pack_bundle()).
     """
-    def __init__(self, registry: PromptModuleRegistry):
+    def __init__(
+        self,
+        registry: PromptModuleRegistry,
+        max_workers: Optional[int] = None,
+        executor: str = "thread",
+        snapshot_path: Optional[str] = None,
+        lazy: bool = False,
+        keep_metadata: bool = True,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        Args:
+            registry: Registry to load modules into.
+            max_workers: Number of workers used to read and parse files.
+                None or 1 keeps the sequential loading mode.
+            executor: "thread" or "process". Process pools sidestep the GIL
+                for YAML parsing at the cost of pickling the parsed modules.
+            snapshot_path: Optional path of a compiled registry snapshot.
+                Unchanged files are taken from it instead of being reparsed,
+                and it is rewritten after load_bundles() if anything changed.
+            lazy: Index modules by ID, type, version and path only. Content is
+                read from disk on first registry.get() (see PromptModuleRegistry).
+            keep_metadata: Retain the parsed YAML tree of every module as
+                PromptModule.metadata. Nothing in the agent reads it, so large
+                registries can drop it to save memory.
+            instrumentation: Receives a dcl.load span per load/reload, and
+                dcl.load_bundle / dcl.load_file spans for every bundle and file.
+                In parallel mode a file span measures the wait for its worker.
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor type: {executor}")
         self.registry = registry
+        self.max_workers = max_workers
+        self.executor = executor
+        self.snapshot_path = snapshot_path
+        self.lazy = lazy
+        self.keep_metadata = keep_metadata
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        snapshot = RegistrySnapshot.load(snapshot_path) if snapshot_path else RegistrySnapshot()
+        # Records that may be reused instead of parsing (snapshot, then previous load).
+        self._known_files: Dict[str, FileRecord] = snapshot.files
+        self._known_indexes: Dict[str, IndexRecord] = snapshot.indexes
+        # Parse records of every file seen by this loader (path -> record).
+        self._files: Dict[str, FileRecord] = {}
+        self._indexes: Dict[str, IndexRecord] = {}
+        # Packed bundles: path -> (mtime_ns, size, mapped pack)
+        self._known_packs: Dict[str, Tuple[int, int, RegistryPack]] = {}
+        self._packs: Dict[str, Tuple[int, int, RegistryPack]] = {}
+        self._dirty = False
+        self._bundle_paths: List[str] = []
+        self._reload_lock = threading.Lock()
+
+    @property
+    def parallel(self) -> bool:
+        return self.max_workers is not None and self.max_workers > 1
 
     def load_bundles(self, bundle_paths: List[str]):
         """
-        Loads a list of bundles sequentially.
+        Loads a list of bundles.
+        In parallel mode files of all bundles are parsed concurrently,
+        but registration still follows bundle and scan order (First-Wins).
         """
-        for path in bundle_paths:
-            self._load_bundle(path)
-        
+        self._bundle_paths = list(bundle_paths)
+        self._populate(self.registry, self._scan_bundles(self._bundle_paths))
+
         # After all loading, validate alias integrity
         self.registry.validate_aliases()
+        self._save_snapshot()
 
-    def _load_bundle(self, path: str):
+    def reload(self) -> ReloadResult:
         """
-        Loads a single bundle (Index + Scan).
+        Incrementally reloads the bundles passed to load_bundles().
+        Only added or changed files (by mtime and size) are parsed again;
+        First-Wins is re-applied over the whole bundle list in a staging
+        registry, which is then swapped into the live registry atomically.
+
+        Raises InvalidAliasError (leaving the registry untouched) if an
+        added or changed alias, or an alias whose target changed, is broken.
         """
-        root_path = Path(path)
-        if not root_path.exists():
-            print(f"Warning: Path {path} does not exist.")
+        with self._reload_lock:
+            bundles = self._scan_bundles(self._bundle_paths)
+            # Fast path for polling: nothing to rebuild if every stamp matches.
+            if self._unchanged(bundles):
+                return ReloadResult()
+
+            previous_files, previous_indexes, previous_packs = self._files, self._indexes, self._packs
+            self._known_files, self._known_indexes = previous_files, previous_indexes
+            self._known_packs = previous_packs
+            self._files, self._indexes, self._packs = {}, {}, {}
+            self._dirty = False
+            staging = PromptModuleRegistry(content_store=self.registry.content_store)
+            try:
+                self._populate(staging, bundles)
+
+                if (
+                    not self._dirty
+                    and self._files.keys() == previous_files.keys()
+                    and self._indexes.keys() == previous_indexes.keys()
+                    and self._packs.keys() == previous_packs.keys()
+                ):
+                    staging.clear()
+                    return ReloadResult()
+
+                old_modules, old_aliases = self.registry._modules, self.registry._aliases
+                new_modules, new_aliases = staging._modules, staging._aliases
+                result = ReloadResult(
+                    added=[m for m in new_modules if m not in old_modules],
+                    changed=[
+                        m for m, module in new_modules.items()
+                        if m in old_modules and old_modules[m] is not module
+                    ],
+                    removed=[m for m in old_modules if m not in new_modules],
+                    aliases=sorted(
+                        set(a for a, t in new_aliases.items() if old_aliases.get(a) != t)
+                        | set(a for a in old_aliases if a not in new_aliases)
+                    )
+                )
+
+                # Only aliases that are new/retargeted or point at a touched module can break.
+                touched = set(result.changed) | set(result.removed)
+                staging.validate_aliases_subset(
+                    a for a, t in new_aliases.items()
+                    if old_aliases.get(a) != t or t in touched
+                )
+            except BaseException:
+                # Keep the old records so the next reload retries the same changes.
+                self._files, self._indexes, self._packs = previous_files, previous_indexes, previous_packs
+                staging.clear()
+                raise
+
+            self.registry.swap(staging)
+            self._save_snapshot()
+            return result
+
+    def _unchanged(self, bundles: List[Tuple[Path, Optional[List[Path]]]]) -> bool:
+        """
+        Whether the scanned bundles match the records of the last load exactly
+        (same files, index.yaml files and packs, with the same stat stamps).
+        Costs one stat per file; nothing is opened or parsed.
+        """
+        files = indexes = packs = 0
+        try:
+            for root_path, bundle_files in bundles:
+                if bundle_files is None:
+                    record = self._packs.get(str(root_path))
+                    stat = root_path.stat()
+                    if record is None or record[:2] != (stat.st_mtime_ns, stat.st_size):
+                        return False
+                    packs += 1
+                    continue
+                index_path = root_path / "index.yaml"
+                index_record = self._indexes.get(str(index_path))
+                if index_path.exists():
+                    if index_record is None or not index_record.matches(index_path.stat()):
+                        return False
+                    indexes += 1
+                elif index_record is not None:
+                    return False
+                for file_path in bundle_files:
+                    record = self._files.get(str(file_path))
+                    if record is None or not record.matches(file_path.stat(), root_path, self.lazy, self.keep_metadata):
+                        return False
+                    files += 1
+        except OSError:
+            return False # Vanished since the scan: let the full reload sort it out
+        return (files, indexes, packs) == (len(self._files), len(self._indexes), len(self._packs))
+
+    def _scan_bundles(self, bundle_paths: List[str]) -> List[Tuple[Path, Optional[List[Path]]]]:
+        """Lists the files of every bundle; packed bundles get None instead."""
+        bundles = []
+        for path in bundle_paths:
+            root_path = Path(path)
+            if not root_path.exists():
+                print(f"Warning: Path {path} does not exist.")
+                continue
+            if is_pack_file(root_path):
+                bundles.append((root_path, None))
+            else:
+                bundles.append((root_path, self._scan(root_path)))
+        return bundles
+
+    def _open_pack(self, pack_path: Path) -> Optional[RegistryPack]:
+        """Maps a packed bundle, reusing the previous mapping if the file is unchanged."""
+        key = str(pack_path)
+        try:
+            stat = pack_path.stat()
+            record = self._known_packs.get(key)
+            if record is None or record[:2] != (stat.st_mtime_ns, stat.st_size):
+                record = (stat.st_mtime_ns, stat.st_size, RegistryPack(key))
+                self._dirty = True
+        except Exception as e:
+            print(f"Error loading packed bundle {pack_path}: {e}")
+            return None
+        self._packs[key] = record
+        return record[2]
+
+    def _load_pack(self, pack_path: Path, registry: PromptModuleRegistry, aliases: bool = True):
+        """Registers the modules (and index.yaml aliases) of a packed bundle, First-Wins."""
+        pack = self._open_pack(pack_path)
+        if pack is None:
             return
+        if aliases:
+            self._register_aliases_recursive(pack.aliases, registry)
+        for module in pack.modules:
+            self._register_module(module, registry)
 
-        # 1. Index Phase
+    def _populate(self, registry: PromptModuleRegistry, bundles: List[Tuple[Path, Optional[List[Path]]]]):
+        files = [(f, root) for root, bundle_files in bundles for f in bundle_files or ()]
+        instrumentation = self.instrumentation
+        # One transaction: readers of a live registry see all of it or none of it.
+        with instrumentation.span("dcl.load") as load_span, self._create_executor() as pool, registry.transaction():
+            load_span.set_attribute("bundles", len(bundles))
+            load_span.set_attribute("files", len(files))
+            modules = self._build_modules(files, pool, seen=set(registry._modules))
+            for root_path, bundle_files in bundles:
+                with instrumentation.span("dcl.load_bundle") as bundle_span:
+                    if bundle_span.recording:
+                        bundle_span.set_attribute("bundle", str(root_path))
+                        bundle_span.set_attribute("files", len(bundle_files or ()))
+                    if bundle_files is None:
+                        self._load_pack(root_path, registry)
+                        continue
+                    # 1. Index Phase
+                    self._load_index(root_path, registry)
+                    # 2. Scan Phase
+                    for file_path in bundle_files:
+                        with instrumentation.span("dcl.load_file") as file_span:
+                            module = next(modules)
+                            if file_span.recording:
+                                file_span.set_attribute("path", str(file_path))
+                                file_span.set_attribute("module_id", module.id if module else "")
+                            self._register_module(module, registry)
+
+    def _load_index(self, root_path: Path, registry: PromptModuleRegistry):
         index_path = root_path / "index.yaml"
         if index_path.exists():
             try:
-                content = yaml.safe_load(index_path.read_text(encoding="utf-8"))
+                content = self._read_index(index_path)
                 aliases = content.get("aliases", {})
-                
+
                 # Flatten alias structure if nested (entities/operations) or just dict
                 # The example index.yaml has nested keys: entities: { ... }, operations: { ... }
                 # We need to traverse them.
                 # REQ says: "Maps simple Alias ... to Target Key".
                 # TSD says: "Parse index.yaml ... Call registry.register_alias".
-                # Let's assume recursion or flattened iteration. 
+                # Let's assume recursion or flattened iteration.
                 # For `dcl-god-mode` it is categorized.
-                self._register_aliases_recursive(aliases)
+                self._register_aliases_recursive(aliases, registry)
 
             except Exception as e:
-                print(f"Error loading index.yaml in {path}: {e}")
+                print(f"Error loading index.yaml in {root_path}: {e}")
 
-        # 2. Scan Phase
-        self.load_from_directory(str(root_path))
+    def _read_index(self, index_path: Path):
+        stat = index_path.stat()
+        key = str(index_path)
+        record = self._known_indexes.get(key)
+        if record is None or not record.matches(stat):
+            data = load_yaml(index_path.read_text(encoding="utf-8"))
+            record = IndexRecord(mtime_ns=stat.st_mtime_ns, size=stat.st_size, data=data)
+            self._dirty = True
+        self._indexes[key] = record
+        return record.data
 
-    def _register_aliases_recursive(self, data):
+    def _register_aliases_recursive(self, data, registry: PromptModuleRegistry):
         if isinstance(data, dict):
             for key, value in data.items():
                 if isinstance(value, str):
@@ -68,12 +441,12 @@ class Loader:
                     try:
                         with warnings.catch_warnings():
                             warnings.simplefilter("error", category=AliasAlreadyExistsWarning)
-                            self.registry.register_alias(key, value)
+                            registry.register_alias(key, value)
                     except AliasAlreadyExistsWarning:
                         # First-Wins: Ignore duplicates from subsequent bundles/files
-                        pass 
+                        pass
                 elif isinstance(value, dict):
-                    self._register_aliases_recursive(value)
+                    self._register_aliases_recursive(value, registry)
 
     def load_from_directory(self, path: str):
         """
@@ -83,70 +456,378 @@ class Loader:
         if not root_path.exists():
             print(f"Warning: Path {path} does not exist.")
             return
+        if is_pack_file(root_path):
+            with self.registry.transaction():
+                self._load_pack(root_path, self.registry, aliases=False)
+            return
 
+        files = [(f, root_path) for f in self._scan(root_path)]
+        with self._create_executor() as pool, self.registry.transaction():
+            for module in self._build_modules(files, pool, seen=set(self.registry._modules)):
+                self._register_module(module, self.registry)
+
+    @staticmethod
+    def _scan(root_path: Path) -> List[Path]:
+        """
+        Lists loadable files of a bundle in scan order.
+        """
         # Scan for all files.
         # User requirement: No arbitrary restrictions. Load everything.
+        files = []
         for file_path in root_path.rglob("*"):
              if not file_path.is_file():
                  continue
-             
+
              # Ignored patterns: Hidden files and the index itself.
              if file_path.name.startswith("."):
                  continue
              if file_path.name == "index.yaml":
                  continue
 
-             self._load_file(file_path, root_path)
+             files.append(file_path)
+        return files
 
-    def _load_file(self, file_path: Path, bundle_root: Path):
+    def _create_executor(self) -> ContextManager[Optional[Executor]]:
+        if not self.parallel:
+            return nullcontext()
+        if self.executor == "process":
+            # multiprocessing is only imported when a process pool is asked for.
+            from concurrent.futures import ProcessPoolExecutor
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _chunksize(self, count: int) -> int:
+        # Only process pools honour chunksize; batching amortizes IPC overhead.
+        if self.executor != "process":
+            return 1
+        return max(1, count // (self.max_workers * 4))
+
+    def _build_modules(
+        self,
+        files: List[Tuple[Path, Path]],
+        pool: Optional[Executor] = None,
+        seen: Optional[Set[str]] = None
+    ) -> Iterator[Optional[PromptModule]]:
+        """
+        Yields one module (or None) per (file, bundle_root) pair, in input order.
+        Files whose snapshot record is still valid are not reparsed; the rest
+        are parsed inline or, if a pool is given, by its workers.
+
+        `seen` holds the module IDs registered before these files. A YAML file
+        whose header names an ID that is already taken loses under First-Wins,
+        so its body is never parsed: a header-only module is yielded instead.
+        Headers are only sniffed if a file can be shadowed at all: by a module
+        registered before, or by a file of another bundle in `files`.
+        """
+        seen = set() if seen is None else seen
+        sniff = bool(seen) or len({root for _, root in files}) > 1
+        build = partial(self._build_module, lazy=self.lazy, keep_metadata=self.keep_metadata, sniff=sniff)
+
+        if pool is None:
+            # Single pass: the duplicate check sees exactly the IDs before each file.
+            for file_path, bundle_root in files:
+                record, needs_parsing = self._lookup_record(file_path, bundle_root)
+                if not needs_parsing and record.skipped and record.module.id not in seen:
+                    # Its shadowing module is gone: parse it for real this time.
+                    record, needs_parsing = self._renew_record(file_path, record), True
+                if needs_parsing:
+                    record.module = build(file_path, bundle_root, skip_ids=seen)
+                    record.skipped = record.module is not None and record.module.id in seen
+                if record.module is not None:
+                    seen.add(record.module.id)
+                yield record.module
+            return
+
+        # Parallel: 1) peek the files to parse in the pool, building those
+        # whose outcome cannot depend on First-Wins, 2) resolve First-Wins in
+        # order, 3) build the remaining YAML files from their peeked headers.
+        # map() yields results in submission order, so nothing depends on
+        # which worker finishes first.
+        initial_ids = set(seen)
+        lookups = [self._lookup_record(f, root) for f, root in files]
+        to_peek = [i for i, (_, needs_parsing) in enumerate(lookups) if needs_parsing]
+        peeked = dict(zip(to_peek, pool.map(
+            partial(self._peek, lazy=self.lazy, keep_metadata=self.keep_metadata, sniff=sniff),
+            [files[i][0] for i in to_peek],
+            [files[i][1] for i in to_peek],
+            chunksize=self._chunksize(len(to_peek))
+        )))
+
+        # (file index, peeked header or None, IDs to skip, expected ID)
+        to_build: List[Tuple[int, Optional[dict], frozenset, Optional[str]]] = []
+        records = [record for record, _ in lookups]
+        for i, record in enumerate(records):
+            if isinstance(peeked.get(i), dict):
+                header = peeked[i]
+                module_id = self._header_id(header)
+                to_build.append((i, header, frozenset((module_id,)) if module_id in seen else frozenset(), module_id))
+            elif i in peeked:
+                record.module = peeked[i]
+                module_id = record.module.id if record.module is not None else None
+                record.skipped = module_id in seen
+            else:
+                module_id = record.module.id if record.module is not None else None
+                if record.skipped and module_id not in seen:
+                    records[i] = self._renew_record(files[i][0], record)
+                    to_build.append((i, None, frozenset(), module_id))
+            if module_id is not None:
+                seen.add(module_id)
+
+        built = pool.map(
+            build,
+            [files[i][0] for i, _, _, _ in to_build],
+            [files[i][1] for i, _, _, _ in to_build],
+            [skip_ids for _, _, skip_ids, _ in to_build],
+            [header for _, header, _, _ in to_build],
+            chunksize=self._chunksize(len(to_build))
+        )
+        mispredicted = False
+        for (i, _, skip_ids, module_id), module in zip(to_build, built):
+            records[i].module = module
+            records[i].skipped = module is not None and module.id in skip_ids
+            mispredicted = mispredicted or (module is not None and module.id != module_id)
+
+        if mispredicted:
+            # A header named an ID its unparseable body could not claim (the
+            # module fell back to its path ID): files skipped in its favour
+            # are built after all.
+            seen = initial_ids
+            for i, record in enumerate(records):
+                if record.skipped and record.module.id not in seen:
+                    records[i] = record = self._renew_record(files[i][0], record)
+                    record.module = build(files[i][0], files[i][1])
+                if record.module is not None:
+                    seen.add(record.module.id)
+
+        for record in records:
+            yield record.module
+
+    def _lookup_record(self, file_path: Path, bundle_root: Path) -> Tuple[FileRecord, bool]:
+        """
+        Returns the parse record of a file and whether it must be (re)parsed.
+        Reuses the snapshot/previous record if the file stamp is unchanged.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 1. Try generic ID extraction (YAML/Header)
-            module_id = None
-            module_type = "RESOURCE" # Default type for raw
-            version = "1.0"          # Default version for raw
-            metadata = {}
-
-            is_yaml = file_path.suffix in ['.yaml', '.yml']
-            
-            if is_yaml:
-                try:
-                    data = yaml.safe_load(content)
-                    if isinstance(data, dict):
-                        _id = data.get("id")
-                        module_type = data.get("type", module_type)
-                        version = data.get("version", version)
-                        module_id = f"{_id}/{version}"
-                        metadata = data
-                except Exception:
-                    # Not valid YAML, treat as raw text
-                    pass
-            
-            # 2. Fallback ID Generation (Path-Based)
-            # If no ID in content, use: {bundle_name}/{relative_path_from_bundle}
-            if not module_id:
-                bundle_name = bundle_root.name
-                rel_path = file_path.relative_to(bundle_root).as_posix() # Forward slashes
-                # Example: dcl-core/knowledges/ontology/dcl-core.ttl
-                module_id = f"{bundle_name}/{rel_path}"
-           
-            module = PromptModule(
-                id=str(module_id),
-                version=str(version),
-                type=str(module_type),
-                content=content,
-                metadata=metadata,
-                path=str(file_path)
+            stat = file_path.stat()
+        except OSError:
+            # Vanished since the scan: let _build_module report it.
+            stat = None
+        record = self._known_files.get(str(file_path))
+        needs_parsing = record is None or stat is None or not record.matches(stat, bundle_root, self.lazy, self.keep_metadata)
+        if needs_parsing:
+            record = FileRecord(
+                mtime_ns=stat.st_mtime_ns if stat else 0,
+                size=stat.st_size if stat else -1,
+                bundle_root=str(bundle_root),
+                module=None,
+                lazy=self.lazy,
+                metadata=self.keep_metadata
             )
-                
+            self._dirty = True
+        self._files[str(file_path)] = record
+        return record, needs_parsing
+
+    def _renew_record(self, file_path: Path, record: FileRecord) -> FileRecord:
+        # Records may be shared with the snapshot or a previous load: copy, don't mutate.
+        record = replace(record, module=None, skipped=False)
+        self._files[str(file_path)] = record
+        self._dirty = True
+        return record
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        if not self._dirty and self._known_files.keys() == self._files.keys():
+            return
+        try:
+            RegistrySnapshot(files=dict(self._files), indexes=dict(self._indexes)).save(self.snapshot_path)
+        except Exception as e:
+            print(f"Warning: Could not write snapshot {self.snapshot_path}: {e}")
+
+    def _load_file(self, file_path: Path, bundle_root: Path):
+        self._register_module(next(self._build_modules([(file_path, bundle_root)])), self.registry)
+
+    def _register_module(self, module: Optional[PromptModule], registry: PromptModuleRegistry):
+        if module is None:
+            return
+        try:
             with warnings.catch_warnings():
                 warnings.simplefilter("error", category=DuplicateIdWarning)
-                self.registry.register(module)
-            
+                registry.register(module)
         except DuplicateIdWarning:
             # First-Wins: Ignore
             pass
+
+    @staticmethod
+    def _peek(
+        file_path: Path,
+        bundle_root: Path,
+        lazy: bool = False,
+        keep_metadata: bool = True,
+        sniff: bool = True
+    ) -> Union[PromptModule, dict, None]:
+        """
+        First, parallel pass over a file. Returns the finished module when its
+        outcome cannot depend on First-Wins (raw files, lazy mode, no header
+        sniffing, YAML without a conventional header); otherwise the sniffed
+        YAML header, which tells the ID and is handed to _build_module() so it
+        is not sniffed again.
+        """
+        if lazy or not sniff or file_path.suffix not in YAML_SUFFIXES:
+            return Loader._build_module(file_path, bundle_root, lazy=lazy, keep_metadata=keep_metadata, sniff=sniff)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            header = sniff_header(content)
+            if header is not None:
+                return header
+            return Loader._yaml_module(file_path, bundle_root, content, None, keep_metadata=keep_metadata)
         except Exception as e:
             print(f"Error loading file {file_path}: {e}")
+            return None
+
+    @staticmethod
+    def _header_id(header: dict) -> str:
+        return f"{header.get('id')}/{header.get('version', '1.0')}"
+
+    @staticmethod
+    def _build_module(
+        file_path: Path,
+        bundle_root: Path,
+        skip_ids: Collection[str] = (),
+        header: Optional[dict] = None,
+        lazy: bool = False,
+        keep_metadata: bool = True,
+        sniff: bool = True
+    ) -> Optional[PromptModule]:
+        """
+        Reads and parses a single file into a PromptModule.
+        Has no side effects on the registry, so it is safe to run in a worker.
+        Returns None if the file cannot be loaded.
+
+        YAML headers (top-level id/type/version) are sniffed before the
+        document is parsed (in lazy mode, or with `sniff`), unless the sniffed
+        `header` is passed in. If the sniffed ID is in skip_ids, or in lazy
+        mode, the body is only checked for well-formedness and a header-only
+        module is returned.
+        In lazy mode raw files are not read at all, and neither content nor
+        metadata are retained. Without keep_metadata, the parsed YAML tree is
+        only used for id/type/version and then discarded.
+
+        Binary files become blob modules: content stays None and the bytes
+        are read by the registry when requested. Eager loads sniff
+        the bytes they read (see is_binary_data); lazy loads go by the file
+        suffix and leave other files to be sniffed on first use.
+
+        The module's token_count is computed here, once per load; modules
+        without content get an estimate from the file size.
+        """
+        try:
+            is_yaml = file_path.suffix in YAML_SUFFIXES
+
+            if is_yaml:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                if header is None and (lazy or sniff):
+                    header = sniff_header(content)
+                return Loader._yaml_module(file_path, bundle_root, content, header, skip_ids, lazy, keep_metadata)
+
+            content = None
+            if lazy:
+                # Nothing is read: binary formats are told by their suffix, other
+                # files are sniffed by the registry when first requested.
+                mime_type = guess_blob_type(file_path.name)
+            else:
+                with open(file_path, 'rb') as f:
+                    head = f.read(BINARY_SNIFF_SIZE)
+                    binary = is_binary_data(head)
+                    if not binary:
+                        content = decode_text(head + f.read())
+                mime_type = blob_mime_type(file_path.name) if binary else None
+
+            return PromptModule(
+                id=Loader._fallback_id(file_path, bundle_root),
+                version="1.0",
+                type="RESOURCE",
+                content=content,
+                metadata={},
+                path=str(file_path),
+                token_count=(
+                    estimate_tokens(content) if content is not None
+                    else estimate_tokens_from_size(file_path.stat().st_size)
+                ),
+                # Blob: never decoded; the registry maps the file on first use.
+                mime_type=mime_type
+            )
+
+        except Exception as e:
+            print(f"Error loading file {file_path}: {e}")
+            return None
+
+    @staticmethod
+    def _yaml_module(
+        file_path: Path,
+        bundle_root: Path,
+        content: str,
+        header: Optional[dict],
+        skip_ids: Collection[str] = (),
+        lazy: bool = False,
+        keep_metadata: bool = True
+    ) -> PromptModule:
+        """
+        Builds the module of a YAML file from its text and sniffed header
+        (None if it has none). Files that are not a YAML mapping are kept as
+        raw text under their path-based ID, header or not.
+        """
+        # 1. Try generic ID extraction (YAML/Header)
+        module_id = None
+        module_type = "RESOURCE" # Default type for raw
+        version = "1.0"          # Default version for raw
+        metadata = {}
+
+        if header is not None and (lazy or Loader._header_id(header) in skip_ids):
+            # Header-only: the body is checked, not built.
+            if is_yaml_mapping(content):
+                return PromptModule(
+                    id=Loader._header_id(header),
+                    version=str(header.get("version", version)),
+                    type=str(header.get("type", module_type)),
+                    content=None,
+                    metadata={},
+                    path=str(file_path),
+                    token_count=estimate_tokens(content)
+                )
+        else:
+            try:
+                data = load_yaml(content)
+                if isinstance(data, dict):
+                    _id = data.get("id")
+                    module_type = data.get("type", module_type)
+                    version = data.get("version", version)
+                    module_id = f"{_id}/{version}"
+                    metadata = data
+            except Exception:
+                # Not valid YAML, treat as raw text
+                pass
+
+        # 2. Fallback ID Generation (Path-Based)
+        if not module_id:
+            module_id = Loader._fallback_id(file_path, bundle_root)
+
+        return PromptModule(
+            id=str(module_id),
+            version=str(version),
+            type=str(module_type),
+            content=None if lazy else content,
+            metadata=metadata if keep_metadata and not lazy else {},
+            path=str(file_path),
+            token_count=estimate_tokens(content)
+        )
+
+    @staticmethod
+    def _fallback_id(file_path: Path, bundle_root: Path) -> str:
+        # If no ID in content, use: {bundle_name}/{relative_path_from_bundle}
+        bundle_name = bundle_root.name
+        rel_path = file_path.relative_to(bundle_root).as_posix() # Forward slashes
+        # Example: dcl-core/knowledges/ontology/dcl-core.ttl
+        return f"{bundle_name}/{rel_path}"
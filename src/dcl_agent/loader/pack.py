@@ -0,0 +1,229 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from ..exceptions import DCLConfigurationError
+from ..model import PromptModule
+
+PACK_MAGIC = b"DCLPACK\0"
+PACK_SUFFIX = ".dclpack"
+# Bump whenever the header or index layout changes.
+PACK_FORMAT = 1
+# magic, format, flags (reserved), index offset, index length
+_HEADER = struct.Struct("<8sHHQQ")
+
+@dataclass(slots=True)
+class PackedBody:
+    """Location of a module body inside a RegistryPack."""
+    pack: "RegistryPack"
+    offset: int
+    length: int
+    compressed: bool = False
+
+    def materialize(self, module: PromptModule) -> PromptModule:
+        """
+        Returns a copy of the module with its body filled in from the pack.
+        Blobs get a read-only memoryview into the shared mapping (no copy);
+        text is decoded from the mapped pages on every call, so the registry
+        caches the result (see PromptModuleRegistry.attach_pack).
+        """
+        data = self.pack.read(self.offset, self.length, self.compressed)
+        if module.is_blob:
+            return replace(module, data=data)
+        return replace(module, content=str(data, "utf-8"))
+
+class RegistryPack:
+    """
+    Read-only, memory-mapped pack of module bodies plus a compact index.
+
+    Layout: a fixed header (magic, format, index offset and length), the
+    module bodies back to back (equal bodies stored once), then a JSON
+    index of module IDs, types, versions, body spans and aliases.
+
+    Every process opening the same pack maps the same file pages, so the
+    bodies are held once by the OS page cache however many worker processes
+    attach; each process only keeps the small index objects. Attach a pack
+    with PromptModuleRegistry.attach_pack().
+    """
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Pack file written by write_pack().
+
+        Raises DCLConfigurationError if the file is not a pack of this format.
+        """
+        self.path = str(path)
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise DCLConfigurationError(f"{path} is not a DCL pack (truncated header)")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, pack_format, _, index_offset, index_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != PACK_MAGIC:
+            raise DCLConfigurationError(f"{path} is not a DCL pack")
+        if pack_format != PACK_FORMAT:
+            raise DCLConfigurationError(f"{path} has pack format {pack_format}, expected {PACK_FORMAT}")
+        self._buffer = memoryview(self._mmap)
+        index = json.loads(self._buffer[index_offset:index_offset + index_length].tobytes())
+        self.aliases: Dict[str, str] = index.get("aliases", {})
+        self.info: Dict[str, Any] = index.get("info", {}) # Free-form build information
+        self.modules: List[PromptModule] = [self._module(entry) for entry in index["modules"]]
+
+    def _module(self, entry: dict) -> PromptModule:
+        return PromptModule(
+            id=entry["id"],
+            version=entry["version"],
+            type=entry["type"],
+            content=None,
+            metadata=entry.get("metadata", {}),
+            path=entry.get("path"),
+            token_count=entry.get("tokens"),
+            mime_type=entry.get("mime_type"),
+            packed=PackedBody(self, entry["offset"], entry["length"], entry.get("compressed", False))
+        )
+
+    def read(self, offset: int, length: int, compressed: bool = False) -> memoryview:
+        """Read-only view of a body; compressed bodies are inflated into a private copy."""
+        view = self._buffer[offset:offset + length]
+        if compressed:
+            return memoryview(zlib.decompress(view))
+        return view
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def close(self) -> None:
+        """
+        Unmaps the pack. Views handed out by get() that are still alive keep
+        the mapping open until they are released.
+        """
+        self._buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass # Exported views remain valid; the mapping goes with the last one.
+
+    def __enter__(self) -> "RegistryPack":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _body(module: PromptModule) -> bytes:
+    if module.is_blob:
+        return bytes(module.data if module.data is not None else b"")
+    return (module.content or "").encode("utf-8")
+
+def write_pack(
+    path: str,
+    modules: Iterable[PromptModule],
+    aliases: Optional[Dict[str, str]] = None,
+    compress: bool = False,
+    include_metadata: bool = False,
+    info: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Writes a pack file atomically (temp file + rename).
+
+    Args:
+        path: Target file.
+        modules: Modules with their bodies loaded (content, or data for blobs),
+            e.g. from registry.get() so that lazy modules are read.
+        aliases: Alias -> module ID.
+        compress: zlib-compress bodies where that saves space. Compressed
+            bodies are inflated per read instead of being shared zero-copy.
+        include_metadata: Keep the parsed YAML tree of modules; it lives in the
+            index, so it is held by every process (values JSON cannot
+            represent, e.g. dates, are stored as strings).
+        info: Free-form JSON data stored in the index (RegistryPack.info).
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    entries = []
+    spans: Dict[bytes, tuple] = {} # body -> (offset, length, compressed)
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        offset = _HEADER.size
+        for module in modules:
+            body = _body(module)
+            span = spans.get(body)
+            if span is None:
+                stored, compressed = body, False
+                if compress and body:
+                    packed = zlib.compress(body)
+                    if len(packed) < len(body):
+                        stored, compressed = packed, True
+                f.write(stored)
+                span = spans[body] = (offset, len(stored), compressed)
+                offset += len(stored)
+            entry = {
+                "id": module.id,
+                "version": module.version,
+                "type": module.type,
+                "offset": span[0],
+                "length": span[1],
+            }
+            if span[2]:
+                entry["compressed"] = True
+            if module.token_count is not None:
+                entry["tokens"] = module.token_count
+            if module.path:
+                entry["path"] = module.path
+            if module.mime_type:
+                entry["mime_type"] = module.mime_type
+            if include_metadata and module.metadata:
+                entry["metadata"] = module.metadata
+            entries.append(entry)
+
+        index = json.dumps(
+            {"modules": entries, "aliases": dict(aliases or {}), "info": info or {}},
+            separators=(",", ":"),
+            default=str
+        ).encode("utf-8")
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_FORMAT, 0, offset, len(index)))
+    os.replace(tmp_path, target)
+
+def pack_registry(registry, path: str, **kwargs) -> None:
+    """
+    Writes the current contents of a registry (modules and aliases) to a pack.
+    Lazily loaded modules are read from disk; keyword arguments go to write_pack().
+    """
+    view = registry.view()
+    modules = (view.get(module_id) for module_id in view.list_modules())
+    write_pack(path, (m for m in modules if m is not None), view._aliases, **kwargs)
+
+def main(argv=None):
+    # Only the command line needs argparse: keep it out of `import dcl_agent`.
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Build packed bundles (one file per bundle directory), loadable in place of the directory."
+    )
+    parser.add_argument("bundles", nargs="+", help="bundle root directories")
+    parser.add_argument("--output-dir", help=f"where to write <bundle>{PACK_SUFFIX} (default: next to each bundle)")
+    parser.add_argument("--compress", action="store_true", help="zlib-compress module bodies")
+    parser.add_argument("--metadata", action="store_true", help="keep the parsed YAML tree of modules")
+    parser.add_argument("--max-workers", type=int, help="parse bundle files in parallel")
+    args = parser.parse_args(argv)
+
+    # The loader imports this module: import it only when building.
+    from .loader import pack_bundle
+    for bundle in args.bundles:
+        root = Path(bundle).resolve()
+        output = Path(args.output_dir or root.parent) / f"{root.name}{PACK_SUFFIX}"
+        count = pack_bundle(
+            str(root),
+            str(output),
+            compress=args.compress,
+            include_metadata=args.metadata,
+            max_workers=args.max_workers
+        )
+        print(f"{root} -> {output}: {count} modules, {output.stat().st_size} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,16 @@
-from typing import Dict, Optional, List, Union
+from typing import Dict, Iterator, Optional, List, Tuple, Union
+from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
+import os
+import sys
+import threading
 import warnings
+import weakref
+from ..cache import LRUCache
+from .blobs import BINARY_SNIFF_SIZE, blob_mime_type, decode_text, is_binary_data
+from .content_store import ContentStore, DedupStats, default_content_store
+from .index import RegistryIndex, VersionSpec, split_module_id
 from ..model import PromptModule
 from ..exceptions import (
     AliasAlreadyExistsWarning, 
@@ -8,70 +18,472 @@ from ..exceptions import (
     InvalidAliasError
 )
 
+# Characters of decoded pack text cached per registry when content_cache_size
+# is not set: a pack's bodies are meant to stay in the shared pages.
+PACK_TEXT_CACHE_SIZE = 1 << 20
+
+class RegistryView:
+    """
+    Immutable snapshot of the registry contents at one generation.
+    A view taken once per request keeps resolving against the same modules
+    and aliases even if modules are registered or the registry is
+    hot-reloaded meanwhile: writers never modify a published view, they
+    build the next generation and publish it with a single assignment.
+    """
+    __slots__ = ("generation", "_modules", "_aliases", "_registry", "_index")
+
+    def __init__(
+        self,
+        registry: "PromptModuleRegistry",
+        modules: Dict[str, PromptModule],
+        aliases: Dict[str, str],
+        generation: int,
+        index: Optional[RegistryIndex] = None
+    ):
+        self._registry = registry
+        self._modules = modules
+        self._aliases = aliases
+        self.generation = generation
+        self._index = index if index is not None else RegistryIndex()
+
+    def get(self, key: str) -> Optional[PromptModule]:
+        """Retrieves a module by ID, Alias or `name@version-spec`."""
+        return self._registry._resolve(self._modules, self._aliases, key, self._index)
+
+    def list_modules(self, module_type: Optional[str] = None, prefix: Optional[str] = None) -> List[str]:
+        """
+        Lists module IDs, optionally only those of a type (e.g. "OPERATOR")
+        and/or whose name starts with the given path segments.
+        """
+        if module_type is None and prefix is None:
+            return list(self._modules.keys())
+        if prefix is None:
+            return self._index.by_type(module_type)
+        ids = self._index.by_prefix(prefix)
+        if module_type is not None:
+            ids = (m for m in ids if self._modules[m].type == module_type)
+        return list(ids)
+
+    def versions(self, name: str) -> List[str]:
+        """Module IDs of every version of a module name, oldest first."""
+        return self._index.versions(name)
+
+    def _next(self) -> "RegistryView":
+        """Private, writable copy of this view, one generation ahead."""
+        return RegistryView(
+            self._registry,
+            dict(self._modules),
+            dict(self._aliases),
+            self.generation + 1,
+            self._index.copy()
+        )
+
+class _OwnedContents:
+    """
+    Modules whose contents a registry holds references to in its ContentStore.
+    Kept apart from the registry so that its finalizer can release them
+    without keeping the registry alive.
+    """
+    __slots__ = ("modules",)
+
+    def __init__(self):
+        self.modules: Dict[str, PromptModule] = {}
+
+def _release_owned(store: ContentStore, owned: _OwnedContents) -> None:
+    modules, owned.modules = owned.modules, {}
+    for module in modules.values():
+        store.release(module.content)
+
 class PromptModuleRegistry:
     """
     Stores and manages loaded Prompt Modules and Resources.
     """
-    def __init__(self):
-        self._modules: Dict[str, PromptModule] = {}
-        self._aliases: Dict[str, str] = {} # alias -> target_id
+    def __init__(
+        self,
+        content_cache_size: Optional[int] = None,
+        content_store: Optional[ContentStore] = default_content_store
+    ):
+        """
+        Args:
+            content_cache_size: Upper bound (in characters) of lazily loaded
+                content kept in memory. None keeps all content once read,
+                except for text decoded from packs (see attach_pack()).
+            content_store: Deduplicates module contents: modules with equal
+                content share one string. Defaults to the process-wide store,
+                shared with every other registry; None disables deduplication.
+        """
+        # Published contents (copy-on-write). Only ever replaced as a whole,
+        # so that modules, aliases and generation are published together and
+        # readers need no lock.
+        self._owned = _OwnedContents()
+        self._current = RegistryView(self, {}, {}, 0)
+        # Next generation being built by the open transaction(), if any.
+        self._pending: Optional[RegistryView] = None
+        # Next generation collecting writes made outside a transaction;
+        # published by the next read (see _view).
+        self._draft: Optional[RegistryView] = None
+        # module_id -> content, for modules registered without content (lazy loading)
+        self.content_cache = LRUCache(max_weight=content_cache_size, weigher=len)
+        # module_id -> text decoded from an attached pack; always bounded
+        self._pack_text = LRUCache(
+            max_weight=content_cache_size if content_cache_size is not None else PACK_TEXT_CACHE_SIZE,
+            weigher=len
+        )
+        # module_id -> (file stamp, read-only bytes) of blobs read so far;
+        # the stamp is None for bodies inflated from a pack
+        self._blobs: Dict[str, Tuple[Optional[Tuple[int, int]], memoryview]] = {}
+        self._blobs_lock = threading.Lock()
+        # Serializes writers; held for the whole of a transaction().
+        self._write_lock = threading.RLock()
+        self.content_store = content_store
+        if content_store is not None:
+            # A registry dropped without clear() must not pin its contents in a shared store.
+            weakref.finalize(self, _release_owned, content_store, self._owned)
+
+    @property
+    def _view(self) -> RegistryView:
+        """The published generation, after publishing the draft of single writes if any."""
+        if self._draft is not None:
+            with self._write_lock:
+                draft, self._draft = self._draft, None
+                if draft is not None:
+                    self._set_view(draft)
+        return self._current
+
+    @property
+    def _modules(self) -> Dict[str, PromptModule]:
+        return self._view._modules
+
+    @property
+    def _aliases(self) -> Dict[str, str]: # alias -> target_id
+        return self._view._aliases
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every change; lets caches detect stale entries."""
+        return self._view.generation
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Groups writes into one generation.
+        register() and register_alias() calls made inside the block go to a
+        private copy of the contents, published atomically when the block
+        exits; readers (including get() inside the block) keep seeing the
+        previous generation until then. If the block raises, its writes are
+        discarded. Other writers wait until the transaction ends; nested
+        transactions join the outer one.
+        """
+        with self._write_lock:
+            if self._pending is not None:
+                yield
+                return
+            self._pending = self._view._next()
+            changed = False
+            try:
+                yield
+                changed = True
+            finally:
+                pending, self._pending = self._pending, None
+                if changed:
+                    self._publish(pending)
+                else:
+                    published = self._view._modules
+                    self._release_contents({
+                        module_id: module for module_id, module in pending._modules.items()
+                        if published.get(module_id) is not module
+                    })
+
+    def _publish(self, view: RegistryView) -> None:
+        current = self._view
+        # Writes only ever add entries, so equal sizes mean nothing was written:
+        # keep the generation (and the caches keyed by it).
+        if len(view._modules) == len(current._modules) and len(view._aliases) == len(current._aliases):
+            return
+        self._set_view(view)
+
+    def _set_view(self, view: RegistryView) -> None:
+        self._current = view
+        self._owned.modules = view._modules
+
+    def _latest(self) -> RegistryView:
+        """The view writes go to if one is open, else the published one. Call with _write_lock held."""
+        return self._pending or self._draft or self._current
+
+    @contextmanager
+    def _writing(self) -> Iterator[RegistryView]:
+        """
+        Yields the view to write to: the open transaction's, or else the
+        draft that collects single writes until the next read publishes it,
+        so that a run of register() calls copies the contents once.
+        """
+        with self._write_lock:
+            if self._pending is not None:
+                yield self._pending
+                return
+            if self._draft is None:
+                self._draft = self._current._next()
+                # It holds every published module as well: it owns the contents now.
+                self._owned.modules = self._draft._modules
+            yield self._draft
 
     def register(self, module: PromptModule) -> None:
         """
         Registers a module.
         Raises DuplicateIdWarning if ID exists (First-Wins).
+        Outside a transaction() the module is visible to the next read,
+        which publishes it as a new generation together with any other
+        writes made since the previous read.
         """
-        if module.id in self._modules:
-            warnings.warn(
-                f"Module ID '{module.id}' already exists. Keeping original.",
-                DuplicateIdWarning
-            )
-            return
+        with self._write_lock:
+            if module.id in self._latest()._modules:
+                warnings.warn(
+                    f"Module ID '{module.id}' already exists. Keeping original.",
+                    DuplicateIdWarning
+                )
+                return
 
-        self._modules[module.id] = module
+            with self._writing() as view:
+                # Type and version strings repeat across thousands of modules.
+                module.type = sys.intern(module.type)
+                module.version = sys.intern(module.version)
+                if self.content_store is not None:
+                    # Same value, shared object: safe even for modules held elsewhere.
+                    module.content = self.content_store.acquire(module.content)
+                view._modules[module.id] = module
+                view._index.add(module)
 
     def register_alias(self, alias: str, target_id: str) -> None:
         """
         Registers an explicit alias.
         Raises AliasAlreadyExistsWarning if alias exists.
         """
-        if alias in self._aliases:
-            warnings.warn(
-                f"Alias '{alias}' already exists (target: {self._aliases[alias]}). "
-                f"Ignoring new target: {target_id}",
-                AliasAlreadyExistsWarning
-            )
-            return
-            
-        self._aliases[alias] = target_id
+        with self._write_lock:
+            aliases = self._latest()._aliases
+            if alias in aliases:
+                warnings.warn(
+                    f"Alias '{alias}' already exists (target: {aliases[alias]}). "
+                    f"Ignoring new target: {target_id}",
+                    AliasAlreadyExistsWarning
+                )
+                return
+
+            with self._writing() as view:
+                view._aliases[alias] = target_id
     
+    def attach_pack(self, pack) -> None:
+        """
+        Registers the modules and aliases of a RegistryPack (see loader.pack)
+        in one transaction, with the usual First-Wins warnings.
+        The registry only holds the pack's index entries: get() fills in the
+        bodies from the shared mapping. The most recently decoded texts are
+        cached per process, up to content_cache_size characters or
+        PACK_TEXT_CACHE_SIZE if that is not set, so that memory per worker
+        stays flat however large the pack; inflated compressed blobs are
+        cached in full.
+        """
+        with self.transaction():
+            for module in pack.modules:
+                self.register(module)
+            for alias, target_id in pack.aliases.items():
+                self.register_alias(alias, target_id)
+
     def validate_aliases(self) -> None:
         """
         Checks integrity of all aliases.
         Raises InvalidAliasError if target is missing.
         """
-        for alias, target in self._aliases.items():
+        self.validate_aliases_subset(self._aliases)
+
+    def validate_aliases_subset(self, aliases) -> None:
+        """
+        Checks integrity of the given aliases only.
+        Raises InvalidAliasError if a target is missing.
+        """
+        for alias in aliases:
+            target = self._aliases[alias]
             # Check modules (Resource paths checking logic to be added if mixed resources are supported)
             # For now we check _modules. If we had _resources list, we would check there too.
             if target not in self._modules:
                  raise InvalidAliasError(f"Alias '{alias}' points to missing target '{target}'")
 
     def get(self, key: str) -> Optional[PromptModule]:
-        """Retrieves a module by ID or Alias."""
+        """
+        Retrieves a module by ID or Alias.
+        `name@latest` or `name@<version spec>` (e.g. `@^8.1`, `@>=8,<9`, `@8.x`)
+        resolves to the highest matching version of a module name (its ID
+        without the version segment) or of an alias's target.
+        """
+        return self._view.get(key)
+
+    def list_modules(self, module_type: Optional[str] = None, prefix: Optional[str] = None) -> List[str]:
+        return self._view.list_modules(module_type, prefix)
+
+    def versions(self, name: str) -> List[str]:
+        return self._view.versions(name)
+
+    def view(self) -> RegistryView:
+        """
+        Returns the current generation: an immutable, consistent snapshot.
+        Take it once per request and resolve everything against it.
+        """
+        return self._view
+
+    def swap(self, other: "PromptModuleRegistry") -> None:
+        """
+        Atomically replaces the contents with those of a staging registry.
+        Readers see either the old or the new contents, never a mix.
+        Cached lazy content of replaced or removed modules is dropped.
+        The staging registry hands its modules over and is left empty.
+        """
+        with self._write_lock:
+            old_modules = self._modules
+            self._set_view(RegistryView(
+                self,
+                dict(other._modules),
+                dict(other._aliases),
+                self.generation + 1,
+                other._view._index
+            ))
+            for module_id, module in old_modules.items():
+                if self._modules.get(module_id) is not module:
+                    self.content_cache.pop(module_id)
+                    self._pack_text.pop(module_id)
+                    with self._blobs_lock:
+                        self._blobs.pop(module_id, None)
+            # The new modules keep the references the staging registry acquired.
+            other._set_view(RegistryView(other, {}, {}, other.generation + 1))
+            self._release_contents(old_modules)
+
+    def _resolve(
+        self,
+        modules: Dict[str, PromptModule],
+        aliases: Dict[str, str],
+        key: str,
+        index: Optional[RegistryIndex] = None
+    ) -> Optional[PromptModule]:
         # 1. Check direct ID
-        if key in self._modules:
-            return self._modules[key]
-        
+        module = modules.get(key)
+
         # 2. Check Alias
-        if key in self._aliases:
-            target_id = self._aliases[key]
-            return self._modules.get(target_id)
-            
-        return None
+        if module is None and key in aliases:
+            module = modules.get(aliases[key])
+
+        # 3. Version query: name@spec
+        if module is None and index is not None and "@" in key:
+            name, spec = key.rsplit("@", 1)
+            target = modules.get(aliases.get(name, name))
+            if target is not None:
+                name = split_module_id(target)
+            module_id = index.resolve(name, VersionSpec(spec))
+            module = modules.get(module_id) if module_id is not None else None
+
+        if module is not None and module.content is None:
+            if module.packed is not None:
+                return self._unpack(module)
+            if module.is_blob:
+                return self._read_blob(module)
+            return self._materialize(module)
+        return module
+
+    def _read_blob(self, module: PromptModule) -> Optional[PromptModule]:
+        """
+        Returns a copy of a blob module whose data is a read-only view of the
+        file's bytes, read once and shared by all readers. Bundle files are
+        not memory-mapped: they may be rewritten in place (hot reload), which
+        would fault the readers of a mapping. The bytes are read again when
+        the file's stamp (mtime, size) changes.
+        """
+        if module.data is not None:
+            return module
+        try:
+            stat = os.stat(module.path)
+        except OSError as e:
+            print(f"Error reading file {module.path}: {e}")
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._blobs_lock:
+            entry = self._blobs.get(module.id)
+            if entry is None or entry[0] != stamp:
+                try:
+                    with open(module.path, 'rb') as f:
+                        data = memoryview(f.read())
+                except Exception as e:
+                    print(f"Error reading file {module.path}: {e}")
+                    return None
+                entry = self._blobs[module.id] = (stamp, data)
+        return replace(module, data=entry[1])
+
+    def _unpack(self, module: PromptModule) -> PromptModule:
+        """
+        Returns a copy of a packed module with its body filled in. Recently
+        decoded text is kept in a small LRU of its own and inflated blobs
+        with the ones read from files, so that repeated gets neither decode
+        nor inflate again. Uncompressed blobs stay zero-copy views of
+        the pack, which is never modified in place (see write_pack).
+        """
+        if module.is_blob:
+            entry = self._blobs.get(module.id)
+            if entry is not None:
+                return replace(module, data=entry[1])
+            unpacked = module.packed.materialize(module)
+            if module.packed.compressed:
+                with self._blobs_lock:
+                    unpacked.data = self._blobs.setdefault(module.id, (None, unpacked.data))[1]
+            return unpacked
+        content = self._pack_text.get(module.id)
+        if content is not None:
+            return replace(module, content=content)
+        unpacked = module.packed.materialize(module)
+        self._pack_text.put(module.id, unpacked.content)
+        return unpacked
+
+    def _materialize(self, module: PromptModule) -> Optional[PromptModule]:
+        """
+        Returns a copy of a lazily loaded module with its content filled in.
+        The stored module stays an index entry; its content lives in the LRU.
+        """
+        content = self.content_cache.get(module.id)
+        if content is None:
+            if not module.path:
+                return module
+            if module.id in self._blobs:
+                return self._as_blob(module)
+            try:
+                with open(module.path, 'rb') as f:
+                    head = f.read(BINARY_SNIFF_SIZE)
+                    # Lazy loads only classify files by suffix: sniff the rest here.
+                    if is_binary_data(head):
+                        return self._as_blob(module)
+                    data = head + f.read()
+                content = decode_text(data)
+            except Exception as e:
+                print(f"Error loading file {module.path}: {e}")
+                return None
+            self.content_cache.put(module.id, content)
+        return replace(module, content=content)
+
+    def _as_blob(self, module: PromptModule) -> Optional[PromptModule]:
+        # A lazily loaded file that turned out to be binary.
+        return self._read_blob(replace(module, mime_type=blob_mime_type(module.path)))
+
+    def _release_contents(self, modules: Dict[str, PromptModule]) -> None:
+        if self.content_store is not None:
+            for module in modules.values():
+                self.content_store.release(module.content)
 
-    def list_modules(self) -> List[str]:
-        return list(self._modules.keys())
+    def dedup_stats(self) -> DedupStats:
+        """Memory saved by content deduplication (across all users of the store)."""
+        if self.content_store is None:
+            return DedupStats()
+        return self.content_store.stats()
 
     def clear(self):
-        self._modules.clear()
-        self._aliases.clear()
+        with self._write_lock:
+            old_modules = self._modules
+            self._set_view(RegistryView(self, {}, {}, self.generation + 1))
+        self._release_contents(old_modules)
+        self.content_cache.clear()
+        self._pack_text.clear()
+        with self._blobs_lock:
+            self._blobs.clear()
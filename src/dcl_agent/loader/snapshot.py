@@ -0,0 +1,86 @@
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .. import __version__
+from ..model import PromptModule
+
+# Bump whenever the pickled layout or the loader's parsing rules change.
+SNAPSHOT_FORMAT = 7
+
+@dataclass
+class FileRecord:
+    """Parse result of a single bundle file, stamped with the file's stat."""
+    mtime_ns: int
+    size: int
+    bundle_root: str
+    module: Optional[PromptModule] # None if the file could not be loaded
+    lazy: bool = False # Whether module content was left on disk
+    skipped: bool = False # Body not parsed: the ID was already taken (First-Wins)
+    metadata: bool = True # Whether the parsed YAML tree was retained
+
+    def matches(self, stat: os.stat_result, bundle_root: Path, lazy: bool = False, metadata: bool = True) -> bool:
+        return (
+            self.mtime_ns == stat.st_mtime_ns
+            and self.size == stat.st_size
+            and self.bundle_root == str(bundle_root)
+            and self.lazy == lazy
+            and self.metadata == metadata
+        )
+
+@dataclass
+class IndexRecord:
+    """Parsed content of a bundle's index.yaml."""
+    mtime_ns: int
+    size: int
+    data: Any
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+@dataclass
+class RegistrySnapshot:
+    """
+    Compiled on-disk image of everything the Loader parsed.
+    Records are keyed by file path and validated against mtime and size,
+    so only files changed since the snapshot was written get reparsed.
+
+    The snapshot is a pickle: only point the loader at files you trust.
+    """
+    files: Dict[str, FileRecord] = field(default_factory=dict)
+    indexes: Dict[str, IndexRecord] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str) -> "RegistrySnapshot":
+        """
+        Reads a snapshot in one go.
+        Returns an empty snapshot if the file is missing, corrupt or was
+        written by a different format/package version.
+        """
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+            if payload.get("format") != SNAPSHOT_FORMAT or payload.get("version") != __version__:
+                return cls()
+            return cls(files=payload["files"], indexes=payload["indexes"])
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable snapshot {path}: {e}")
+            return cls()
+
+    def save(self, path: str) -> None:
+        """Writes the snapshot atomically (temp file + rename)."""
+        payload = {
+            "format": SNAPSHOT_FORMAT,
+            "version": __version__,
+            "files": self.files,
+            "indexes": self.indexes,
+        }
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, target)
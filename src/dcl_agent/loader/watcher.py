@@ -0,0 +1,75 @@
+import threading
+from typing import Callable, Optional
+from .loader import Loader, ReloadResult
+
+class BundleWatcher:
+    """
+    Polls the bundle roots of a Loader and hot-reloads changed files.
+    Change detection is done by Loader.reload() itself (mtime and size of
+    every file), so polling works on any filesystem, including network
+    mounts and container volumes where inotify events are not delivered.
+    """
+    def __init__(
+        self,
+        loader: Loader,
+        interval: float = 1.0,
+        on_reload: Optional[Callable[[ReloadResult], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None
+    ):
+        """
+        Args:
+            loader: Loader whose bundles are watched (after load_bundles()).
+            interval: Seconds between two polls.
+            on_reload: Called with the ReloadResult whenever something changed.
+            on_error: Called when a reload fails (defaults to printing the error).
+                The registry keeps its previous contents in that case.
+        """
+        self.loader = loader
+        self.interval = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BundleWatcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="dcl-bundle-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll(self) -> ReloadResult:
+        """Runs a single reload cycle and dispatches the callbacks."""
+        try:
+            result = self.loader.reload()
+        except Exception as e:
+            if self.on_error:
+                self.on_error(e)
+            else:
+                print(f"Error reloading bundles: {e}")
+            return ReloadResult()
+        if result and self.on_reload:
+            self.on_reload(result)
+        return result
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def __enter__(self) -> "BundleWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
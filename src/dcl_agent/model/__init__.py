@@ -1,34 +1,46 @@
+import dataclasses
+import hashlib
+import inspect
+import json
 from dataclasses import dataclass, field
-from typing import List, Any, Optional
+from typing import Iterable, List, Any, Optional, Union
 
-@dataclass
+@dataclass(slots=True)
 class ContextFrame:
     """Base class for frames (parts) of the prompt."""
     pass
 
-@dataclass
+@dataclass(slots=True)
 class TextFrame(ContextFrame):
     """Represents a text part of the prompt."""
     content: str
 
-@dataclass
+@dataclass(slots=True)
 class BlobFrame(ContextFrame):
     """Represents a binary part of the prompt (image, audio, etc.)."""
     mime_type: str
-    data: bytes  # For small binary payloads
+    data: Union[bytes, memoryview]  # Payload; a memoryview (e.g. over a memory-mapped file) is not copied
     uri: Optional[str] = None # For Cloud Storage URIs
 
-@dataclass
+@dataclass(slots=True)
 class PromptModule:
     """Represents a loaded DCL Prompt Module."""
     id: str
     version: str
     type: str # OPERATOR, MODIFIER, etc.
-    content: str # Raw content (YAML/Text)
+    content: Optional[str] # Raw content (YAML/Text); None until read for lazily loaded modules
     metadata: dict = field(default_factory=dict)
     path: Optional[str] = None
+    token_count: Optional[int] = None # Estimated tokens of content, precomputed at load time
+    mime_type: Optional[str] = None # Set for binary (blob) modules, whose content stays None
+    data: Optional[memoryview] = None # Blob bytes, read by the registry on first use
+    packed: Optional[Any] = None # PackedBody locating the body in a RegistryPack (see loader.pack)
 
-@dataclass
+    @property
+    def is_blob(self) -> bool:
+        return self.mime_type is not None
+
+@dataclass(slots=True)
 class InvocationContext:
     """
     Holds the assembled context in a generic format.
@@ -40,19 +52,36 @@ class InvocationContext:
 
     tools: List[Any] = field(default_factory=list) # Generic tool definitions
 
-@dataclass
+    metadata: dict = field(default_factory=dict)
+    """
+    Assembly notes for adapters and callers (e.g. token budget usage).
+    """
+
+    prefix_frames: int = 0
+    """
+    Number of leading frames that do not depend on the request (zero frame,
+    operator, modifiers...). Adapters may cache them provider-side.
+    """
+
+    prefix_fingerprint: Optional[str] = None
+    """
+    digest_frames() of the first prefix_frames frames, computed once at
+    assembly time (None when the strategy does not produce a stable prefix).
+    """
+
+@dataclass(slots=True)
 class Entity:
     """Represents a generic DCL Entity (Structural)."""
     type: str  # e.g. "PromptModule", "Lens", "String"
     value: str # Content or Args, e.g. "sys/ops/write"
 
-@dataclass
+@dataclass(slots=True)
 class ResourceRef:
     """Represents a reference to a DCL resource (e.g. Lens('Tone'))."""
     id: str  # The raw ID or Name
     type: Optional[str] = None # The explicit type if provided (e.g. Lens)
 
-@dataclass
+@dataclass(slots=True)
 class Instruction:
     """Represents a parsed DCL instruction."""
     action: str # Operator ID
@@ -62,3 +91,51 @@ class Instruction:
     goals: List[ResourceRef] = field(default_factory=list) # OPTIMIZING_FOR ...
     original_dcl_instruction: str = "" # The raw source DCL instruction text
 
+
+def _stable_json(value: Any) -> Any:
+    """
+    json.dumps default for digest key parts: a representation that is equal
+    across processes. Raises TypeError for values without one (repr() would
+    embed memory addresses).
+    """
+    if hasattr(value, "model_dump"):
+        # Pydantic models, e.g. google.genai types.Tool: their declared schema.
+        return value.model_dump(mode="json", exclude_none=True)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    qualname = getattr(value, "__qualname__", None)
+    if callable(value) and qualname and "<lambda>" not in qualname:
+        # Python functions are declared to the model from their signature and docstring.
+        try:
+            signature = str(inspect.signature(value))
+        except (TypeError, ValueError):
+            signature = ""
+        return [value.__module__, qualname, signature, inspect.getdoc(value)]
+    raise TypeError(f"No stable representation of {type(value).__name__} {value!r}")
+
+def digest_frames(frames: Iterable[ContextFrame], *extra: Any) -> str:
+    """
+    Stable SHA-256 hex digest of context frames, plus optional extra key parts
+    (tools, model name...). Equal inputs give equal digests across processes.
+    Raises TypeError if an extra part cannot be represented stably (e.g. a
+    lambda or an arbitrary object among the tools).
+    """
+    h = hashlib.sha256()
+
+    def feed(tag: bytes, data: bytes):
+        h.update(tag)
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+
+    for frame in frames:
+        if isinstance(frame, TextFrame):
+            feed(b"T", frame.content.encode("utf-8"))
+        elif isinstance(frame, BlobFrame):
+            feed(b"B", frame.mime_type.encode("utf-8"))
+            feed(b"U", (frame.uri or "").encode("utf-8"))
+            feed(b"D", frame.data or b"")
+        else:
+            feed(b"?", repr(frame).encode("utf-8"))
+    for part in extra:
+        feed(b"X", json.dumps(part, sort_keys=True, default=_stable_json).encode("utf-8"))
+    return h.hexdigest()
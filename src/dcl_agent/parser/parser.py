@@ -1,5 +1,8 @@
+import threading
 from lark import Lark, Transformer
 from pathlib import Path
+from typing import Optional
+from ..cache import LRUCache
 from ..model import Instruction, ResourceRef, Entity
 
 class DCLTransformer(Transformer):
@@ -79,16 +82,53 @@ class DCLTransformer(Transformer):
     def resource_id(self, items):
         return str(items[0]).strip("'\"")
 
+GRAMMAR_PATH = Path(__file__).parent.parent / "dcl.lark"
+
+_lark_lock = threading.Lock()
+_lark_instance: Optional[Lark] = None
+
+def get_lark() -> Lark:
+    """
+    Returns the process-wide LALR parser for the DCL grammar.
+    The grammar is analyzed once per process; Lark's `cache` option also
+    pickles the analysis to the temp dir, so later processes skip it too.
+    The transformer runs inline during parsing (no intermediate tree).
+    """
+    global _lark_instance
+    if _lark_instance is None:
+        with _lark_lock:
+            if _lark_instance is None:
+                grammar = GRAMMAR_PATH.read_text()
+                _lark_instance = Lark(
+                    grammar,
+                    start='instruction',
+                    parser='lalr',
+                    transformer=DCLTransformer(),
+                    cache=True
+                )
+    return _lark_instance
+
 class DCLParser:
-    def __init__(self):
-        grammar_path = Path(__file__).parent.parent / "dcl.lark"
-        with open(grammar_path, 'r') as f:
-            grammar = f.read()
-        self.parser = Lark(grammar, start='instruction', parser='lalr')
-        self.transformer = DCLTransformer()
+    def __init__(self, cache_size: int = 0):
+        """
+        Args:
+            cache_size: Number of parsed instructions kept in an LRU cache keyed
+                by instruction text (0 disables it). Cached Instruction objects
+                are shared between callers and must be treated as read-only.
+        """
+        self.parser = get_lark()
+        self.transformer = self.parser.options.transformer
+        self.cache = LRUCache(max_weight=cache_size) if cache_size > 0 else None
 
     def parse(self, text: str) -> Instruction:
-        tree = self.parser.parse(text)
-        instruction = self.transformer.transform(tree)
+        if self.cache is not None:
+            instruction = self.cache.get(text)
+            if instruction is not None:
+                return instruction
+
+        instruction = self.parser.parse(text)
         instruction.original_dcl_instruction = text
+
+        if self.cache is not None:
+            self.cache.put(text, instruction)
         return instruction
@@ -0,0 +1,115 @@
+import functools
+import importlib
+import threading
+from typing import Any, Callable, Dict, List, Union
+from .exceptions import DCLConfigurationError
+
+# Entry point groups scanned for third-party adapters and strategies, e.g.
+#   [project.entry-points."dcl_agent.adapters"]
+#   openai = "my_package.adapters:OpenAIAdapter"
+ADAPTER_GROUP = "dcl_agent.adapters"
+STRATEGY_GROUP = "dcl_agent.strategies"
+
+Factory = Callable[..., Any]
+
+class PluginRegistry:
+    """
+    Named factories of one plugin kind (adapters or strategies).
+    Factories can be given as "module:attribute" strings (the attribute may
+    be dotted, "module:Outer.attr"); the module is only imported when the
+    name is first used, so listing or registering plugins never pulls in
+    their dependencies (e.g. google-genai). Entry points are kept as
+    EntryPoint objects and loaded the same way, on first use.
+
+    Lookup order: explicitly registered names, built-ins, then the
+    installed entry points of `group` (scanned once, on the first miss).
+    """
+    def __init__(self, kind: str, group: str, builtins: Dict[str, str]):
+        """
+        Args:
+            kind: Plugin kind used in error messages ("adapter", "strategy").
+            group: Entry point group scanned for third-party plugins.
+            builtins: Name -> "module:attribute" of the bundled plugins.
+        """
+        self.kind = kind
+        self.group = group
+        # Name -> factory, "module:attribute" string or (unloaded) EntryPoint.
+        self._factories: Dict[str, Any] = dict(builtins)
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Union[str, Factory]) -> None:
+        """Registers (or replaces) a factory: a callable or a "module:attribute" string."""
+        with self._lock:
+            self._factories[name] = factory
+
+    def names(self) -> List[str]:
+        self._load_entry_points()
+        return sorted(self._factories)
+
+    def get(self, name: str) -> Factory:
+        """Returns the factory registered under name, importing it if needed."""
+        factory = self._factories.get(name)
+        if factory is None:
+            self._load_entry_points()
+            factory = self._factories.get(name)
+        if factory is None:
+            raise DCLConfigurationError(
+                f"Unknown {self.kind} '{name}' (available: {', '.join(self.names())})"
+            )
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(":")
+            factory = functools.reduce(getattr, attribute.split("."), importlib.import_module(module_name))
+            with self._lock:
+                self._factories[name] = factory
+        elif not callable(factory):
+            # An entry point (importlib.metadata is not imported up front):
+            # EntryPoint.load() handles dotted attributes and extras.
+            factory = factory.load()
+            with self._lock:
+                self._factories[name] = factory
+        return factory
+
+    def create(self, name: str, **kwargs) -> Any:
+        return self.get(name)(**kwargs)
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        # importlib.metadata is comparatively slow to import: only on a miss.
+        from importlib.metadata import entry_points
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            for entry_point in entry_points(group=self.group):
+                # First-Wins: registered and built-in names are not overridden.
+                if entry_point.name in self._factories:
+                    print(f"Warning: Ignoring {self.kind} entry point '{entry_point.name}' ({entry_point.value}): name already registered.")
+                    continue
+                self._factories[entry_point.name] = entry_point
+            self._entry_points_loaded = True
+
+adapters = PluginRegistry("adapter", ADAPTER_GROUP, {
+    "gemini": "dcl_agent.adapter.gemini:GeminiAdapter",
+    "mock": "dcl_agent.adapter.mock:MockLLMAdapter",
+})
+
+strategies = PluginRegistry("strategy", STRATEGY_GROUP, {
+    "gemini": "dcl_agent.strategies.gemini:GeminiNativeStrategy",
+    "concat": "dcl_agent.strategies.concat:ConcatenationStrategy",
+    "budget": "dcl_agent.strategies.budget:TokenBudgetStrategy",
+})
+
+def register_adapter(name: str, factory: Union[str, Factory]) -> None:
+    adapters.register(name, factory)
+
+def register_strategy(name: str, factory: Union[str, Factory]) -> None:
+    strategies.register(name, factory)
+
+def create_adapter(name: str, **kwargs) -> Any:
+    """Builds the adapter registered under name (e.g. "gemini", "mock")."""
+    return adapters.create(name, **kwargs)
+
+def create_strategy(name: str, **kwargs) -> Any:
+    """Builds the strategy registered under name (e.g. "gemini", "concat", "budget")."""
+    return strategies.create(name, **kwargs)
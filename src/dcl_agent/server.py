@@ -0,0 +1,294 @@
+"""
+Long-running DCL agent server.
+Keeps one DCLAgent (registry, parser, adapter, caches) warm and serves
+instructions over local HTTP or a Unix domain socket.
+
+Usage:
+    python -m dcl_agent.server dcl-core dcl-god-mode --socket /tmp/dcl.sock
+    python -m dcl_agent.server dcl-core dcl-god-mode --port 8765 --adapter mock
+
+Endpoints (JSON bodies):
+    POST /execute       {"instruction": str, "stream": bool}  -> {"response": str}
+    POST /execute_many  {"instructions": [str], "max_concurrency": int}
+    POST /reload        -> {"added": [...], "changed": [...], "removed": [...], "aliases": [...]}
+    GET  /health        -> {"status": "ok", "generation": int, "modules": int}
+
+Errors are {"error": str}: 400 for invalid requests, 409 for configuration
+errors (e.g. a reload of a bundle with an invalid alias), 500 otherwise.
+
+SIGHUP reloads the bundles; SIGTERM/SIGINT stop accepting requests and wait
+for in-flight ones to finish.
+"""
+import argparse
+import dataclasses
+import errno
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from lark.exceptions import LarkError
+from .agent import DCLAgent
+from .exceptions import DCLConfigurationError
+
+class DCLRequestHandler(BaseHTTPRequestHandler):
+    """Maps the JSON endpoints onto the server's DCLAgent."""
+    protocol_version = "HTTP/1.1" # Keep-alive: clients reuse one connection
+    # Socket timeout: connections idle (or stalled) this long are closed.
+    timeout = 120
+
+    def handle_one_request(self):
+        # Between requests a keep-alive connection is idle: let server_close() cut it.
+        if not self.server._track_idle(self.connection):
+            self.close_connection = True
+            return
+        super().handle_one_request()
+
+    def parse_request(self) -> bool:
+        self.server._track_busy(self.connection)
+        return super().parse_request()
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+        registry = self.server.agent.registry
+        self._send_json(200, {
+            "status": "ok",
+            "generation": registry.generation,
+            "modules": len(registry.list_modules()),
+        })
+
+    def do_POST(self):
+        handler = {
+            "/execute": self._execute,
+            "/execute_many": self._execute_many,
+            "/reload": self._reload,
+        }.get(self.path)
+        if handler is None:
+            return self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            return self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+        try:
+            handler(body)
+        except (LarkError, KeyError, TypeError, ValueError) as e:
+            self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+        except DCLConfigurationError as e:
+            # E.g. /reload of a bundle with an invalid alias: the request is
+            # fine, the bundles on disk conflict with it.
+            self._send_json(409, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _execute(self, body: dict):
+        agent = self.server.agent
+        instruction = body["instruction"]
+        if not body.get("stream"):
+            return self._send_json(200, {"response": agent.execute(instruction)})
+
+        # Errors before the first chunk still get a proper status code.
+        stream = agent.execute_stream(instruction)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in stream:
+                data = chunk.encode("utf-8")
+                if data:
+                    self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+        except Exception as e:
+            # The status line is already out: abort the body without its final
+            # chunk, so clients see a truncated response rather than a short one.
+            self.close_connection = True
+            self.log_error("Stream aborted: %s: %s", type(e).__name__, e)
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _execute_many(self, body: dict):
+        result = self.server.agent.execute_many(
+            body["instructions"], max_concurrency=int(body.get("max_concurrency", 8))
+        )
+        self._send_json(200, {
+            "responses": result.responses,
+            "errors": {
+                str(item.index): f"{type(item.error).__name__}: {item.error}" for item in result.errors
+            },
+            "stats": dataclasses.asdict(result.stats),
+        })
+
+    def _reload(self, body: dict):
+        self._send_json(200, dataclasses.asdict(self.server.agent.reload()))
+
+    def _send_json(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class _AgentServerMixin:
+    agent: DCLAgent
+    verbose = False
+    daemon_threads = False
+    block_on_close = True # server_close() waits for in-flight requests
+
+    def __init__(self, *args, **kwargs):
+        self._idle = set()
+        self._closing = False
+        self._connections_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _track_idle(self, connection) -> bool:
+        """Marks a connection as waiting for its next request; False once closing."""
+        with self._connections_lock:
+            if self._closing:
+                return False
+            self._idle.add(connection)
+            return True
+
+    def _track_busy(self, connection) -> None:
+        with self._connections_lock:
+            self._idle.discard(connection)
+
+    def shutdown_request(self, request):
+        self._track_busy(request)
+        super().shutdown_request(request)
+
+    def server_close(self):
+        # Idle keep-alive connections would otherwise hold the join below
+        # until their clients hang up; busy ones finish their request first.
+        with self._connections_lock:
+            self._closing = True
+            for connection in self._idle:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        super().server_close()
+
+class DCLHTTPServer(_AgentServerMixin, ThreadingHTTPServer):
+    """Threaded local HTTP server, one thread per connection."""
+
+class DCLUnixServer(_AgentServerMixin, socketserver.ThreadingUnixStreamServer):
+    """Threaded HTTP server on a Unix domain socket."""
+
+    def server_bind(self):
+        # Replace a socket file left over by a previous run, but never a live one.
+        if os.path.exists(self.server_address):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.server_address)
+            except OSError:
+                os.unlink(self.server_address) # Nobody listening: stale
+            else:
+                raise OSError(errno.EADDRINUSE, f"Socket {self.server_address} is in use by a running server")
+            finally:
+                probe.close()
+        super().server_bind()
+        self._bound = True
+        # BaseHTTPRequestHandler expects a (host, port) pair.
+        self.server_name, self.server_port = "localhost", 0
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+    def server_close(self):
+        super().server_close()
+        if not getattr(self, "_bound", False):
+            return # bind failed: the socket file belongs to someone else
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+def create_server(
+    agent: DCLAgent,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    verbose: bool = False
+):
+    """
+    Builds (and binds) a server around a ready DCLAgent; call serve_forever().
+
+    Args:
+        agent: Agent whose registry, parser, adapter and caches stay resident.
+        host: Interface to listen on (HTTP mode). Keep it local: there is no auth.
+        port: TCP port (HTTP mode); 0 picks a free one.
+        socket_path: Serve on this Unix domain socket instead of TCP.
+        verbose: Log every request to stderr.
+    """
+    if socket_path:
+        server = DCLUnixServer(socket_path, DCLRequestHandler)
+    else:
+        server = DCLHTTPServer((host, port), DCLRequestHandler)
+    server.agent = agent
+    server.verbose = verbose
+    return server
+
+def serve_in_thread(server) -> threading.Thread:
+    """Runs serve_forever() in a background thread (tests, embedding)."""
+    thread = threading.Thread(target=server.serve_forever, name="dcl-server", daemon=True)
+    thread.start()
+    return thread
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve DCL instructions from a warm agent.")
+    parser.add_argument("bundles", nargs="+", help="bundle root directories")
+    parser.add_argument("--socket", help="Unix domain socket path (default: local HTTP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--adapter", default="gemini", help="registered adapter name (see dcl_agent.plugins)")
+    parser.add_argument("--max-workers", type=int, help="parallel loader workers")
+    parser.add_argument("--snapshot", help="registry snapshot file")
+    parser.add_argument("--watch", action="store_true", help="hot-reload changed bundle files")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    agent = DCLAgent(
+        bundles=args.bundles,
+        adapter=args.adapter,
+        max_workers=args.max_workers,
+        snapshot_path=args.snapshot,
+        watch=args.watch
+    )
+    server = create_server(agent, args.host, args.port, args.socket, args.verbose)
+
+    def reload(signum, frame):
+        try:
+            print(f"Reloaded: {agent.reload()}")
+        except Exception as e:
+            print(f"Error reloading bundles: {e}")
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever() returns: call it off the main thread.
+        threading.Thread(target=server.shutdown).start()
+
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, reload)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"DCL agent serving {len(agent.registry.list_modules())} modules on {address}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        agent.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from ..model import Instruction, InvocationContext, TextFrame, PromptModule
+from typing import List
+from ..model import Instruction, InvocationContext, TextFrame, BlobFrame, PromptModule, ContextFrame, digest_frames
 from ..loader.registry import PromptModuleRegistry
 
 class IContextAssemblyStrategy(ABC):
@@ -14,6 +15,28 @@ class IContextAssemblyStrategy(ABC):
         """
         pass
 
+    @staticmethod
+    def _prefixed_context(prefix: List[ContextFrame], request: List[ContextFrame]) -> InvocationContext:
+        """
+        Builds a context whose request-independent frames come first, so
+        requests sharing operator, modifiers and goals share a prompt prefix.
+        """
+        return InvocationContext(
+            frames=prefix + request,
+            prefix_frames=len(prefix),
+            prefix_fingerprint=digest_frames(prefix)
+        )
+
+    @classmethod
+    def _module_frame(cls, module: PromptModule) -> ContextFrame:
+        """
+        Frame for a referenced module: a BlobFrame sharing the module's
+        read-only buffer for blobs, markdown-formatted text otherwise.
+        """
+        if module.is_blob:
+            return BlobFrame(mime_type=module.mime_type, data=module.data)
+        return TextFrame(content=cls._format_resource_as_markdown(module))
+
     @staticmethod
     def _format_resource_as_markdown(module: PromptModule) -> str:
         """
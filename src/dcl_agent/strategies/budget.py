@@ -0,0 +1,117 @@
+from typing import List, Optional, Tuple
+from .base import IContextAssemblyStrategy, zero_context_frame
+from .gemini import GeminiNativeStrategy
+from ..model import Instruction, InvocationContext, TextFrame, ContextFrame, PromptModule, ResourceRef
+from ..loader.registry import PromptModuleRegistry
+from ..tokens import estimate_tokens, module_tokens, truncate_to_tokens
+
+# Module roles in the order they are given budget.
+PRIORITY = ("operator", "modifier", "goal", "source")
+
+# Default budget: the input window of the Gemini 2.x models.
+DEFAULT_MAX_TOKENS = 1_048_576
+
+class TokenBudgetStrategy(IContextAssemblyStrategy):
+    """
+    Budget-Aware Strategy.
+    Produces the same frames as GeminiNativeStrategy, but fits them into a
+    token budget. The instruction text, zero frame and operand are always
+    sent; the remaining budget goes to modules by priority: operator, then
+    modifiers, then goals, then sources (each group in instruction order).
+    A module that does not fit is truncated to the remaining budget, or
+    dropped if less than `min_truncated_tokens` would be left of it.
+    Blob modules are never truncated; their size estimate counts in full.
+
+    Decisions are reported in context.metadata["token_budget"].
+    """
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        prefix_stable: bool = False,
+        truncate: bool = True,
+        min_truncated_tokens: int = 64
+    ):
+        """
+        Args:
+            max_tokens: Token budget of the whole context (estimated, see
+                dcl_agent.tokens). Defaults to the Gemini input window, so
+                the strategy can be selected by name (strategy="budget").
+            prefix_stable: Frame ordering of GeminiNativeStrategy(prefix_stable=True).
+            truncate: Truncate modules that do not fit instead of dropping them.
+            min_truncated_tokens: Smallest useful truncated module; below this
+                the module is dropped.
+        """
+        self.max_tokens = max_tokens
+        self.prefix_stable = prefix_stable
+        self.truncate = truncate
+        self.min_truncated_tokens = min_truncated_tokens
+
+    def assemble(self, instruction: Instruction, registry: PromptModuleRegistry) -> InvocationContext:
+        operand = GeminiNativeStrategy._format_operand(instruction)
+        used = sum(estimate_tokens(text) for text in (
+            instruction.original_dcl_instruction, zero_context_frame.content, operand
+        ))
+
+        # (role, ref, module) in priority order
+        candidates: List[Tuple[str, ResourceRef, Optional[PromptModule]]] = []
+        for role, refs in zip(PRIORITY, ([ResourceRef(id=instruction.action)], instruction.modifiers, instruction.goals, instruction.sources)):
+            candidates.extend((role, ref, registry.get(ref.id)) for ref in refs)
+
+        fitted = {} # candidate index -> frame text (or blob module)
+        truncated, dropped = [], []
+        for i, (role, ref, module) in enumerate(candidates):
+            if module is None:
+                continue
+            text = module if module.is_blob else self._format(role, module)
+            tokens = module_tokens(module) + self._overhead(role, module)
+            remaining = self.max_tokens - used
+            if tokens <= remaining:
+                fitted[i] = text
+                used += tokens
+            elif self.truncate and not module.is_blob and remaining >= self.min_truncated_tokens:
+                fitted[i] = truncate_to_tokens(text, remaining)
+                used += remaining
+                truncated.append({"id": module.id, "role": role, "tokens": tokens, "kept": remaining})
+            else:
+                dropped.append({"id": module.id, "role": role, "tokens": tokens})
+
+        def frames_for(*roles: str) -> List[ContextFrame]:
+            return [
+                self._module_frame(fitted[i]) if isinstance(fitted[i], PromptModule) else TextFrame(content=fitted[i])
+                for i, (role, _, _) in enumerate(candidates)
+                if role in roles and i in fitted
+            ]
+
+        if self.prefix_stable:
+            context = self._prefixed_context(
+                [zero_context_frame] + frames_for("operator", "modifier", "goal"),
+                [TextFrame(content=instruction.original_dcl_instruction), TextFrame(content=operand)] + frames_for("source")
+            )
+        else:
+            context = InvocationContext(frames=(
+                [TextFrame(content=instruction.original_dcl_instruction), zero_context_frame]
+                + frames_for("operator")
+                + [TextFrame(content=operand)]
+                + frames_for("modifier") + frames_for("goal") + frames_for("source")
+            ))
+
+        context.metadata["token_budget"] = {
+            "max_tokens": self.max_tokens,
+            "used_tokens": used,
+            "truncated": truncated,
+            "dropped": dropped,
+        }
+        return context
+
+    def _format(self, role: str, module: PromptModule) -> str:
+        # The operator is sent verbatim, like in GeminiNativeStrategy.
+        if role == "operator":
+            return module.content
+        return self._format_resource_as_markdown(module)
+
+    @staticmethod
+    def _overhead(role: str, module: PromptModule) -> int:
+        """Tokens added by the markdown fence around RESOURCE modules."""
+        if role != "operator" and module.type == 'RESOURCE':
+            return estimate_tokens(f"```{module.id}\n\n```")
+        return 0
@@ -7,7 +7,21 @@ class ConcatenationStrategy(IContextAssemblyStrategy):
     Simple strategy: concatenates all content into a single TextFrame.
     Useful for dumb LLMs or debugging.
     """
+    prefix_stable = False
+
+    def __init__(self, prefix_stable: bool = False):
+        """
+        Args:
+            prefix_stable: Cache-friendly ordering. Produces two TextFrames:
+                zero frame, operator, modifiers and goals first (the stable
+                prefix), then the instruction text, sources and target.
+        """
+        self.prefix_stable = prefix_stable
+
     def assemble(self, instruction: Instruction, registry: PromptModuleRegistry) -> InvocationContext:
+        if self.prefix_stable:
+            return self._assemble_prefix_stable(instruction, registry)
+
         parts = []
 
         parts.append(instruction.original_dcl_instruction)
@@ -41,13 +55,7 @@ class ConcatenationStrategy(IContextAssemblyStrategy):
                  parts.append(f"<!-- Missing Source: {src_ref.id} -->")
 
         # Target (The "Object" of the operation)
-        # Operand is an Entity(type, value). We treat it as text target.
-        if instruction.operand.type == "ANY":
-            target_str = instruction.operand.value
-        else:
-            target_str = f"{instruction.operand.type}('{instruction.operand.value}')"
-            
-        parts.append(f"Target: {target_str}")
+        parts.append(self._format_target(instruction))
         
         # Goals
         for goal_ref in instruction.goals:
@@ -58,6 +66,48 @@ class ConcatenationStrategy(IContextAssemblyStrategy):
         full_text = "\n\n".join(parts)
         return InvocationContext(frames=[TextFrame(content=full_text)])
 
+    def _assemble_prefix_stable(self, instruction: Instruction, registry: PromptModuleRegistry) -> InvocationContext:
+        prefix = [zero_context_frame.content]
+        op_module = registry.get(instruction.action)
+        if op_module:
+            prefix.append(self._format_module(op_module))
+        else:
+            prefix.append(f"<!-- Missing Operator: {instruction.action} -->")
+        for mod_ref in instruction.modifiers:
+            mod_module = registry.get(mod_ref.id)
+            if mod_module:
+                prefix.append(self._format_module(mod_module))
+            else:
+                prefix.append(f"<!-- Missing Modifier: {mod_ref.id} -->")
+        for goal_ref in instruction.goals:
+            goal_module = registry.get(goal_ref.id)
+            if goal_module:
+                prefix.append(f"Goal: {goal_module.content}")
+
+        request = [instruction.original_dcl_instruction]
+        for src_ref in instruction.sources:
+            src_module = registry.get(src_ref.id)
+            if src_module:
+                request.append(self._format_module(src_module))
+            else:
+                request.append(f"<!-- Missing Source: {src_ref.id} -->")
+        request.append(self._format_target(instruction))
+
+        return self._prefixed_context(
+            [TextFrame(content="\n\n".join(prefix))],
+            [TextFrame(content="\n\n".join(request))]
+        )
+
+    @staticmethod
+    def _format_target(instruction: Instruction) -> str:
+        # Operand is an Entity(type, value). We treat it as text target.
+        if instruction.operand.type == "ANY":
+            return f"Target: {instruction.operand.value}"
+        return f"Target: {instruction.operand.type}('{instruction.operand.value}')"
+
     def _format_module(self, module: PromptModule) -> str:
+        if module.is_blob:
+            # A single text frame cannot carry binary data.
+            return f"<!-- Binary {module.type}: {module.id} ({module.mime_type}, {len(module.data)} bytes) -->"
         content = self._format_resource_as_markdown(module)
         return f"--- {module.type}: {module.id} ---\n{content}"
@@ -13,7 +13,21 @@ class GeminiNativeStrategy(IContextAssemblyStrategy):
     The Adapter will likely treat the first few (Operator/Modifiers) as System Instruction 
     and the rest (Target/Sources) as User Message.
     """
+    prefix_stable = False
+
+    def __init__(self, prefix_stable: bool = False):
+        """
+        Args:
+            prefix_stable: Cache-friendly ordering. Zero frame, operator,
+                modifiers and goals come first (InvocationContext.prefix_frames),
+                followed by the instruction text, operand and sources.
+        """
+        self.prefix_stable = prefix_stable
+
     def assemble(self, instruction: Instruction, registry: PromptModuleRegistry) -> InvocationContext:
+        if self.prefix_stable:
+            return self._assemble_prefix_stable(instruction, registry)
+
         frames: list[ContextFrame] = []
 
         frames.append(TextFrame(content=instruction.original_dcl_instruction))
@@ -26,37 +40,59 @@ class GeminiNativeStrategy(IContextAssemblyStrategy):
             frames.append(TextFrame(content=op_module.content))
 
         # 2. Operand (Entity) - Treated as Textual Description of Target
-        if instruction.operand.type == 'ANY':
-            # Simple string/id
-            frames.append(TextFrame(content=instruction.operand.value))
-        else:
-            # Typed Entity: Preserves the constructor syntax for the LLM
-            # e.g. "PromptModule('sys/ops/write')"
-            frames.append(TextFrame(content=f"{instruction.operand.type}('{instruction.operand.value}')"))
+        frames.append(TextFrame(content=self._format_operand(instruction)))
 
 
         # 3. Then Modifiers (Lenses) often define the Role/Constraint.
         for mod_ref in instruction.modifiers:
             mod_module = registry.get(mod_ref.id)
             if mod_module:
-                content = self._format_resource_as_markdown(mod_module)
-                frames.append(TextFrame(content=content))
+                frames.append(self._module_frame(mod_module))
         
             
         # 4. Goals (Soft Constraints)
         for goal_ref in instruction.goals:
             goal_module = registry.get(goal_ref.id)
             if goal_module:
-                content = self._format_resource_as_markdown(goal_module)
-                frames.append(TextFrame(content=content))
+                frames.append(self._module_frame(goal_module))
         
         # 5. Sources (Context Data)
         for src_ref in instruction.sources:
             src_module = registry.get(src_ref.id)
             if src_module:
-                # Todo: Handle Blob Sources if type is Blob
-                content = self._format_resource_as_markdown(src_module)
-                frames.append(TextFrame(content=content))
+                # Blob sources are passed as BlobFrames sharing the registry's bytes.
+                frames.append(self._module_frame(src_module))
 
         
         return InvocationContext(frames=frames)
+
+    def _assemble_prefix_stable(self, instruction: Instruction, registry: PromptModuleRegistry) -> InvocationContext:
+        prefix: list[ContextFrame] = [zero_context_frame]
+
+        op_module = registry.get(instruction.action)
+        if op_module:
+            prefix.append(TextFrame(content=op_module.content))
+        for ref in instruction.modifiers + instruction.goals:
+            module = registry.get(ref.id)
+            if module:
+                prefix.append(self._module_frame(module))
+
+        request: list[ContextFrame] = [
+            TextFrame(content=instruction.original_dcl_instruction),
+            TextFrame(content=self._format_operand(instruction))
+        ]
+        for src_ref in instruction.sources:
+            src_module = registry.get(src_ref.id)
+            if src_module:
+                request.append(self._module_frame(src_module))
+
+        return self._prefixed_context(prefix, request)
+
+    @staticmethod
+    def _format_operand(instruction: Instruction) -> str:
+        if instruction.operand.type == 'ANY':
+            # Simple string/id
+            return instruction.operand.value
+        # Typed Entity: Preserves the constructor syntax for the LLM
+        # e.g. "PromptModule('sys/ops/write')"
+        return f"{instruction.operand.type}('{instruction.operand.value}')"
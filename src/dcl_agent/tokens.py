@@ -0,0 +1,32 @@
+import math
+from typing import Optional
+from .model import PromptModule
+
+# Rough average for current LLM tokenizers. Counting UTF-8 bytes rather than
+# characters keeps the estimate sane for non-Latin text (e.g. Cyrillic uses
+# two bytes, and roughly twice the tokens, per character).
+BYTES_PER_TOKEN = 4
+
+def estimate_tokens_from_size(size: int) -> int:
+    """Estimated token count of `size` bytes of UTF-8 text."""
+    return math.ceil(max(size, 0) / BYTES_PER_TOKEN)
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Estimated token count of a text (0 for None)."""
+    if not text:
+        return 0
+    return estimate_tokens_from_size(len(text.encode("utf-8")))
+
+def module_tokens(module: PromptModule) -> int:
+    """Token count of a module, using the count precomputed at load time if any."""
+    if module.token_count is not None:
+        return module.token_count
+    return estimate_tokens(module.content)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts a text down to roughly `max_tokens` tokens (on a character boundary)."""
+    data = text.encode("utf-8")
+    limit = max(max_tokens, 0) * BYTES_PER_TOKEN
+    if len(data) <= limit:
+        return text
+    return data[:limit].decode("utf-8", errors="ignore")
@@ -0,0 +1,29 @@
+import pytest
+import yaml
+
+def _create_bundle(path, name, index_content, modules):
+    """Helper to create a bundle structure: modules are YAML dicts or raw text."""
+    bundle_root = path / name
+    bundle_root.mkdir()
+
+    if index_content:
+        (bundle_root / "index.yaml").write_text(yaml.dump(index_content), encoding="utf-8")
+
+    for mod_path, content in modules.items():
+        p = bundle_root / mod_path
+        p.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, dict):
+            content = yaml.dump(content)
+        p.write_text(content, encoding="utf-8")
+
+    return str(bundle_root)
+
+@pytest.fixture
+def create_bundle():
+    return _create_bundle
+
+@pytest.fixture
+def bundle(tmp_path):
+    """A bundle with a single operator, write/1.0."""
+    (tmp_path / "op.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.", encoding="utf-8")
+    return str(tmp_path)
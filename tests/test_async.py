@@ -0,0 +1,68 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from dcl_agent.adapter.base import ILLMAdapter
+from dcl_agent.adapter.caching import CachingLLMAdapter
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.model import InvocationContext, TextFrame
+
+class SyncOnlyAdapter(ILLMAdapter):
+    def invoke(self, context):
+        return "sync"
+
+def test_default_ainvoke_runs_sync_invoke():
+    context = InvocationContext(frames=[TextFrame(content="x")])
+    assert asyncio.run(SyncOnlyAdapter().ainvoke(context)) == "sync"
+
+def test_mock_ainvoke():
+    adapter = MockLLMAdapter()
+    context = InvocationContext(frames=[TextFrame(content="x")])
+    assert asyncio.run(adapter.ainvoke(context)) == "Mock Response. Received 1 frames."
+    assert adapter.last_context is context
+
+def test_aexecute_runs_concurrently(bundle):
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(fixed_response="ok", delay=0.2))
+
+    async def run_all():
+        return await asyncio.gather(*(agent.aexecute(f"write/1.0 'Topic {i}'") for i in range(50)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert results == ["ok"] * 50
+    assert elapsed < 2 # 50 sequential calls would take 10s
+
+def test_sync_execute_still_works(bundle):
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(fixed_response="ok"))
+    assert agent.execute("write/1.0 'Topic'") == "ok"
+
+def test_caching_adapter_ainvoke():
+    inner = MockLLMAdapter(fixed_response="cached")
+    adapter = CachingLLMAdapter(inner)
+    context = InvocationContext(frames=[TextFrame(content="x")])
+
+    assert asyncio.run(adapter.ainvoke(context)) == "cached"
+    inner.fixed_response = "fresh"
+    assert asyncio.run(adapter.ainvoke(context)) == "cached"
+    assert adapter.hits == 1
+
+def test_gemini_ainvoke_uses_async_client():
+    pytest.importorskip("google.genai")
+    from dcl_agent.adapter.gemini import GeminiAdapter
+
+    calls = []
+
+    async def generate_content(model, contents, config):
+        calls.append((model, contents))
+        return SimpleNamespace(text="async answer")
+
+    client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+    adapter = GeminiAdapter(api_key="test", model_name="gemini-test", client=client)
+    context = InvocationContext(frames=[TextFrame(content="hello")])
+
+    assert asyncio.run(adapter.ainvoke(context)) == "async answer"
+    assert calls[0][0] == "gemini-test"
+    assert calls[0][1][0].parts[0].text == "hello"
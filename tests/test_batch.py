@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.batch import BatchItem, BatchStats
+from dcl_agent.exceptions import DCLAdapterError
+
+class EchoAdapter(MockLLMAdapter):
+    """Returns the operand frame, fails on 'boom' and tracks concurrency."""
+    def __init__(self, delay=0.05):
+        super().__init__(delay=delay)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, context):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            operand = context.frames[3].content
+            if operand == "boom":
+                raise RuntimeError("adapter failure")
+            return operand
+        finally:
+            with self._lock:
+                self.active -= 1
+
+def test_execute_many_preserves_order_and_caps_concurrency(bundle):
+    adapter = EchoAdapter()
+    agent = DCLAgent(bundles=bundle, adapter=adapter)
+    instructions = [f"write/1.0 'item {i}'" for i in range(20)]
+
+    result = agent.execute_many(instructions, max_concurrency=4)
+
+    assert result.responses == [f"item {i}" for i in range(20)]
+    assert adapter.peak == 4
+    assert result.stats.total == 20 and result.stats.failed == 0
+    assert result.stats.throughput > 0
+    assert 0 < result.stats.latency_p50 <= result.stats.latency_max
+
+def test_execute_many_captures_errors(bundle):
+    agent = DCLAgent(bundles=bundle, adapter=EchoAdapter(delay=0))
+
+    result = agent.execute_many(["write/1.0 'a'", "NOT VALID DCL !!", "write/1.0 'boom'", "write/1.0 'b'"])
+
+    assert result.responses == ["a", None, None, "b"]
+    assert [item.index for item in result.errors] == [1, 2]
+    assert isinstance(result.items[2].error, RuntimeError)
+    assert (result.stats.succeeded, result.stats.failed) == (2, 2)
+
+def test_error_responses_are_item_errors(bundle):
+    # Adapters such as GeminiAdapter report failures as response text.
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(fixed_response="Gemini Error: quota exceeded"))
+
+    for result in (agent.execute_many(["write/1.0 'a'"]), asyncio.run(agent.aexecute_many(["write/1.0 'a'"]))):
+        assert result.responses == [None]
+        assert isinstance(result.items[0].error, DCLAdapterError)
+        assert str(result.items[0].error) == "Gemini Error: quota exceeded"
+        assert (result.stats.succeeded, result.stats.failed) == (0, 1)
+
+def test_aexecute_many(bundle):
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(fixed_response="ok", delay=0.1))
+
+    result = asyncio.run(agent.aexecute_many([f"write/1.0 '{i}'" for i in range(20)], max_concurrency=10))
+
+    assert result.responses == ["ok"] * 20
+    assert result.stats.elapsed < 1 # two waves of 0.1s
+
+def test_batch_stats_percentiles():
+    items = [BatchItem(index=i, instruction="", latency=float(i + 1)) for i in range(100)]
+    stats = BatchStats.from_items(items, elapsed=10.0)
+    assert (stats.latency_p50, stats.latency_p95, stats.latency_p99, stats.latency_max) == (50, 95, 99, 100)
+    assert stats.throughput == 10
+    assert "100/100 succeeded" in stats.summary()
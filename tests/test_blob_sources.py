@@ -0,0 +1,134 @@
+import os
+import pickle
+import pytest
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.loader import loader as loader_module
+from dcl_agent.loader.loader import Loader, is_binary_file
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import BlobFrame
+from dcl_agent.strategies.base import zero_context_frame
+from dcl_agent.strategies.budget import TokenBudgetStrategy
+from dcl_agent.strategies.concat import ConcatenationStrategy
+from dcl_agent.tokens import estimate_tokens
+
+PNG = b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR" + bytes(range(256)) * 4
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "bundle"
+    root.mkdir()
+    (root / "op.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.", encoding="utf-8")
+    (root / "diagram.png").write_bytes(PNG)
+    (root / "notes.txt").write_text("Заметки " * 2000, encoding="utf-8")
+    return root
+
+def test_is_binary_file(bundle):
+    assert is_binary_file(bundle / "diagram.png")
+    assert not is_binary_file(bundle / "notes.txt") # multi-byte text cut at the sniff boundary
+    assert not is_binary_file(bundle / "op.yaml")
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_loader_registers_blob_modules(bundle, lazy):
+    registry = PromptModuleRegistry()
+    Loader(registry, lazy=lazy).load_bundles([str(bundle)])
+
+    stored = registry._modules["bundle/diagram.png"]
+    assert stored.is_blob and stored.mime_type == "image/png"
+    assert stored.content is None and stored.data is None
+    pickle.dumps(stored) # snapshots and process pools stay possible
+
+    module = registry.get("bundle/diagram.png")
+    assert bytes(module.data) == PNG
+    assert module.data.readonly
+    # Read once and shared by every get().
+    assert registry.get("bundle/diagram.png").data is module.data
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Records the files the loader opens."""
+    paths = []
+
+    def counting(file, *args, **kwargs):
+        paths.append(os.path.basename(file))
+        return open(file, *args, **kwargs)
+
+    monkeypatch.setattr(loader_module, "open", counting, raising=False)
+    return paths
+
+def test_eager_load_reads_each_raw_file_once(bundle, opened):
+    Loader(PromptModuleRegistry()).load_bundles([str(bundle)])
+    assert sorted(opened) == ["diagram.png", "notes.txt", "op.yaml"]
+
+def test_lazy_load_classifies_raw_files_without_reading(bundle, opened):
+    (bundle / "payload.dat").write_bytes(PNG) # Unknown suffix
+    registry = PromptModuleRegistry()
+    Loader(registry, lazy=True).load_bundles([str(bundle)])
+
+    assert opened == ["op.yaml"]
+    assert registry._modules["bundle/diagram.png"].is_blob
+    assert not registry._modules["bundle/payload.dat"].is_blob
+
+    # Sniffed when first requested, then read like any blob.
+    module = registry.get("bundle/payload.dat")
+    assert module.mime_type == "application/octet-stream"
+    assert bytes(module.data) == PNG
+    assert registry.get("bundle/payload.dat").data is module.data
+    assert registry.get("bundle/notes.txt").content == "Заметки " * 2000
+
+def test_gemini_strategy_emits_blob_frame(bundle):
+    adapter = MockLLMAdapter()
+    agent = DCLAgent(bundles=str(bundle), adapter=adapter)
+    agent.execute("write/1.0 'Describe' FROM 'bundle/diagram.png'")
+
+    frame = adapter.last_context.frames[-1]
+    assert isinstance(frame, BlobFrame)
+    assert frame.mime_type == "image/png"
+    assert frame.data is agent.registry.get("bundle/diagram.png").data
+
+def test_concat_strategy_describes_blob(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(), strategy=ConcatenationStrategy())
+    context = agent.build_context("write/1.0 'Describe' FROM 'bundle/diagram.png'")
+    assert f"<!-- Binary RESOURCE: bundle/diagram.png (image/png, {len(PNG)} bytes) -->" in context.frames[0].content
+
+def test_budget_strategy_drops_blob_instead_of_truncating(bundle):
+    budget = estimate_tokens(zero_context_frame.content) + 200 # PNG is ~260 tokens
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(), strategy=TokenBudgetStrategy(max_tokens=budget))
+    context = agent.build_context("write/1.0 'Describe' FROM 'bundle/diagram.png'")
+    assert not any(isinstance(frame, BlobFrame) for frame in context.frames)
+    assert context.metadata["token_budget"]["dropped"][0]["id"] == "bundle/diagram.png"
+
+def test_reload_remaps_changed_blob(bundle):
+    registry = PromptModuleRegistry()
+    loader = Loader(registry)
+    loader.load_bundles([str(bundle)])
+    assert bytes(registry.get("bundle/diagram.png").data) == PNG
+
+    (bundle / "diagram.png").write_bytes(PNG + b"\0more")
+    loader.reload()
+    assert bytes(registry.get("bundle/diagram.png").data) == PNG + b"\0more"
+
+def test_blob_rewritten_in_place(bundle):
+    registry = PromptModuleRegistry()
+    Loader(registry).load_bundles([str(bundle)])
+    data = registry.get("bundle/diagram.png").data
+
+    # A shorter file in place: views handed out must not fault (no file mapping).
+    (bundle / "diagram.png").write_bytes(b"short")
+    assert bytes(data[-10:]) == PNG[-10:]
+    assert bytes(registry.get("bundle/diagram.png").data) == b"short"
+
+def test_gemini_adapter_serializes_blob():
+    pytest.importorskip("google.genai")
+    from types import SimpleNamespace
+    from dcl_agent.adapter.gemini import GeminiAdapter
+    from dcl_agent.model import InvocationContext
+
+    requests = []
+    client = SimpleNamespace(models=SimpleNamespace(
+        generate_content=lambda model, contents, config: requests.append(contents) or SimpleNamespace(text="ok")
+    ))
+    adapter = GeminiAdapter(api_key="test", client=client)
+    adapter.invoke(InvocationContext(frames=[BlobFrame(mime_type="image/png", data=memoryview(PNG))]))
+
+    assert requests[0][0].parts[0].inline_data.data == PNG
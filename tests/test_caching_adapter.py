@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from dcl_agent.adapter.caching import CachingLLMAdapter
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.model import InvocationContext, TextFrame, BlobFrame, digest_frames
+from dcl_agent.tokens import estimate_tokens
+
+class CountingAdapter(MockLLMAdapter):
+    model_name = "mock-1"
+
+    def __init__(self, response="answer"):
+        super().__init__(fixed_response=response)
+        self.calls = 0
+
+    def invoke(self, context):
+        self.calls += 1
+        return super().invoke(context)
+
+def context(text="hello"):
+    return InvocationContext(frames=[TextFrame(content="op"), TextFrame(content=text)])
+
+def test_digest_is_stable_and_content_sensitive():
+    frames = [TextFrame(content="a"), BlobFrame(mime_type="image/png", data=b"\x00")]
+    assert digest_frames(frames, "m") == digest_frames(list(frames), "m")
+    assert digest_frames(frames, "m") != digest_frames(frames, "other-model")
+    # Frame boundaries are part of the key.
+    assert digest_frames([TextFrame(content="ab")]) != digest_frames([TextFrame(content="a"), TextFrame(content="b")])
+
+def test_repeated_context_hits_cache():
+    inner = CountingAdapter()
+    adapter = CachingLLMAdapter(inner)
+
+    assert adapter.invoke(context()) == "answer"
+    assert adapter.invoke(context()) == "answer"
+    assert adapter.invoke(context("other")) == "answer"
+
+    assert inner.calls == 2
+    assert (adapter.hits, adapter.misses) == (1, 2)
+
+def test_persistent_store(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    first = CachingLLMAdapter(CountingAdapter("stored"), path=path)
+    first.invoke(context())
+    first.close()
+
+    inner = CountingAdapter("fresh")
+    second = CachingLLMAdapter(inner, path=path)
+    assert second.invoke(context()) == "stored"
+    assert inner.calls == 0
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("dcl_agent.adapter.caching.time.time", lambda: now[0])
+    inner = CountingAdapter()
+    adapter = CachingLLMAdapter(inner, ttl=10)
+
+    adapter.invoke(context())
+    now[0] += 5
+    adapter.invoke(context())
+    now[0] += 10
+    adapter.invoke(context())
+
+    assert inner.calls == 2
+
+def test_size_cap_evicts_least_recently_used(monkeypatch):
+    now = [0.0]
+
+    def tick():
+        now[0] += 1
+        return now[0]
+
+    monkeypatch.setattr("dcl_agent.adapter.caching.time.time", tick)
+    inner = CountingAdapter()
+    adapter = CachingLLMAdapter(inner, max_entries=2)
+
+    adapter.invoke(context("a"))
+    adapter.invoke(context("b"))
+    adapter.invoke(context("a")) # "b" becomes least recently used
+    adapter.invoke(context("c"))
+
+    assert len(adapter) == 2
+    assert adapter.evictions == 1
+    adapter.invoke(context("a"))
+    assert inner.calls == 3
+    adapter.invoke(context("b"))
+    assert inner.calls == 4
+
+def test_bypass_skips_lookup_but_refreshes():
+    inner = CountingAdapter()
+    adapter = CachingLLMAdapter(inner, bypass=True)
+    adapter.invoke(context())
+    adapter.invoke(context())
+    assert inner.calls == 2
+
+    adapter.bypass = False
+    adapter.invoke(context())
+    assert inner.calls == 2
+
+def test_error_responses_are_not_cached():
+    inner = CountingAdapter("Gemini Error: quota exceeded")
+    adapter = CachingLLMAdapter(inner)
+    adapter.invoke(context())
+    adapter.invoke(context())
+    assert inner.calls == 2
+    assert len(adapter) == 0
+
+def test_function_tools_digest_equally_across_processes():
+    # Function tools are keyed by name, signature and docstring, not repr().
+    code = (
+        "from dcl_agent.model import TextFrame, digest_frames\n"
+        "from dcl_agent.tokens import estimate_tokens\n"
+        "print(digest_frames([TextFrame(content='a')], [estimate_tokens], 'm'))"
+    )
+    src = str(Path(__file__).resolve().parent.parent / "src")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=dict(os.environ, PYTHONPATH=src)).stdout
+    assert out.strip() == digest_frames([TextFrame(content="a")], [estimate_tokens], "m")
+
+def test_tools_without_stable_representation_bypass_the_cache():
+    inner = CountingAdapter()
+    adapter = CachingLLMAdapter(inner)
+    ctx = context()
+    ctx.tools = [lambda query: query]
+    assert adapter.invoke(ctx) == "answer"
+    assert adapter.invoke(ctx) == "answer"
+    assert inner.calls == 2
+    assert len(adapter) == 0
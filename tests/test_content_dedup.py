@@ -0,0 +1,96 @@
+import gc
+import pytest
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.loader.content_store import ContentStore, default_content_store
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import PromptModule
+
+BODY = "Framework rules.\n" * 500
+
+def module(module_id, content):
+    # Build the string at runtime so equal contents are distinct objects.
+    return PromptModule(id=module_id, version="1", type="MODIFIER", content="".join(content + [""]))
+
+def test_equal_contents_are_shared():
+    store = ContentStore()
+    registry = PromptModuleRegistry(content_store=store)
+    registry.register(module("a", [BODY]))
+    registry.register(module("b", [BODY]))
+    registry.register(module("c", ["other"]))
+
+    assert registry.get("a").content is registry.get("b").content
+    stats = registry.dedup_stats()
+    assert (stats.unique, stats.references) == (2, 3)
+    assert stats.saved_bytes == stats.logical_bytes - stats.stored_bytes > len(BODY)
+
+def test_store_is_shared_across_registries():
+    store = ContentStore()
+    first = PromptModuleRegistry(content_store=store)
+    second = PromptModuleRegistry(content_store=store)
+    first.register(module("a", [BODY]))
+    second.register(module("x", [BODY]))
+    assert first.get("a").content is second.get("x").content
+
+def test_references_are_released():
+    store = ContentStore()
+    registry = PromptModuleRegistry(content_store=store)
+    registry.register(module("a", [BODY]))
+    registry.register(module("b", [BODY]))
+    registry.clear()
+    assert len(store) == 0
+
+def test_dedup_can_be_disabled():
+    registry = PromptModuleRegistry(content_store=None)
+    registry.register(module("a", [BODY]))
+    registry.register(module("b", [BODY]))
+    assert registry.get("a").content is not registry.get("b").content
+    assert registry.dedup_stats().saved_bytes == 0
+
+def test_loader_dedups_copies_and_survives_reload(tmp_path):
+    for name in ("core", "copy"):
+        bundle = tmp_path / name
+        bundle.mkdir()
+        (bundle / "shared.md").write_text(BODY, encoding="utf-8")
+    store = ContentStore()
+    registry = PromptModuleRegistry(content_store=store)
+    loader = Loader(registry)
+    loader.load_bundles([str(tmp_path / "core"), str(tmp_path / "copy")])
+
+    assert registry.get("core/shared.md").content is registry.get("copy/shared.md").content
+    assert store.stats().references == 2
+
+    (tmp_path / "copy" / "shared.md").write_text("changed", encoding="utf-8")
+    assert loader.reload()
+    assert loader.reload() is not None # no-op reload releases its staging registry
+    stats = store.stats()
+    assert (stats.unique, stats.references, stats.saved_bytes) == (2, 2, 0)
+
+def test_dropped_registry_releases_its_contents():
+    store = ContentStore()
+    registry = PromptModuleRegistry(content_store=store)
+    registry.register(module("a", [BODY]))
+    registry.register(module("b", [BODY]))
+    staging = PromptModuleRegistry(content_store=store)
+    staging.register(module("c", ["other"]))
+    registry.swap(staging)
+    assert (store.stats().unique, store.stats().references) == (1, 1)
+
+    del registry, staging
+    gc.collect()
+    assert len(store) == 0
+
+def test_dropped_agents_leave_the_default_store_empty(tmp_path):
+    (tmp_path / "op.yaml").write_text("id: op\nversion: 1\ntype: OPERATOR\ncontent: x", encoding="utf-8")
+    (tmp_path / "note.txt").write_text("note", encoding="utf-8")
+    gc.collect()
+    before = default_content_store.stats()
+    for _ in range(3):
+        agent = DCLAgent(bundles=str(tmp_path), adapter=MockLLMAdapter())
+        agent.execute("op/1 'Topic'")
+        agent.reload()
+    del agent
+    gc.collect()
+    after = default_content_store.stats()
+    assert (after.unique, after.references) == (before.unique, before.references)
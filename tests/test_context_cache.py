@@ -0,0 +1,73 @@
+import os
+import pytest
+from dcl_agent.agent import DCLAgent, normalize_instruction
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.strategies.concat import ConcatenationStrategy
+
+@pytest.fixture
+def bundle(tmp_path):
+    op = tmp_path / "op.yaml"
+    op.write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: v1", encoding="utf-8")
+    return tmp_path
+
+class CountingStrategy(ConcatenationStrategy):
+    def __init__(self):
+        self.calls = 0
+
+    def assemble(self, instruction, registry):
+        self.calls += 1
+        return super().assemble(instruction, registry)
+
+@pytest.fixture
+def agent(bundle):
+    return DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(), strategy=CountingStrategy(), context_cache_size=2)
+
+def test_normalize_instruction_keeps_quoted_text():
+    assert normalize_instruction("  WRITE \n 'A  B'   USING\tx ") == "WRITE 'A  B' USING x"
+
+def test_repeated_instruction_is_assembled_once(agent):
+    agent.execute("write/1.0 'Topic'")
+    agent.execute("write/1.0    'Topic'\n")
+
+    assert agent.strategy.calls == 1
+    stats = agent.context_cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+def test_quoted_whitespace_is_significant(agent):
+    agent.execute("write/1.0 'A B'")
+    agent.execute("write/1.0 'A  B'")
+    assert agent.strategy.calls == 2
+
+def test_context_cache_is_bounded(agent):
+    for topic in ("a", "b", "c"):
+        agent.execute(f"write/1.0 '{topic}'")
+    agent.execute("write/1.0 'a'")
+
+    assert agent.strategy.calls == 4
+    assert agent.context_cache_stats().evictions == 2
+
+def test_reload_invalidates_cached_contexts(agent, bundle):
+    agent.execute("write/1.0 'Topic'")
+    op = bundle / "op.yaml"
+    mtime = op.stat().st_mtime_ns
+    op.write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: v2", encoding="utf-8")
+    os.utime(op, ns=(mtime, mtime + 1_000_000_000))
+    agent.reload()
+
+    agent.execute("write/1.0 'Topic'")
+    assert agent.strategy.calls == 2
+    assert "v2" in agent.adapter.last_context.frames[0].content
+
+def test_strategy_change_is_a_miss(agent):
+    agent.execute("write/1.0 'Topic'")
+    agent.strategy = CountingStrategy()
+    agent.execute("write/1.0 'Topic'")
+    assert agent.strategy.calls == 1
+
+@pytest.mark.parametrize("options", [{}, {"context_cache_size": 0}]) # Off by default
+def test_context_cache_disabled(bundle, options):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(), strategy=CountingStrategy(), **options)
+    agent.execute("write/1.0 'Topic'")
+    agent.execute("write/1.0 'Topic'")
+    assert agent.strategy.calls == 2
+    assert agent.context_cache_stats().hits == 0
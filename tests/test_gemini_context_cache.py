@@ -0,0 +1,217 @@
+import asyncio
+import itertools
+import threading
+from types import SimpleNamespace
+import pytest
+from dcl_agent.model import InvocationContext, TextFrame
+
+pytest.importorskip("google.genai")
+from google.genai import errors
+from dcl_agent.adapter.gemini import GeminiAdapter
+
+class FakeClient:
+    """Offline stand-in for genai.Client: records cache and generate calls."""
+    def __init__(self, fail_create=False):
+        self.created = []
+        self.deleted = []
+        self.requests = []
+        self.attempts = 0
+        self._ids = itertools.count(1)
+        self.fail_create = fail_create
+        self.caches = SimpleNamespace(create=self._create, delete=self._delete)
+        self.models = SimpleNamespace(generate_content=self._generate)
+        self.aio = SimpleNamespace(
+            caches=SimpleNamespace(create=self._acreate, delete=self._adelete),
+            models=SimpleNamespace(generate_content=self._agenerate)
+        )
+
+    def _create(self, model, config):
+        self.attempts += 1
+        if self.fail_create:
+            raise RuntimeError("cached content too small")
+        self.created.append(config)
+        return SimpleNamespace(name=f"cachedContents/{next(self._ids)}")
+
+    def _delete(self, name):
+        self.deleted.append(name)
+
+    def _generate(self, model, contents, config):
+        self.requests.append((contents, config))
+        return SimpleNamespace(text="ok")
+
+    async def _acreate(self, model, config):
+        return self._create(model, config)
+
+    async def _adelete(self, name):
+        self._delete(name)
+
+    async def _agenerate(self, model, contents, config):
+        return self._generate(model, contents, config)
+
+def api_error(code, status):
+    return errors.APIError(code, {"error": {"code": code, "message": "failed", "status": status}})
+
+def context(operand, prefix="operator and modifiers"):
+    return InvocationContext(
+        frames=[TextFrame(content=prefix), TextFrame(content="zero"), TextFrame(content=operand)],
+        prefix_frames=2
+    )
+
+def texts(contents):
+    return [part.text for part in contents[0].parts]
+
+def test_stable_prefix_is_cached_once_and_reused():
+    client = FakeClient()
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=600)
+
+    assert adapter.invoke(context("first")) == "ok"
+    assert adapter.invoke(context("second")) == "ok"
+
+    assert len(client.created) == 1
+    assert texts(client.created[0].contents) == ["operator and modifiers", "zero"]
+    assert client.created[0].ttl == "600s"
+    for (contents, config), operand in zip(client.requests, ["first", "second"]):
+        assert texts(contents) == [operand]
+        assert config.cached_content == "cachedContents/1"
+    assert (adapter.cache_misses, adapter.cache_hits) == (1, 1)
+
+def test_different_prefix_gets_own_handle():
+    client = FakeClient()
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=600)
+    adapter.invoke(context("x", prefix="A"))
+    adapter.invoke(context("x", prefix="B"))
+    assert [config.cached_content for _, config in client.requests] == ["cachedContents/1", "cachedContents/2"]
+
+def test_expired_handle_is_recreated(monkeypatch):
+    client = FakeClient()
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=10)
+    clock = [1000.0]
+    monkeypatch.setattr("dcl_agent.adapter.gemini.time.time", lambda: clock[0])
+
+    adapter.invoke(context("a"))
+    clock[0] += 5
+    adapter.invoke(context("b"))
+    clock[0] += 5 # past 90% of the TTL
+    adapter.invoke(context("c"))
+
+    assert len(client.created) == 2
+
+def test_caching_disabled_or_unusable_sends_everything():
+    client = FakeClient()
+    GeminiAdapter(api_key="test", client=client).invoke(context("a"))
+    GeminiAdapter(api_key="test", client=client, cache_ttl=600, cache_min_chars=1000).invoke(context("a"))
+    GeminiAdapter(api_key="test", client=client, cache_ttl=600).invoke(
+        InvocationContext(frames=[TextFrame(content="only")], prefix_frames=1)
+    )
+    assert client.created == []
+    assert all(config.cached_content is None for _, config in client.requests)
+    assert texts(client.requests[0][0]) == ["operator and modifiers", "zero", "a"]
+
+def test_failed_cache_creation_falls_back_to_full_request():
+    client = FakeClient(fail_create=True)
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=600)
+    assert adapter.invoke(context("a")) == "ok"
+    contents, config = client.requests[0]
+    assert texts(contents) == ["operator and modifiers", "zero", "a"]
+    assert config.cached_content is None
+
+def test_failed_cache_creation_is_not_retried_within_ttl(monkeypatch):
+    client = FakeClient(fail_create=True)
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=10)
+    clock = [1000.0]
+    monkeypatch.setattr("dcl_agent.adapter.gemini.time.time", lambda: clock[0])
+
+    adapter.invoke(context("a"))
+    adapter.invoke(context("b"))
+    assert client.attempts == 1
+
+    clock[0] += 10
+    client.fail_create = False
+    adapter.invoke(context("c"))
+    assert client.attempts == 2
+    assert client.requests[-1][1].cached_content == "cachedContents/1"
+
+def test_concurrent_request_does_not_wait_for_cache_creation():
+    client = FakeClient()
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=600)
+    started, release = threading.Event(), threading.Event()
+    create = client._create
+
+    def slow_create(model, config):
+        started.set()
+        release.wait(5)
+        return create(model, config)
+
+    client.caches.create = slow_create
+    first = threading.Thread(target=adapter.invoke, args=(context("a"),))
+    first.start()
+    try:
+        assert started.wait(5)
+        # Same prefix while the cache is being created: sent in full, no second create.
+        assert adapter.invoke(context("b")) == "ok"
+        contents, config = client.requests[0]
+        assert texts(contents) == ["operator and modifiers", "zero", "b"]
+        assert config.cached_content is None
+    finally:
+        release.set()
+        first.join(5)
+
+    assert len(client.created) == 1
+    adapter.invoke(context("c"))
+    assert client.requests[-1][1].cached_content == "cachedContents/1"
+
+def test_ainvoke_creates_cache_with_async_client():
+    client = FakeClient()
+    client.caches.create = None # Must not be used from ainvoke
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=600)
+
+    assert asyncio.run(adapter.ainvoke(context("a"))) == "ok"
+    assert len(client.created) == 1
+    assert client.requests[0][1].cached_content == "cachedContents/1"
+
+def test_expired_handles_are_pruned(monkeypatch):
+    client = FakeClient()
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=10)
+    clock = [1000.0]
+    monkeypatch.setattr("dcl_agent.adapter.gemini.time.time", lambda: clock[0])
+
+    adapter.invoke(context("x", prefix="A"))
+    clock[0] += 10
+    adapter.invoke(context("x", prefix="B"))
+
+    assert [handle.name for handle in adapter._handles.values()] == ["cachedContents/2"]
+
+def test_failed_request_drops_handle_and_clear_deletes():
+    client = FakeClient()
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=600)
+    adapter.invoke(context("a"))
+
+    def evicted(model, contents, config):
+        raise api_error(404, "NOT_FOUND")
+    client.models.generate_content = evicted
+    assert adapter.invoke(context("b")).startswith("Gemini Error")
+    assert client.deleted == ["cachedContents/1"]
+
+    client.models.generate_content = client._generate
+    adapter.invoke(context("c"))
+    assert len(client.created) == 2
+
+    adapter.clear_context_caches()
+    assert client.deleted == ["cachedContents/1", "cachedContents/2"]
+
+@pytest.mark.parametrize("error", [api_error(429, "RESOURCE_EXHAUSTED"), TimeoutError("timed out")])
+def test_transient_failure_keeps_handle(error):
+    client = FakeClient()
+    adapter = GeminiAdapter(api_key="test", client=client, cache_ttl=600)
+    adapter.invoke(context("a"))
+
+    def failing(model, contents, config):
+        raise error
+    client.models.generate_content = failing
+    assert adapter.invoke(context("b")).startswith("Gemini Error")
+
+    client.models.generate_content = client._generate
+    adapter.invoke(context("c"))
+    assert len(client.created) == 1
+    assert client.deleted == []
+    assert client.requests[-1][1].cached_content == "cachedContents/1"
@@ -0,0 +1,143 @@
+import os
+import pytest
+import yaml
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.exceptions import InvalidAliasError
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.loader.watcher import BundleWatcher
+
+def write(path, text):
+    existed = path.exists()
+    old_mtime = path.stat().st_mtime_ns if existed else 0
+    path.write_text(text, encoding="utf-8")
+    # Guarantee a different stamp even on coarse-grained filesystems.
+    if existed:
+        os.utime(path, ns=(old_mtime, old_mtime + 1_000_000_000))
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "hot"
+    root.mkdir()
+    write(root / "index.yaml", yaml.dump({"aliases": {"OP": "op/1.0"}}))
+    write(root / "op.yaml", "id: op\nversion: 1.0\ntype: OPERATOR\ncontent: v1")
+    write(root / "note.txt", "note v1")
+    return root
+
+@pytest.fixture
+def loader(bundle):
+    loader = Loader(PromptModuleRegistry())
+    loader.load_bundles([str(bundle)])
+    return loader
+
+def test_reload_without_changes(loader):
+    generation = loader.registry.generation
+    result = loader.reload()
+    assert not result
+    assert loader.registry.generation == generation
+
+def test_reload_detects_changes(loader, bundle, monkeypatch):
+    calls = []
+    original = Loader._build_module
+
+    def counting(file_path, bundle_root, *args, **kwargs):
+        calls.append(file_path.name)
+        return original(file_path, bundle_root, *args, **kwargs)
+
+    monkeypatch.setattr(Loader, "_build_module", staticmethod(counting))
+
+    write(bundle / "op.yaml", "id: op\nversion: 1.0\ntype: OPERATOR\ncontent: v2")
+    write(bundle / "new.txt", "new")
+    (bundle / "note.txt").unlink()
+
+    result = loader.reload()
+
+    assert sorted(calls) == ["new.txt", "op.yaml"]
+    assert result.changed == ["op/1.0"]
+    assert result.added == ["hot/new.txt"]
+    assert result.removed == ["hot/note.txt"]
+    assert loader.registry.get("OP").metadata["content"] == "v2"
+    assert loader.registry.get("hot/note.txt") is None
+
+def test_reload_keeps_views_consistent(loader, bundle):
+    view = loader.registry.view()
+    write(bundle / "op.yaml", "id: op\nversion: 1.0\ntype: OPERATOR\ncontent: v2")
+
+    loader.reload()
+
+    assert view.get("OP").metadata["content"] == "v1"
+    assert loader.registry.get("OP").metadata["content"] == "v2"
+    assert loader.registry.generation > view.generation
+
+def test_reload_rejects_broken_alias(loader, bundle):
+    write(bundle / "index.yaml", yaml.dump({"aliases": {"OP": "op/1.0", "BAD": "missing"}}))
+
+    with pytest.raises(InvalidAliasError):
+        loader.reload()
+    assert loader.registry.get("BAD") is None
+
+    # Fixing the index is picked up by the next reload.
+    write(bundle / "index.yaml", yaml.dump({"aliases": {"OP": "op/1.0", "NOTE": "hot/note.txt"}}))
+    result = loader.reload()
+    assert result.aliases == ["NOTE"]
+    assert loader.registry.get("NOTE").content == "note v1"
+
+def test_reload_rejects_removed_alias_target(loader, bundle):
+    (bundle / "op.yaml").unlink()
+    with pytest.raises(InvalidAliasError):
+        loader.reload()
+    assert loader.registry.get("OP") is not None
+
+def test_reload_restores_shadowed_module(tmp_path):
+    b1, b2 = tmp_path / "b1", tmp_path / "b2"
+    b1.mkdir()
+    b2.mkdir()
+    write(b1 / "m.yaml", "id: m\nversion: 1\ntype: t\ncontent: b1")
+    write(b2 / "m.yaml", "id: m\nversion: 1\ntype: t\ncontent: b2")
+    loader = Loader(PromptModuleRegistry())
+    loader.load_bundles([str(b1), str(b2)])
+
+    (b1 / "m.yaml").unlink()
+    result = loader.reload()
+
+    assert result.changed == ["m/1"]
+    assert loader.registry.get("m/1").metadata["content"] == "b2"
+
+def test_watcher_poll_dispatches(loader, bundle):
+    results = []
+    watcher = BundleWatcher(loader, on_reload=results.append)
+    watcher.poll()
+    assert results == []
+
+    write(bundle / "other.txt", "x")
+    watcher.poll()
+    assert results[0].added == ["hot/other.txt"]
+
+def test_agent_reload(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(), watch=True, watch_interval=60)
+    try:
+        assert agent.watcher.running
+        write(bundle / "op.yaml", "id: op\nversion: 1.0\ntype: OPERATOR\ncontent: v2")
+        assert agent.reload().changed == ["op/1.0"]
+        agent.execute("OP 'Topic'")
+        assert any("v2" in f.content for f in agent.adapter.last_context.frames)
+    finally:
+        agent.close()
+    assert not agent.watcher.running
+
+def test_noop_reload_does_not_rebuild(loader, bundle, monkeypatch):
+    def populate(*args):
+        raise AssertionError("staging registry built for an unchanged bundle")
+
+    monkeypatch.setattr(loader, "_populate", populate)
+    monkeypatch.setattr(Loader, "_build_module", staticmethod(populate))
+    assert not loader.reload()
+
+    # Any changed, added or removed file still triggers the full reload.
+    monkeypatch.undo()
+    write(bundle / "extra.txt", "extra")
+    assert loader.reload().added == ["hot/extra.txt"]
+    (bundle / "extra.txt").unlink()
+    assert loader.reload().removed == ["hot/extra.txt"]
+    assert not loader.reload()
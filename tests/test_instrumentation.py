@@ -0,0 +1,155 @@
+import pytest
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.instrumentation import (
+    NULL_SPAN, Histogram, Instrumentation, InstrumentationHook, MetricsAggregator, OpenTelemetryHook
+)
+
+@pytest.fixture
+def bundle(bundle, tmp_path):
+    (tmp_path / "notes.txt").write_text("Notes.", encoding="utf-8")
+    return bundle
+
+class Recorder(InstrumentationHook):
+    def __init__(self):
+        self.events = []
+
+    def on_span_start(self, span):
+        self.events.append(("start", span.name, span.parent.name if span.parent else None))
+
+    def on_span_end(self, span):
+        self.events.append(("end", span.name, dict(span.attributes)))
+
+def test_disabled_instrumentation_is_a_shared_noop():
+    instrumentation = Instrumentation()
+    assert not instrumentation.enabled
+    assert instrumentation.span("dcl.parse") is NULL_SPAN
+    with instrumentation.span("x") as span:
+        span.set_attribute("ignored", 1)
+        assert not span.recording
+
+def test_execute_spans_are_nested(bundle):
+    recorder = Recorder()
+    agent = DCLAgent(
+        bundles=bundle, adapter=MockLLMAdapter(fixed_response="ok"),
+        instrumentation=Instrumentation([recorder]), context_cache_size=128
+    )
+    recorder.events.clear()
+    agent.execute("write/1.0 'Topic'")
+
+    starts = [(name, parent) for kind, name, parent in recorder.events if kind == "start"]
+    assert starts == [
+        ("dcl.execute", None),
+        ("dcl.build_context", "dcl.execute"),
+        ("dcl.parse", "dcl.build_context"),
+        ("dcl.assemble", "dcl.build_context"),
+        ("dcl.invoke", "dcl.execute"),
+    ]
+    ends = {name: attributes for kind, name, attributes in recorder.events if kind == "end"}
+    assert ends["dcl.build_context"] == {"cache_hit": False}
+    assert ends["dcl.assemble"]["strategy"] == "GeminiNativeStrategy"
+    assert ends["dcl.assemble"]["frames"] == 4
+    assert ends["dcl.invoke"] == {"adapter": "MockLLMAdapter", "response_chars": 2}
+
+def test_batch_invoke_spans_keep_the_callers_span(bundle):
+    recorder = Recorder()
+    instrumentation = Instrumentation([recorder])
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(fixed_response="ok"), instrumentation=instrumentation)
+    recorder.events.clear()
+    with instrumentation.span("job"):
+        agent.execute_many(["write/1.0 'a'", "write/1.0 'b'"], max_concurrency=2)
+
+    parents = [parent for kind, name, parent in recorder.events if kind == "start" and name == "dcl.invoke"]
+    assert parents == ["job", "job"]
+
+def test_loader_spans(bundle):
+    recorder = Recorder()
+    DCLAgent(bundles=bundle, adapter=MockLLMAdapter(), instrumentation=Instrumentation([recorder]))
+    ends = [(name, attributes) for kind, name, attributes in recorder.events if kind == "end"]
+    assert [name for name, _ in ends] == ["dcl.load_file", "dcl.load_file", "dcl.load_bundle", "dcl.load"]
+    assert {a["module_id"] for name, a in ends if name == "dcl.load_file"} == {"write/1.0", f"{bundle.split('/')[-1]}/notes.txt"}
+    assert ends[-1][1] == {"bundles": 1, "files": 2}
+
+def test_metrics_aggregator(bundle):
+    metrics = MetricsAggregator()
+    agent = DCLAgent(
+        bundles=bundle, adapter=MockLLMAdapter(),
+        instrumentation=Instrumentation([metrics]), context_cache_size=128
+    )
+    for _ in range(3):
+        agent.execute("write/1.0 'Topic'")
+    with pytest.raises(Exception):
+        agent.execute("NOT VALID DCL !!")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["dcl.execute.count"] == 4
+    assert snapshot["counters"]["dcl.execute.errors"] == 1
+    assert snapshot["counters"]["dcl.build_context.cache_hit"] == 2
+    assert snapshot["counters"]["dcl.parse.count"] == 2
+    assert snapshot["histograms"]["dcl.invoke.duration"]["count"] == 3
+    assert snapshot["histograms"]["dcl.assemble.frames"]["max"] == 4
+
+def test_histogram_percentiles():
+    histogram = Histogram(bounds=(1, 2, 4, 8))
+    for value in (0.5, 1.5, 3, 3, 7, 20):
+        histogram.observe(value)
+    assert histogram.percentile(50) == 4
+    assert histogram.percentile(100) == 20
+    assert (histogram.count, histogram.sum, histogram.min) == (6, 35, 0.5)
+
+def test_stream_span(bundle):
+    recorder = Recorder()
+    agent = DCLAgent(
+        bundles=bundle, adapter=MockLLMAdapter(fixed_response="abcdef", chunk_size=2),
+        instrumentation=Instrumentation([recorder])
+    )
+    assert "".join(agent.execute_stream("write/1.0 'Topic'")) == "abcdef"
+    attributes = [a for kind, name, a in recorder.events if kind == "end" and name == "dcl.invoke_stream"][0]
+    assert attributes["chunks"] == 3 and attributes["response_chars"] == 6
+    assert attributes["first_chunk_seconds"] >= 0
+
+def test_failing_hook_does_not_break_execute(bundle, capsys):
+    class Broken(InstrumentationHook):
+        def on_span_end(self, span):
+            raise RuntimeError("exporter down")
+
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(fixed_response="ok"))
+    agent.instrumentation.add_hook(Broken())
+    assert agent.execute("write/1.0 'Topic'") == "ok"
+    assert "exporter down" in capsys.readouterr().out
+
+class FakeOtelSpan:
+    def __init__(self, name, context):
+        self.name, self.context = name, context
+        self.attributes, self.ended, self.exceptions = {}, False, []
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, error):
+        self.exceptions.append(error)
+
+    def set_status(self, status):
+        pass
+
+    def end(self):
+        self.ended = True
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, context=None):
+        span = FakeOtelSpan(name, context)
+        self.spans.append(span)
+        return span
+
+def test_opentelemetry_hook_with_tracer(bundle):
+    tracer = FakeTracer()
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter(fixed_response="ok"))
+    agent.instrumentation = Instrumentation([OpenTelemetryHook(tracer=tracer)])
+    agent.execute("write/1.0 'Topic'")
+
+    assert [s.name for s in tracer.spans] == ["dcl.execute", "dcl.build_context", "dcl.parse", "dcl.assemble", "dcl.invoke"]
+    assert all(s.ended for s in tracer.spans)
+    assert tracer.spans[-1].attributes == {"dcl.adapter": "MockLLMAdapter", "dcl.response_chars": 2}
@@ -0,0 +1,71 @@
+import pytest
+from dcl_agent.cache import LRUCache
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "lazy"
+    root.mkdir()
+    (root / "op.yaml").write_text("id: op\nversion: 1.0\ntype: OPERATOR\ncontent: write", encoding="utf-8")
+    (root / "big.ttl").write_text("x" * 100, encoding="utf-8")
+    (root / "small.txt").write_text("y" * 10, encoding="utf-8")
+    return root
+
+def test_lru_cache_evicts_by_weight():
+    cache = LRUCache(max_weight=10, weigher=len)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa" # "a" becomes most recently used
+    cache.put("c", "cccc")
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    stats = cache.stats()
+    assert (stats.hits, stats.evictions, stats.weight) == (1, 1, 8)
+
+def test_lru_cache_skips_oversized_values():
+    cache = LRUCache(max_weight=3, weigher=len)
+    cache.put("a", "abc")
+    cache.put("b", "too long")
+    assert "b" not in cache
+    assert cache.get("a") == "abc"
+
+def test_lazy_loader_indexes_without_content(bundle):
+    registry = PromptModuleRegistry()
+    Loader(registry, lazy=True).load_bundles([str(bundle)])
+
+    stored = registry._modules["op/1.0"]
+    assert stored.content is None
+    assert stored.metadata == {}
+    assert stored.type == "OPERATOR"
+    assert registry._modules["lazy/big.ttl"].content is None
+
+def test_lazy_get_reads_content(bundle):
+    registry = PromptModuleRegistry()
+    Loader(registry, lazy=True).load_bundles([str(bundle)])
+
+    module = registry.get("op/1.0")
+    assert "content: write" in module.content
+    assert registry.get("lazy/big.ttl").content == "x" * 100
+    # The stored entry stays an index entry.
+    assert registry._modules["op/1.0"].content is None
+
+def test_lazy_content_bounded_by_lru(bundle):
+    registry = PromptModuleRegistry(content_cache_size=105)
+    Loader(registry, lazy=True).load_bundles([str(bundle)])
+
+    registry.get("lazy/big.ttl")
+    registry.get("lazy/small.txt")
+
+    assert "lazy/small.txt" in registry.content_cache
+    assert "lazy/big.ttl" not in registry.content_cache
+    # Evicted content is transparently re-read.
+    assert registry.get("lazy/big.ttl").content == "x" * 100
+
+def test_lazy_sees_content_at_first_use(bundle):
+    registry = PromptModuleRegistry()
+    Loader(registry, lazy=True).load_bundles([str(bundle)])
+
+    (bundle / "small.txt").write_text("updated", encoding="utf-8")
+    assert registry.get("lazy/small.txt").content == "updated"
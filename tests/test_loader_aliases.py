@@ -1,5 +1,4 @@
 import pytest
-import yaml
 from dcl_agent.loader.loader import Loader
 from dcl_agent.loader.registry import PromptModuleRegistry
 from dcl_agent.exceptions import InvalidAliasError
@@ -9,22 +8,7 @@ def loader():
     registry = PromptModuleRegistry()
     return Loader(registry)
 
-def create_bundle(path, name, index_content, modules):
-    """Helper to create a bundle structure."""
-    bundle_root = path / name
-    bundle_root.mkdir()
-    
-    if index_content:
-        (bundle_root / "index.yaml").write_text(yaml.dump(index_content), encoding="utf-8")
-    
-    for mod_path, content_dict in modules.items():
-        p = bundle_root / mod_path
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(yaml.dump(content_dict), encoding="utf-8")
-    
-    return str(bundle_root)
-
-def test_loader_simple_alias(loader, tmp_path):
+def test_loader_simple_alias(loader, tmp_path, create_bundle):
     # Bundle A: index defines A->M, module M exists
     # M registers as "mod/1/1.0" because version is 1.0
     index = {"aliases": {"MyAlias": "mod/1/1.0", "operators": {}, "entities": {}}}
@@ -39,7 +23,7 @@ def test_loader_simple_alias(loader, tmp_path):
     assert reg.get("mod/1/1.0") is not None
     assert reg.get("MyAlias") == reg.get("mod/1/1.0")
 
-def test_loader_alias_first_wins(loader, tmp_path):
+def test_loader_alias_first_wins(loader, tmp_path, create_bundle):
     # Bundle 1: Alias A -> M1
     # Bundle 2: Alias A -> M2
     # M1 and M2 exist
@@ -60,7 +44,7 @@ def test_loader_alias_first_wins(loader, tmp_path):
     resolved = loader.registry.get("A")
     assert resolved.id == "m/1/1.0"
 
-def test_loader_module_first_wins(loader, tmp_path):
+def test_loader_module_first_wins(loader, tmp_path, create_bundle):
     # Bundle 1: M (content 1)
     # Bundle 2: M (content 2)
     
@@ -86,7 +70,7 @@ def test_loader_module_first_wins(loader, tmp_path):
     # Only DuplicateIdWarning.
     pass 
 
-def test_loader_validation_error(loader, tmp_path):
+def test_loader_validation_error(loader, tmp_path, create_bundle):
     # Alias to missing target
     b_path = create_bundle(tmp_path, "b_broken", 
         {"aliases": {"Bad": "non_existent"}}, 
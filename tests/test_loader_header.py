@@ -0,0 +1,115 @@
+import pytest
+from dcl_agent.loader import loader as loader_module
+from dcl_agent.loader.loader import Loader, sniff_header
+from dcl_agent.loader.registry import PromptModuleRegistry
+
+def test_sniff_header_reads_top_level_keys():
+    content = "id: sys/ops/write\ntype: OPERATOR\nversion: 1.0\nbody:\n  id: nested\n"
+    assert sniff_header(content) == {"id": "sys/ops/write", "type": "OPERATOR", "version": 1.0}
+
+def test_sniff_header_requires_plain_id():
+    assert sniff_header("type: OPERATOR\nversion: 1.0") is None
+    assert sniff_header("id: |\n  multi\n") is None
+    assert sniff_header("just text") is None
+
+@pytest.fixture
+def shadowed(tmp_path):
+    b1, b2 = tmp_path / "b1", tmp_path / "b2"
+    b1.mkdir()
+    b2.mkdir()
+    (b1 / "m.yaml").write_text("id: m\nversion: 1\ntype: t\ncontent: b1", encoding="utf-8")
+    (b2 / "m.yaml").write_text("id: m\nversion: 1\ntype: t\ncontent: b2\nbroken: [", encoding="utf-8")
+    (b2 / "n.yaml").write_text("id: n\nversion: 1\ntype: t\ncontent: n", encoding="utf-8")
+    return [str(b1), str(b2)]
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Records the documents that go through a full YAML parse."""
+    documents = []
+    original = loader_module.load_yaml
+
+    def counting(text):
+        documents.append(text)
+        return original(text)
+
+    monkeypatch.setattr(loader_module, "load_yaml", counting)
+    return documents
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_duplicate_bodies_are_not_parsed(shadowed, parsed, max_workers):
+    loader = Loader(PromptModuleRegistry(), max_workers=max_workers)
+    loader.load_bundles(shadowed)
+
+    full_parses = [d for d in parsed if "content:" in d]
+    assert not any("content: b2" in d for d in full_parses)
+    assert loader.registry.get("m/1").metadata["content"] == "b1"
+    assert loader.registry.get("n/1").metadata["content"] == "n"
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_shadowed_module_parsed_once_winner_is_gone(shadowed, max_workers, tmp_path):
+    (tmp_path / "b2" / "m.yaml").write_text("id: m\nversion: 1\ntype: t\ncontent: b2", encoding="utf-8")
+    loader = Loader(PromptModuleRegistry(), max_workers=max_workers)
+    loader.load_bundles(shadowed)
+
+    (tmp_path / "b1" / "m.yaml").unlink()
+    loader.reload()
+
+    assert loader.registry.get("m/1").metadata["content"] == "b2"
+
+def test_lazy_mode_uses_header_only(shadowed, parsed):
+    loader = Loader(PromptModuleRegistry(), lazy=True)
+    loader.load_bundles(shadowed)
+
+    assert [d for d in parsed if "content:" in d] == []
+    assert loader.registry.get("n/1").type == "t"
+
+@pytest.fixture
+def sniffed(monkeypatch):
+    """Records the documents whose header is sniffed."""
+    documents = []
+    original = loader_module.sniff_header
+
+    def counting(content):
+        documents.append(content)
+        return original(content)
+
+    monkeypatch.setattr(loader_module, "sniff_header", counting)
+    return documents
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_headers_are_sniffed_once_per_file(shadowed, sniffed, max_workers):
+    Loader(PromptModuleRegistry(), max_workers=max_workers).load_bundles(shadowed)
+    assert len(sniffed) == 3
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_headers_are_not_sniffed_without_possible_shadowing(shadowed, sniffed, max_workers):
+    loader = Loader(PromptModuleRegistry(), max_workers=max_workers)
+    loader.load_bundles(shadowed[:1])
+    assert sniffed == []
+    assert loader.registry.get("m/1").metadata["content"] == "b1"
+
+    # IDs are registered now: the next bundle's files may be shadowed.
+    loader.load_from_directory(shadowed[1])
+    assert len(sniffed) == 2
+    assert loader.registry.get("m/1").metadata["content"] == "b1"
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_unparseable_shadowed_file_keeps_its_path_id(shadowed, max_workers, lazy):
+    loader = Loader(PromptModuleRegistry(), max_workers=max_workers, lazy=lazy)
+    loader.load_bundles(shadowed)
+
+    # b2/m.yaml names m/1 in its header, but its body is not valid YAML.
+    module = loader.registry.get("b2/m.yaml")
+    assert module.type == "RESOURCE"
+    assert "broken: [" in module.content
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_unparseable_file_does_not_shadow_its_header_id(shadowed, max_workers, tmp_path):
+    (tmp_path / "b1" / "m.yaml").write_text("id: m\nversion: 1\ntype: t\nbroken: [", encoding="utf-8")
+    (tmp_path / "b2" / "m.yaml").write_text("id: m\nversion: 1\ntype: t\ncontent: b2", encoding="utf-8")
+    loader = Loader(PromptModuleRegistry(), max_workers=max_workers)
+    loader.load_bundles(shadowed)
+
+    assert loader.registry.get("m/1").metadata["content"] == "b2"
+    assert loader.registry.get("b1/m.yaml").type == "RESOURCE"
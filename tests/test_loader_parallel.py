@@ -0,0 +1,60 @@
+import pytest
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+
+@pytest.fixture
+def bundles(tmp_path, create_bundle):
+    modules_1 = {
+        f"mods/m{i}.yaml": {"id": f"m/{i}", "version": "1.0", "type": "t", "content": f"b1-{i}"}
+        for i in range(50)
+    }
+    modules_1["raw/note.txt"] = "b1 note"
+    b1 = create_bundle(tmp_path, "b1", {"aliases": {"A": "m/1/1.0", "B": "m/2/1.0"}}, modules_1)
+
+    # Bundle 2 shadows half of the IDs and re-defines alias A.
+    modules_2 = {
+        f"mods/m{i}.yaml": {"id": f"m/{i}", "version": "1.0", "type": "t", "content": f"b2-{i}"}
+        for i in range(25, 75)
+    }
+    b2 = create_bundle(tmp_path, "b2", {"aliases": {"A": "m/60/1.0", "C": "m/70/1.0"}}, modules_2)
+    return [b1, b2]
+
+def registry_state(registry):
+    return {
+        module_id: (registry.get(module_id).metadata.get("content"), registry.get(module_id).path)
+        for module_id in registry.list_modules()
+    }, dict(registry._aliases)
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_matches_sequential(bundles, executor):
+    sequential = Loader(PromptModuleRegistry())
+    sequential.load_bundles(bundles)
+
+    parallel = Loader(PromptModuleRegistry(), max_workers=4, executor=executor)
+    parallel.load_bundles(bundles)
+
+    assert registry_state(parallel.registry) == registry_state(sequential.registry)
+    assert parallel.registry.list_modules() == sequential.registry.list_modules()
+
+def test_parallel_first_wins(bundles):
+    loader = Loader(PromptModuleRegistry(), max_workers=8)
+    loader.load_bundles(bundles)
+    reg = loader.registry
+
+    # Modules: b1 wins for the shared IDs, b2 contributes only new ones.
+    assert reg.get("m/30/1.0").metadata["content"] == "b1-30"
+    assert reg.get("m/60/1.0").metadata["content"] == "b2-60"
+
+    # Aliases: b1 wins for A, b2 contributes C.
+    assert reg.get("A").id == "m/1/1.0"
+    assert reg.get("C").id == "m/70/1.0"
+    assert reg.get("b1/raw/note.txt").content == "b1 note"
+
+def test_parallel_load_from_directory(bundles):
+    loader = Loader(PromptModuleRegistry(), max_workers=4)
+    loader.load_from_directory(bundles[0])
+    assert len(loader.registry.list_modules()) == 51
+
+def test_invalid_executor():
+    with pytest.raises(ValueError):
+        Loader(PromptModuleRegistry(), max_workers=2, executor="fiber")
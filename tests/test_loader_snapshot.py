@@ -0,0 +1,90 @@
+import os
+import pytest
+import yaml
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.loader.snapshot import RegistrySnapshot
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "bundle"
+    root.mkdir()
+    (root / "index.yaml").write_text(yaml.dump({"aliases": {"OP": "op/1.0"}}), encoding="utf-8")
+    (root / "op.yaml").write_text("id: op\nversion: 1.0\ntype: OPERATOR\ncontent: v1", encoding="utf-8")
+    (root / "note.txt").write_text("raw note", encoding="utf-8")
+    return root
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "cache" / "registry.snapshot")
+
+def load(bundle, snapshot_path, monkeypatch=None, calls=None):
+    loader = Loader(PromptModuleRegistry(), snapshot_path=snapshot_path)
+    if calls is not None:
+        original = Loader._build_module
+
+        def counting(file_path, bundle_root, *args, **kwargs):
+            calls.append(file_path.name)
+            return original(file_path, bundle_root, *args, **kwargs)
+
+        monkeypatch.setattr(Loader, "_build_module", staticmethod(counting))
+    loader.load_bundles([str(bundle)])
+    return loader.registry
+
+def touch(path, text):
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    # Guarantee a different stamp even on coarse-grained filesystems.
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_snapshot_written_and_reused(bundle, snapshot_path, monkeypatch):
+    first = load(bundle, snapshot_path)
+    assert os.path.exists(snapshot_path)
+
+    calls = []
+    second = load(bundle, snapshot_path, monkeypatch, calls)
+
+    assert calls == []
+    assert second.list_modules() == first.list_modules()
+    assert second.get("OP").metadata["content"] == "v1"
+    assert second.get("bundle/note.txt").content == "raw note"
+
+def test_snapshot_reparses_only_changed_files(bundle, snapshot_path, monkeypatch):
+    load(bundle, snapshot_path)
+    touch(bundle / "op.yaml", "id: op\nversion: 1.0\ntype: OPERATOR\ncontent: v2")
+    (bundle / "new.txt").write_text("new", encoding="utf-8")
+
+    calls = []
+    registry = load(bundle, snapshot_path, monkeypatch, calls)
+
+    assert sorted(calls) == ["new.txt", "op.yaml"]
+    assert registry.get("OP").metadata["content"] == "v2"
+    assert registry.get("bundle/new.txt").content == "new"
+
+def test_snapshot_drops_removed_files(bundle, snapshot_path):
+    load(bundle, snapshot_path)
+    (bundle / "note.txt").unlink()
+
+    registry = load(bundle, snapshot_path)
+
+    assert registry.get("bundle/note.txt") is None
+    assert str(bundle / "note.txt") not in RegistrySnapshot.load(snapshot_path).files
+
+def test_snapshot_tracks_index_changes(bundle, snapshot_path):
+    load(bundle, snapshot_path)
+    touch(bundle / "index.yaml", yaml.dump({"aliases": {"NOTE": "bundle/note.txt"}}))
+
+    registry = load(bundle, snapshot_path)
+
+    assert registry.get("NOTE").content == "raw note"
+    assert registry.get("OP") is None
+
+def test_corrupt_snapshot_is_ignored(bundle, snapshot_path, tmp_path):
+    os.makedirs(os.path.dirname(snapshot_path))
+    with open(snapshot_path, "wb") as f:
+        f.write(b"not a pickle")
+
+    registry = load(bundle, snapshot_path)
+
+    assert registry.get("OP") is not None
+    assert RegistrySnapshot.load(snapshot_path).files
@@ -0,0 +1,61 @@
+import pickle
+import pytest
+from dcl_agent.agent import DCLAgent
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import (
+    BlobFrame, Entity, Instruction, InvocationContext, PromptModule, ResourceRef, TextFrame
+)
+
+@pytest.mark.parametrize("instance", [
+    PromptModule(id="m", version="1.0", type="OPERATOR", content="x"),
+    TextFrame(content="x"),
+    BlobFrame(mime_type="image/png", data=b"x"),
+    ResourceRef(id="r"),
+    Entity(type="ANY", value="v"),
+    Instruction(action="write", operand=Entity(type="ANY", value="v")),
+    InvocationContext(),
+])
+def test_model_classes_are_slotted(instance):
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.unexpected = 1
+    assert pickle.loads(pickle.dumps(instance)) == instance
+
+@pytest.fixture
+def bundle(tmp_path):
+    (tmp_path / "op.yaml").write_text(
+        "id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.\nsections: [a, b]", encoding="utf-8"
+    )
+    return tmp_path
+
+def test_keep_metadata(bundle):
+    kept = PromptModuleRegistry()
+    Loader(kept).load_bundles([str(bundle)])
+    assert kept.get("write/1.0").metadata["sections"] == ["a", "b"]
+
+    dropped = PromptModuleRegistry()
+    Loader(dropped, keep_metadata=False).load_bundles([str(bundle)])
+    module = dropped.get("write/1.0")
+    assert module.metadata == {}
+    assert (module.type, module.content) == ("OPERATOR", kept.get("write/1.0").content)
+
+def test_keep_metadata_invalidates_snapshot_records(bundle, tmp_path_factory):
+    snapshot = str(tmp_path_factory.mktemp("snap") / "registry.pickle")
+    Loader(PromptModuleRegistry(), snapshot_path=snapshot, keep_metadata=False).load_bundles([str(bundle)])
+
+    registry = PromptModuleRegistry()
+    Loader(registry, snapshot_path=snapshot).load_bundles([str(bundle)])
+    assert registry.get("write/1.0").metadata["sections"] == ["a", "b"]
+
+def test_agent_without_metadata(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(fixed_response="ok"), keep_metadata=False)
+    assert agent.execute("write/1.0 'Topic'") == "ok"
+
+def test_registry_interns_type_and_version():
+    registry = PromptModuleRegistry()
+    for i in range(2):
+        registry.register(PromptModule(id=f"m{i}", version="".join(["1", ".0"]), type="".join(["OPER", "ATOR"]), content="x"))
+    assert registry.get("m0").type is registry.get("m1").type
+    assert registry.get("m0").version is registry.get("m1").version
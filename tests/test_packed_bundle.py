@@ -0,0 +1,88 @@
+import os
+import pytest
+import yaml
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.loader.loader import Loader, is_pack_file, pack_bundle
+from dcl_agent.loader.pack import main as pack_main
+from dcl_agent.loader.registry import PromptModuleRegistry
+
+PNG = b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR" + bytes(range(256)) * 4
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "bundle"
+    (root / "ops").mkdir(parents=True)
+    (root / "index.yaml").write_text(yaml.dump({"aliases": {"ops": {"WRITE": "write/1.0"}}}), encoding="utf-8")
+    (root / "ops" / "write.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.", encoding="utf-8")
+    (root / "diagram.png").write_bytes(PNG)
+    (root / "notes.txt").write_text("Notes " * 500, encoding="utf-8")
+    return root
+
+def load(*paths, **kwargs):
+    registry = PromptModuleRegistry()
+    loader = Loader(registry, **kwargs)
+    loader.load_bundles([str(p) for p in paths])
+    return loader
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_pack_loads_like_the_directory(bundle, tmp_path, compress):
+    pack_path = tmp_path / "bundle.dclpack"
+    assert pack_bundle(str(bundle), str(pack_path), compress=compress) == 3
+    assert is_pack_file(pack_path) and not is_pack_file(bundle)
+
+    expected, actual = load(bundle).registry, load(pack_path).registry
+    assert actual.list_modules() == expected.list_modules()
+    assert dict(actual._aliases) == dict(expected._aliases)
+    for module_id in expected.list_modules():
+        assert actual.get(module_id).content == expected.get(module_id).content
+        assert actual.get(module_id).token_count == expected.get(module_id).token_count
+    assert bytes(actual.get("bundle/diagram.png").data) == PNG
+    assert "content: Write." in actual.get("WRITE").content
+    assert actual.get("bundle/notes.txt").path == os.path.join("bundle", "notes.txt")
+
+def test_compression_shrinks_text(bundle, tmp_path):
+    pack_bundle(str(bundle), str(tmp_path / "plain.dclpack"))
+    pack_bundle(str(bundle), str(tmp_path / "small.dclpack"), compress=True)
+    assert (tmp_path / "small.dclpack").stat().st_size < (tmp_path / "plain.dclpack").stat().st_size
+
+def test_first_wins_across_packs_and_directories(bundle, tmp_path):
+    pack_path = tmp_path / "bundle.dclpack"
+    pack_bundle(str(bundle), str(pack_path))
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "write.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Other.", encoding="utf-8")
+
+    assert "Write." in load(pack_path, other).registry.get("write/1.0").content
+    assert "Other." in load(other, pack_path).registry.get("write/1.0").content
+
+def test_load_from_directory_accepts_a_pack(bundle, tmp_path):
+    pack_path = tmp_path / "bundle.dclpack"
+    pack_bundle(str(bundle), str(pack_path))
+    loader = Loader(PromptModuleRegistry())
+    loader.load_from_directory(str(pack_path))
+    assert len(loader.registry.list_modules()) == 3
+    assert loader.registry.get("WRITE") is None # like directories: no index.yaml aliases
+
+def test_reload_picks_up_a_rebuilt_pack(bundle, tmp_path):
+    pack_path = tmp_path / "bundle.dclpack"
+    pack_bundle(str(bundle), str(pack_path))
+    loader = load(pack_path)
+    assert not loader.reload()
+
+    (bundle / "ops" / "write.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write v2.", encoding="utf-8")
+    pack_bundle(str(bundle), str(pack_path))
+    stat = pack_path.stat()
+    os.utime(pack_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    result = loader.reload()
+    assert "write/1.0" in result.changed
+    assert "Write v2." in loader.registry.get("WRITE").content
+
+def test_agent_and_cli(bundle, tmp_path, capsys):
+    pack_main([str(bundle), "--output-dir", str(tmp_path / "out"), "--compress"])
+    pack_path = tmp_path / "out" / "bundle.dclpack"
+    assert "3 modules" in capsys.readouterr().out
+
+    agent = DCLAgent(bundles=str(pack_path), adapter=MockLLMAdapter())
+    agent.execute("WRITE 'Topic'")
+    assert any("Write." in frame.content for frame in agent.adapter.last_context.frames)
@@ -51,3 +51,24 @@ def test_invalid_syntax(parser):
     text = "INVALID SYNTAX HERE"
     with pytest.raises(UnexpectedToken):
         parser.parse(text)
+
+def test_grammar_compiled_once():
+    assert DCLParser().parser is DCLParser().parser
+
+def test_parse_cache_returns_cached_instruction():
+    parser = DCLParser(cache_size=1)
+    text = "WRITE 'Code' USING Lens('l1')"
+
+    first = parser.parse(text)
+    assert parser.parse(text) is first
+    assert first.original_dcl_instruction == text
+
+    parser.parse("WRITE 'Other'")
+    assert parser.parse(text) is not first # evicted
+    assert parser.cache.stats().evictions == 2
+
+def test_parse_cache_does_not_store_errors():
+    parser = DCLParser(cache_size=4)
+    with pytest.raises(UnexpectedToken):
+        parser.parse("INVALID SYNTAX HERE")
+    assert len(parser.cache) == 0
@@ -0,0 +1,107 @@
+import importlib.metadata
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.exceptions import DCLConfigurationError
+from dcl_agent.plugins import PluginRegistry, create_adapter, create_strategy
+from dcl_agent.strategies.budget import DEFAULT_MAX_TOKENS
+from dcl_agent.strategies.concat import ConcatenationStrategy
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+@pytest.fixture
+def bundle(tmp_path):
+    (tmp_path / "op.md").write_text("Write.", encoding="utf-8")
+    return tmp_path
+
+def test_import_does_not_load_heavy_dependencies():
+    out = run_python(
+        "import sys, dcl_agent, dcl_agent.agent, dcl_agent.plugins\n"
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('lark', 'yaml', 'google', 'asyncio', 'argparse')))"
+    ).stdout
+    assert out.strip() == "[]"
+
+def test_import_time_budget():
+    # Generous: the point is to catch heavy dependencies creeping back in
+    # (google-genai alone costs several hundred milliseconds).
+    stderr = run_python("import dcl_agent.agent", "-X", "importtime").stderr
+    cumulative_us = next(
+        int(line.split("|")[1]) for line in stderr.splitlines()
+        if line.split("|")[-1].strip() == "dcl_agent.agent"
+    )
+    assert cumulative_us < 500_000
+
+def test_default_adapter_is_built_on_first_use(bundle):
+    out = run_python(
+        "import sys\n"
+        "from dcl_agent.agent import DCLAgent\n"
+        f"agent = DCLAgent(bundles={str(bundle)!r})\n"
+        "agent.build_context(\"op 'x'\")\n"
+        "print('google.genai' in sys.modules, agent._adapter)"
+    ).stdout
+    assert out.strip() == "False None"
+
+def test_agent_accepts_plugin_names(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter="mock", strategy="concat")
+    assert isinstance(agent.adapter, MockLLMAdapter)
+    assert isinstance(agent.strategy, ConcatenationStrategy)
+    assert agent.execute("op 'x'")
+
+def test_builtins_need_no_arguments(bundle):
+    for name in ("gemini", "concat", "budget"):
+        assert create_strategy(name)
+    agent = DCLAgent(bundles=str(bundle), adapter="mock", strategy="budget")
+    assert agent.strategy.max_tokens == DEFAULT_MAX_TOKENS
+    assert agent.execute("op 'x'")
+
+def test_create_with_kwargs_and_unknown_name():
+    assert create_adapter("mock", fixed_response="hi").fixed_response == "hi"
+    assert create_strategy("budget", max_tokens=100).max_tokens == 100
+    with pytest.raises(DCLConfigurationError, match="Unknown adapter 'nope'"):
+        create_adapter("nope")
+
+def test_register_string_factory_is_imported_lazily():
+    registry = PluginRegistry("adapter", "dcl_agent.test_adapters", {})
+    registry.register("mock", "dcl_agent.adapter.mock:MockLLMAdapter")
+    assert registry._factories["mock"] == "dcl_agent.adapter.mock:MockLLMAdapter"
+    assert registry.get("mock") is MockLLMAdapter
+    assert registry._factories["mock"] is MockLLMAdapter
+
+class Outer:
+    class Adapter(MockLLMAdapter):
+        pass
+
+def test_dotted_attributes():
+    registry = PluginRegistry("adapter", "dcl_agent.test_adapters", {"outer": f"{__name__}:Outer.Adapter"})
+    assert registry.get("outer") is Outer.Adapter
+
+def test_entry_points_are_loaded_as_entry_points(monkeypatch):
+    entry_points = [
+        importlib.metadata.EntryPoint("outer", f"{__name__}:Outer.Adapter", "dcl_agent.test_adapters"),
+        importlib.metadata.EntryPoint("extras", "dcl_agent.adapter.mock:MockLLMAdapter [extra]", "dcl_agent.test_adapters"),
+    ]
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda group: [e for e in entry_points if e.group == group])
+    registry = PluginRegistry("adapter", "dcl_agent.test_adapters", {})
+    assert registry.get("outer") is Outer.Adapter
+    assert registry.get("extras") is MockLLMAdapter
+
+def test_entry_points(monkeypatch, capsys):
+    entry_points = [
+        importlib.metadata.EntryPoint("echo", "dcl_agent.adapter.mock:MockLLMAdapter", "dcl_agent.test_adapters"),
+        importlib.metadata.EntryPoint("mock", "somewhere.else:Adapter", "dcl_agent.test_adapters"),
+    ]
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda group: [e for e in entry_points if e.group == group])
+    registry = PluginRegistry("adapter", "dcl_agent.test_adapters", {"mock": "dcl_agent.adapter.mock:MockLLMAdapter"})
+    assert registry.get("echo") is MockLLMAdapter
+    # First-Wins: the built-in keeps its name.
+    assert registry.get("mock") is MockLLMAdapter
+    assert registry.names() == ["echo", "mock"]
+    assert "Ignoring adapter entry point 'mock'" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import pytest
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import Entity, Instruction, PromptModule, ResourceRef, digest_frames
+from dcl_agent.strategies.base import zero_context_frame
+from dcl_agent.strategies.concat import ConcatenationStrategy
+from dcl_agent.strategies.gemini import GeminiNativeStrategy
+
+@pytest.fixture
+def registry():
+    reg = PromptModuleRegistry()
+    reg.register(PromptModule(id="write", version="1.0", type="OPERATOR", content="Write a text."))
+    reg.register(PromptModule(id="lens1", version="1.0", type="MODIFIER", content="Be polite."))
+    reg.register(PromptModule(id="goal1", version="1.0", type="GOAL", content="Be brief."))
+    reg.register(PromptModule(id="source1", version="1.0", type="RESOURCE", content="Data 1."))
+    return reg
+
+def instruction(operand, text):
+    return Instruction(
+        action="write",
+        operand=Entity(type="ANY", value=operand),
+        modifiers=[ResourceRef(id="lens1")],
+        goals=[ResourceRef(id="goal1")],
+        sources=[ResourceRef(id="source1")],
+        original_dcl_instruction=text
+    )
+
+def test_gemini_prefix_stable_order(registry):
+    ctx = GeminiNativeStrategy(prefix_stable=True).assemble(instruction("Email", "WRITE 'Email'"), registry)
+
+    assert [f.content for f in ctx.frames] == [
+        zero_context_frame.content, "Write a text.", "Be polite.", "Be brief.",
+        "WRITE 'Email'", "Email", "```source1\nData 1.\n```"
+    ]
+    assert ctx.prefix_frames == 4
+    assert ctx.prefix_fingerprint == digest_frames(ctx.frames[:4])
+
+@pytest.mark.parametrize("strategy_cls", [GeminiNativeStrategy, ConcatenationStrategy])
+def test_prefix_shared_across_requests(registry, strategy_cls):
+    strategy = strategy_cls(prefix_stable=True)
+    a = strategy.assemble(instruction("Email", "WRITE 'Email'"), registry)
+    b = strategy.assemble(instruction("Letter", "WRITE 'Letter'"), registry)
+
+    assert a.prefix_frames == b.prefix_frames > 0
+    assert a.frames[:a.prefix_frames] == b.frames[:b.prefix_frames]
+    assert a.prefix_fingerprint == b.prefix_fingerprint
+    assert a.frames != b.frames
+
+def test_concat_prefix_stable_frames(registry):
+    ctx = ConcatenationStrategy(prefix_stable=True).assemble(instruction("Email", "WRITE 'Email'"), registry)
+
+    assert len(ctx.frames) == 2 and ctx.prefix_frames == 1
+    prefix, request = (f.content for f in ctx.frames)
+    assert prefix.startswith(zero_context_frame.content)
+    assert "--- OPERATOR: write ---" in prefix and "Goal: Be brief." in prefix
+    assert "WRITE 'Email'" not in prefix and "Data 1." not in prefix
+    assert request.startswith("WRITE 'Email'") and request.endswith("Target: Email")
+
+def test_default_order_has_no_prefix(registry):
+    ctx = GeminiNativeStrategy().assemble(instruction("Email", "WRITE 'Email'"), registry)
+    assert ctx.frames[0].content == "WRITE 'Email'"
+    assert ctx.prefix_frames == 0 and ctx.prefix_fingerprint is None
+
+def test_agent_with_prefix_stable_strategy(tmp_path):
+    (tmp_path / "op.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.", encoding="utf-8")
+    adapter = MockLLMAdapter()
+    agent = DCLAgent(bundles=str(tmp_path), adapter=adapter, strategy=GeminiNativeStrategy(prefix_stable=True))
+
+    agent.execute("write/1.0 'One'")
+    first = adapter.last_context
+    agent.execute("write/1.0 'Two'")
+
+    assert first.prefix_frames == 2
+    assert first.prefix_fingerprint == adapter.last_context.prefix_fingerprint
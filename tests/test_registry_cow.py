@@ -0,0 +1,142 @@
+import threading
+import pytest
+from dcl_agent.exceptions import DuplicateIdWarning
+from dcl_agent.loader.content_store import ContentStore
+from dcl_agent.loader.index import RegistryIndex
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import PromptModule
+
+def module(module_id, content="c", module_type="OPERATOR"):
+    return PromptModule(id=module_id, version="1.0", type=module_type, content=content)
+
+def test_views_are_immutable():
+    registry = PromptModuleRegistry()
+    registry.register(module("a/1.0"))
+    view = registry.view()
+
+    registry.register(module("b/1.0"))
+    registry.register_alias("B", "b/1.0")
+
+    assert view.list_modules() == ["a/1.0"]
+    assert view.get("B") is None and view.get("b@latest") is None
+    assert view.list_modules(module_type="OPERATOR") == ["a/1.0"]
+    assert registry.get("B").id == "b/1.0"
+    # Both writes are published together, by the read that follows them.
+    assert registry.generation == view.generation + 1
+
+def test_single_writes_copy_once_per_read(monkeypatch):
+    registry = PromptModuleRegistry()
+    registry.register(module("a/1.0"))
+    registry.get("a/1.0")
+
+    copies = []
+    original = RegistryIndex.copy
+    monkeypatch.setattr(RegistryIndex, "copy", lambda self: copies.append(1) or original(self))
+    for i in range(100):
+        registry.register(module(f"m{i}/1.0"))
+    with pytest.warns(DuplicateIdWarning):
+        registry.register(module("a/1.0"))
+    assert len(copies) == 1
+
+    assert len(registry.list_modules()) == 101
+    registry.register(module("z/1.0"))
+    assert len(copies) == 2
+
+def test_duplicate_does_not_bump_generation():
+    registry = PromptModuleRegistry()
+    registry.register(module("a/1.0"))
+    generation = registry.generation
+    with pytest.warns(DuplicateIdWarning):
+        registry.register(module("a/1.0", content="other"))
+    assert registry.generation == generation
+    assert registry.get("a/1.0").content == "c"
+
+def test_transaction_publishes_once():
+    registry = PromptModuleRegistry()
+    generation = registry.generation
+    with registry.transaction():
+        registry.register(module("a/1.0"))
+        with registry.transaction(): # nested: joins the outer one
+            registry.register(module("b/1.0"))
+        registry.register_alias("A", "a/1.0")
+        assert registry.get("A") is None # not published yet
+        assert registry.list_modules() == []
+    assert registry.generation == generation + 1
+    assert registry.get("A").id == "a/1.0"
+    assert registry.list_modules() == ["a/1.0", "b/1.0"]
+
+def test_empty_transaction_keeps_generation():
+    registry = PromptModuleRegistry()
+    with registry.transaction():
+        pass
+    assert registry.generation == 0
+
+def test_failed_transaction_is_discarded():
+    store = ContentStore()
+    registry = PromptModuleRegistry(content_store=store)
+    registry.register(module("a/1.0", content="kept"))
+    with pytest.raises(RuntimeError):
+        with registry.transaction():
+            registry.register(module("b/1.0", content="dropped"))
+            raise RuntimeError("boom")
+    assert registry.list_modules() == ["a/1.0"]
+    assert registry.generation == 1
+    assert store.stats().unique == 1 # the discarded content was released
+
+def test_writers_wait_for_transaction():
+    registry = PromptModuleRegistry()
+    started, done = threading.Event(), threading.Event()
+
+    def writer():
+        started.set()
+        registry.register(module("other/1.0"))
+        done.set()
+
+    with registry.transaction():
+        registry.register(module("a/1.0"))
+        thread = threading.Thread(target=writer)
+        thread.start()
+        started.wait()
+        assert not done.wait(0.1)
+    thread.join()
+    assert registry.list_modules() == ["a/1.0", "other/1.0"]
+
+def test_concurrent_readers_see_consistent_generations(tmp_path):
+    registry = PromptModuleRegistry()
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            view = registry.view()
+            try:
+                ids = view.list_modules()
+                # Every batch registers a module and its alias together.
+                for module_id in ids:
+                    assert view.get(f"ALIAS_{module_id}").id == module_id
+                assert len(view.list_modules(module_type="OPERATOR")) == len(ids)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(300):
+        with registry.transaction():
+            registry.register(module(f"m{i}/1.0"))
+            registry.register_alias(f"ALIAS_m{i}/1.0", f"m{i}/1.0")
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(registry.list_modules()) == 300
+
+def test_load_publishes_one_generation(tmp_path):
+    for i in range(20):
+        (tmp_path / f"op{i}.md").write_text(f"op {i}", encoding="utf-8")
+    registry = PromptModuleRegistry()
+    Loader(registry).load_bundles([str(tmp_path)])
+    assert registry.generation == 1
+    assert len(registry.list_modules()) == 20
@@ -0,0 +1,95 @@
+import pytest
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.loader.index import VersionSpec, version_key
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import PromptModule
+
+def module(name, version, module_type="OPERATOR"):
+    return PromptModule(id=f"{name}/{version}", version=version, type=module_type, content=f"{name} {version}")
+
+@pytest.fixture
+def registry():
+    reg = PromptModuleRegistry()
+    for version in ("8.1", "8.2", "8.10", "9.0-beta", "7.5"):
+        reg.register(module("god/operations/refine", version))
+    reg.register(module("god/operations/write", "1.0"))
+    reg.register(module("god/lenses/tone", "2.0", "MODIFIER"))
+    reg.register(module("core/lenses/dcl", "22.2", "MODIFIER"))
+    reg.register_alias("REFINE", "god/operations/refine/8.1")
+    return reg
+
+def test_version_key_ordering():
+    ordered = ["1.0-alpha", "1.0", "1.0.1", "1.2", "1.10", "v2"]
+    assert sorted(ordered, key=version_key) == ordered
+    assert version_key("1.0") == version_key("1.0.0")
+    assert version_key("draft") < version_key("0.1")
+
+@pytest.mark.parametrize("spec,expected", [
+    ("latest", "8.10"),
+    ("8.2", "8.2"),
+    ("^8.1", "8.10"),
+    ("~8.1", "8.1"),
+    (">=8.0,<8.5", "8.2"),
+    ("<8", "7.5"),
+    ("8.x", "8.10"),
+    (">8.10", None),
+    (">=9.0-alpha", "9.0-beta"),
+    (">=10", None),
+    ("^foo", None),
+    ("~foo,<9", None),
+])
+def test_version_queries(registry, spec, expected):
+    module = registry.get(f"god/operations/refine@{spec}")
+    assert (module.version if module else None) == expected
+
+def test_query_through_alias(registry):
+    assert registry.get("REFINE@latest").version == "8.10"
+    assert registry.get("god/operations/refine/8.1@latest").version == "8.10"
+
+def test_exact_lookups_unchanged(registry):
+    assert registry.get("god/operations/refine/8.2").content == "god/operations/refine 8.2"
+    assert registry.get("missing@latest") is None
+
+def test_list_by_type_and_prefix(registry):
+    assert registry.list_modules(module_type="MODIFIER") == ["god/lenses/tone/2.0", "core/lenses/dcl/22.2"]
+    assert registry.list_modules(prefix="god/operations/write") == ["god/operations/write/1.0"]
+    assert sorted(registry.list_modules(prefix="god/")) == sorted(
+        [m for m in registry.list_modules() if m.startswith("god/")]
+    )
+    assert registry.list_modules(module_type="MODIFIER", prefix="god") == ["god/lenses/tone/2.0"]
+    assert registry.list_modules(prefix="go") == [] # whole segments only
+    assert registry.versions("god/operations/refine")[-1] == "god/operations/refine/9.0-beta"
+
+def test_indexes_follow_reload(tmp_path):
+    (tmp_path / "op.yaml").write_text("id: ops/write\nversion: 1.0\ntype: OPERATOR\ncontent: v1", encoding="utf-8")
+    registry = PromptModuleRegistry()
+    loader = Loader(registry)
+    loader.load_bundles([str(tmp_path)])
+    view = registry.view()
+
+    (tmp_path / "op2.yaml").write_text("id: ops/write\nversion: 1.1\ntype: OPERATOR\ncontent: v2", encoding="utf-8")
+    loader.reload()
+
+    assert registry.get("ops/write@latest").version == "1.1"
+    assert view.get("ops/write@latest").version == "1.0"
+    assert registry.list_modules(module_type="OPERATOR") == ["ops/write/1.0", "ops/write/1.1"]
+
+def test_unquoted_version_query_in_instruction(tmp_path):
+    for version in ("1.0", "1.1"):
+        (tmp_path / f"op{version}.yaml").write_text(
+            f"id: ops/write\nversion: {version}\ntype: OPERATOR\ncontent: v{version}", encoding="utf-8"
+        )
+    adapter = MockLLMAdapter()
+    DCLAgent(bundles=str(tmp_path), adapter=adapter).execute("ops/write@latest 'Topic'")
+    assert adapter.last_context.frames[2].content == "id: ops/write\nversion: 1.1\ntype: OPERATOR\ncontent: v1.1"
+
+def test_malformed_range_matches_nothing():
+    spec = VersionSpec("^foo")
+    assert not spec.matches(version_key("foo"))
+    assert not spec.matches(version_key("1.0"))
+
+def test_version_spec_bounds():
+    spec = VersionSpec("^0.2.3")
+    assert spec.matches(version_key("0.2.9")) and not spec.matches(version_key("0.3"))
@@ -0,0 +1,157 @@
+import mmap
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import yaml
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.exceptions import DCLConfigurationError
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.pack import RegistryPack, pack_registry
+from dcl_agent.loader import registry as registry_module
+from dcl_agent.loader.registry import PromptModuleRegistry
+
+PNG = b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR" + bytes(range(256)) * 4
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "bundle"
+    root.mkdir()
+    (root / "index.yaml").write_text(yaml.dump({"aliases": {"WRITE": "write/1.0"}}), encoding="utf-8")
+    (root / "op.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.", encoding="utf-8")
+    (root / "diagram.png").write_bytes(PNG)
+    (root / "notes.txt").write_text("Заметки " * 2000, encoding="utf-8")
+    (root / "copy.txt").write_text("Заметки " * 2000, encoding="utf-8")
+    return root
+
+@pytest.fixture
+def source(bundle):
+    registry = PromptModuleRegistry()
+    Loader(registry, lazy=True).load_bundles([str(bundle)])
+    return registry
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(source, tmp_path, compress):
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path), compress=compress)
+
+    registry = PromptModuleRegistry()
+    with RegistryPack(str(path)) as pack:
+        registry.attach_pack(pack)
+        assert registry.list_modules() == source.list_modules()
+        assert registry.get("WRITE").id == "write/1.0"
+        for module_id in source.list_modules():
+            expected, actual = source.get(module_id), registry.get(module_id)
+            assert (actual.type, actual.version, actual.token_count) == (expected.type, expected.version, expected.token_count)
+            assert actual.content == expected.content
+            assert actual.is_blob == expected.is_blob
+            if actual.is_blob:
+                assert bytes(actual.data) == PNG
+        # Stored entries only hold the index; bodies stay in the pack.
+        assert registry._modules["bundle/notes.txt"].content is None
+
+def test_bodies_are_views_into_the_shared_mapping(source, tmp_path):
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path))
+    # Equal bodies are stored once.
+    assert path.stat().st_size < len(("Заметки " * 2000).encode("utf-8")) * 2
+
+    pack = RegistryPack(str(path))
+    registry = PromptModuleRegistry()
+    registry.attach_pack(pack)
+    data = registry.get("bundle/diagram.png").data
+    assert data.readonly and isinstance(data.obj, mmap.mmap)
+    notes, copy = registry._modules["bundle/notes.txt"], registry._modules["bundle/copy.txt"]
+    assert notes.packed.offset == copy.packed.offset
+    pack.close() # views handed out stay valid
+    assert bytes(data) == PNG
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_bodies_are_decoded_once(source, tmp_path, monkeypatch, compress):
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path), compress=compress)
+    registry = PromptModuleRegistry()
+    registry.attach_pack(RegistryPack(str(path)))
+
+    reads = []
+    original = RegistryPack.read
+
+    def counting(self, offset, length, compressed=False):
+        reads.append(offset)
+        return original(self, offset, length, compressed)
+
+    monkeypatch.setattr(RegistryPack, "read", counting)
+    notes = registry.get("bundle/notes.txt").content
+    assert registry.get("bundle/notes.txt").content is notes
+    blob = registry.get("bundle/diagram.png").data
+    registry.get("bundle/diagram.png")
+    # Uncompressed blobs are views of the mapping: reading them again costs nothing.
+    assert len(reads) == (2 if compress else 3)
+    assert bytes(blob) == PNG
+
+def test_decoded_text_cache_is_bounded(source, tmp_path, monkeypatch):
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path))
+    monkeypatch.setattr(registry_module, "PACK_TEXT_CACHE_SIZE", 20000)
+    registry = PromptModuleRegistry() # content_cache_size=None: unbounded for files, not for packs
+    registry.attach_pack(RegistryPack(str(path)))
+
+    for module_id in registry.list_modules():
+        registry.get(module_id)
+    assert 0 < registry._pack_text.stats().weight <= 20000
+    assert len(registry.content_cache) == 0
+
+def test_metadata_is_optional(bundle, tmp_path):
+    source = PromptModuleRegistry()
+    Loader(source).load_bundles([str(bundle)])
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path))
+    assert all(m.metadata == {} for m in RegistryPack(str(path)).modules)
+    pack_registry(source, str(path), include_metadata=True)
+    pack = RegistryPack(str(path))
+    assert next(m for m in pack.modules if m.id == "write/1.0").metadata["content"] == "Write."
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "bad.pack").write_bytes(b"not a pack at all, definitely not" * 2)
+    with pytest.raises(DCLConfigurationError):
+        RegistryPack(str(tmp_path / "bad.pack"))
+    (tmp_path / "short.pack").write_bytes(b"DCL")
+    with pytest.raises(DCLConfigurationError):
+        RegistryPack(str(tmp_path / "short.pack"))
+
+def test_first_wins_against_loaded_modules(source, tmp_path, bundle):
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path))
+    registry = PromptModuleRegistry()
+    Loader(registry).load_bundles([str(bundle)])
+    with pytest.warns(Warning):
+        registry.attach_pack(RegistryPack(str(path)))
+    assert registry.get("write/1.0").packed is None
+
+def test_agent_over_a_pack(source, tmp_path):
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path))
+    agent = DCLAgent(bundles=[], adapter=MockLLMAdapter())
+    agent.registry.attach_pack(RegistryPack(str(path)))
+    agent.execute("WRITE 'Topic'")
+    assert any("Write." in frame.content for frame in agent.adapter.last_context.frames)
+
+def test_worker_processes_attach(source, tmp_path):
+    path = tmp_path / "registry.pack"
+    pack_registry(source, str(path))
+    code = (
+        "import sys\n"
+        "from dcl_agent.loader.pack import RegistryPack\n"
+        "from dcl_agent.loader.registry import PromptModuleRegistry\n"
+        "registry = PromptModuleRegistry()\n"
+        "registry.attach_pack(RegistryPack(sys.argv[1]))\n"
+        "print(len(registry.get('bundle/notes.txt').content))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent / "src"))
+    workers = [
+        subprocess.Popen([sys.executable, "-c", code, str(path)], stdout=subprocess.PIPE, text=True, env=env)
+        for _ in range(3)
+    ]
+    assert [w.communicate()[0].strip() for w in workers] == [str(len("Заметки " * 2000))] * 3
@@ -0,0 +1,221 @@
+import socket
+import threading
+import time
+import pytest
+from dcl_agent.adapter.base import ILLMAdapter
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.client import DCLClient
+from dcl_agent.exceptions import DCLServerError
+from dcl_agent.server import create_server, serve_in_thread
+
+@pytest.fixture
+def bundle(tmp_path):
+    root = tmp_path / "bundle"
+    root.mkdir()
+    (root / "op.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.", encoding="utf-8")
+    return root
+
+@pytest.fixture(params=["http", "unix"])
+def client(request, bundle, tmp_path):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(fixed_response="abcdef", chunk_size=2))
+    if request.param == "unix":
+        server = create_server(agent, socket_path=str(tmp_path / "dcl.sock"))
+        client = DCLClient(socket_path=str(tmp_path / "dcl.sock"))
+    else:
+        server = create_server(agent, port=0)
+        client = DCLClient(f"http://127.0.0.1:{server.server_address[1]}")
+    serve_in_thread(server)
+    yield client
+    client.close()
+    server.shutdown()
+    server.server_close()
+    agent.close()
+
+def test_execute_and_health(client):
+    assert client.execute("write/1.0 'Topic'") == "abcdef"
+    health = client.health()
+    assert health["status"] == "ok" and health["modules"] == 1
+
+def test_execute_stream(client):
+    assert list(client.execute_stream("write/1.0 'Topic'")) in (["ab", "cd", "ef"], ["abcdef"], ["abcd", "ef"], ["ab", "cdef"])
+    assert "".join(client.execute_stream("write/1.0 'Topic'")) == "abcdef"
+    assert client.execute("write/1.0 'Again'") == "abcdef" # connection still usable
+
+def test_errors(client):
+    with pytest.raises(DCLServerError) as error:
+        client.execute("NOT VALID DCL !!")
+    assert error.value.status == 400
+    with pytest.raises(DCLServerError):
+        list(client.execute_stream("NOT VALID DCL !!"))
+    assert client.execute("write/1.0 'Topic'") == "abcdef"
+
+def test_execute_many(client):
+    result = client.execute_many(["write/1.0 'a'", "BAD !!", "write/1.0 'b'"])
+    assert result["responses"] == ["abcdef", None, "abcdef"]
+    assert list(result["errors"]) == ["1"]
+    assert result["stats"]["total"] == 3
+
+def test_concurrent_requests(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(fixed_response="ok", delay=0.2))
+    server = create_server(agent, port=0)
+    serve_in_thread(server)
+    client = DCLClient(f"http://127.0.0.1:{server.server_address[1]}")
+    results = []
+
+    def call(i):
+        results.append(client.execute(f"write/1.0 'Topic {i}'"))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["ok"] * 10
+    assert time.perf_counter() - start < 1.5 # 10 sequential calls take 2s
+
+    server.shutdown()
+    server.server_close()
+    agent.close()
+
+def test_reload(client, bundle):
+    (bundle / "op2.yaml").write_text("id: refine\nversion: 1.0\ntype: OPERATOR\ncontent: Refine.", encoding="utf-8")
+    assert client.reload()["added"] == ["refine/1.0"]
+    assert client.execute("refine/1.0 'Topic'") == "abcdef"
+    assert client.reload() == {"added": [], "changed": [], "removed": [], "aliases": []}
+
+def test_reload_configuration_error(client, bundle):
+    (bundle / "index.yaml").write_text("aliases:\n  Bad: non_existent\n", encoding="utf-8")
+    with pytest.raises(DCLServerError) as error:
+        client.reload()
+    assert error.value.status == 409
+    assert "InvalidAliasError" in str(error.value)
+    assert client.execute("write/1.0 'Topic'") == "abcdef" # registry untouched
+
+def one_shot_server(reply: bytes):
+    """Raw server: reads each request, answers the first one, drops later ones unanswered."""
+    listener = socket.create_server(("127.0.0.1", 0))
+    requests = []
+    def serve():
+        connection, _ = listener.accept()
+        while True:
+            data = connection.recv(65536)
+            if not data:
+                break
+            requests.append(data)
+            if len(requests) == 1:
+                connection.sendall(reply)
+            else:
+                connection.close()
+                break
+        try:
+            while True: # a reconnect would be accepted (and counted) here
+                connection, _ = listener.accept()
+                data = connection.recv(65536)
+                if not data:
+                    break
+                requests.append(data)
+                connection.close()
+        except OSError:
+            pass
+    threading.Thread(target=serve, daemon=True).start()
+    return listener, requests
+
+def test_sent_post_is_not_retried():
+    body = b'{"response": "a"}'
+    reply = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    listener, requests = one_shot_server(reply)
+    client = DCLClient(f"http://127.0.0.1:{listener.getsockname()[1]}")
+    try:
+        assert client.execute("first") == "a"
+        # Dropped after the request went out: it may have run, so no retry.
+        with pytest.raises(ConnectionError):
+            client.execute("second")
+        time.sleep(0.2)
+        assert len(requests) == 2
+    finally:
+        client.close()
+        listener.close()
+
+class FailingStreamAdapter(ILLMAdapter):
+    def invoke(self, context):
+        return "unused"
+
+    def invoke_stream(self, context):
+        yield "partial"
+        raise RuntimeError("upstream died")
+
+def start(agent, **kwargs):
+    server = create_server(agent, port=0, **kwargs)
+    serve_in_thread(server)
+    return server, DCLClient(f"http://127.0.0.1:{server.server_address[1]}")
+
+def test_stream_decodes_characters_split_across_reads(bundle):
+    text = "Привет, мир! " * 20000 # ~470 kB of two-byte characters
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(fixed_response=text, chunk_size=7001))
+    server, client = start(agent)
+    try:
+        received = "".join(client.execute_stream("write/1.0 'Topic'"))
+        assert "�" not in received
+        assert received == text
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+def test_mid_stream_error_aborts_the_response(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter=FailingStreamAdapter())
+    server, client = start(agent)
+    try:
+        with pytest.raises(DCLServerError) as error:
+            list(client.execute_stream("write/1.0 'Topic'"))
+        assert error.value.status == 502
+        assert client.health()["status"] == "ok" # reconnects
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+def test_close_does_not_wait_for_idle_keep_alive_connections(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(fixed_response="ok"))
+    server, client = start(agent)
+    assert client.execute("write/1.0 'Topic'") == "ok" # connection stays open
+    server.shutdown()
+    closer = threading.Thread(target=server.server_close)
+    closer.start()
+    closer.join(5)
+    assert not closer.is_alive()
+    client.close()
+
+def test_close_waits_for_in_flight_requests(bundle):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(fixed_response="ok", delay=0.5))
+    server, client = start(agent)
+    results = []
+    caller = threading.Thread(target=lambda: results.append(client.execute("write/1.0 'Topic'")))
+    caller.start()
+    time.sleep(0.2)
+    server.shutdown()
+    server.server_close()
+    caller.join()
+    assert results == ["ok"]
+
+def test_unix_socket_of_a_live_server_is_not_taken_over(bundle, tmp_path):
+    agent = DCLAgent(bundles=str(bundle), adapter=MockLLMAdapter(fixed_response="ok"))
+    path = str(tmp_path / "dcl.sock")
+    server = create_server(agent, socket_path=path)
+    serve_in_thread(server)
+    try:
+        with pytest.raises(OSError):
+            create_server(agent, socket_path=path)
+        assert DCLClient(socket_path=path).execute("write/1.0 'Topic'") == "ok"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # A stale file (no listener) is replaced.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server = create_server(agent, socket_path=path)
+    server.server_close()
@@ -0,0 +1,99 @@
+import time
+from types import SimpleNamespace
+import pytest
+from dcl_agent.adapter.base import ILLMAdapter
+from dcl_agent.adapter.caching import CachingLLMAdapter
+from dcl_agent.adapter.mock import MockLLMAdapter
+from dcl_agent.agent import DCLAgent
+from dcl_agent.model import InvocationContext, TextFrame
+
+def context():
+    return InvocationContext(frames=[TextFrame(content="x")])
+
+class SyncOnlyAdapter(ILLMAdapter):
+    def invoke(self, context):
+        return "whole"
+
+def test_default_invoke_stream_yields_single_chunk():
+    assert list(SyncOnlyAdapter().invoke_stream(context())) == ["whole"]
+
+def test_mock_stream_chunking():
+    adapter = MockLLMAdapter(fixed_response="abcdefghij", chunk_size=4)
+    assert list(adapter.invoke_stream(context())) == ["abcd", "efgh", "ij"]
+    adapter.chunk_size = None
+    assert list(adapter.invoke_stream(context())) == ["abcdefghij"]
+
+def test_execute_stream_first_chunk_arrives_early(bundle):
+    adapter = MockLLMAdapter(fixed_response="a" * 10, chunk_size=1, chunk_delay=0.05)
+    agent = DCLAgent(bundles=bundle, adapter=adapter)
+
+    start = time.perf_counter()
+    stream = agent.execute_stream("write/1.0 'Topic'")
+    first = next(stream)
+    time_to_first = time.perf_counter() - start
+    rest = list(stream)
+
+    assert first == "a" and "".join(rest) == "a" * 9
+    assert time_to_first < 0.05
+    assert adapter.last_context.frames[3].content == "Topic"
+
+def test_execute_stream_raises_parse_errors_eagerly(bundle):
+    agent = DCLAgent(bundles=bundle, adapter=MockLLMAdapter())
+    with pytest.raises(Exception):
+        agent.execute_stream("NOT VALID DCL !!")
+
+def test_caching_adapter_stores_completed_stream():
+    inner = MockLLMAdapter(fixed_response="streamed", chunk_size=3)
+    adapter = CachingLLMAdapter(inner)
+
+    assert list(adapter.invoke_stream(context())) == ["str", "eam", "ed"]
+    inner.fixed_response = "fresh"
+    assert list(adapter.invoke_stream(context())) == ["streamed"]
+    assert adapter.hits == 1
+
+def test_caching_adapter_skips_abandoned_stream():
+    adapter = CachingLLMAdapter(MockLLMAdapter(fixed_response="streamed", chunk_size=3))
+    stream = adapter.invoke_stream(context())
+    next(stream)
+    stream.close()
+    assert len(adapter) == 0
+
+def test_gemini_invoke_stream():
+    pytest.importorskip("google.genai")
+    from dcl_agent.adapter.gemini import GeminiAdapter
+
+    def generate_content_stream(model, contents, config):
+        yield SimpleNamespace(text="Hel")
+        yield SimpleNamespace(text="lo")
+        yield SimpleNamespace(text=None)
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=generate_content_stream))
+    adapter = GeminiAdapter(api_key="test", model_name="gemini-test", client=client)
+
+    assert list(adapter.invoke_stream(context())) == ["Hel", "lo"]
+
+def test_gemini_invoke_stream_reports_errors():
+    pytest.importorskip("google.genai")
+    from dcl_agent.adapter.gemini import GeminiAdapter
+
+    def generate_content_stream(model, contents, config):
+        yield SimpleNamespace(text="partial")
+        raise RuntimeError("connection reset")
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=generate_content_stream))
+    adapter = GeminiAdapter(api_key="test", client=client)
+
+    assert list(adapter.invoke_stream(context())) == ["partial", "Gemini Error: connection reset"]
+
+def test_caching_adapter_skips_stream_with_trailing_error():
+    class FailingStream(ILLMAdapter):
+        def invoke(self, context):
+            return ""
+
+        def invoke_stream(self, context):
+            yield "partial"
+            yield "Gemini Error: connection reset"
+
+    adapter = CachingLLMAdapter(FailingStream())
+    assert list(adapter.invoke_stream(context()))[-1].startswith("Gemini Error")
+    assert len(adapter) == 0
@@ -0,0 +1,88 @@
+import pytest
+from dcl_agent.loader.loader import Loader
+from dcl_agent.loader.registry import PromptModuleRegistry
+from dcl_agent.model import Entity, Instruction, PromptModule, ResourceRef
+from dcl_agent.strategies.base import zero_context_frame
+from dcl_agent.strategies.budget import TokenBudgetStrategy
+from dcl_agent.strategies.gemini import GeminiNativeStrategy
+from dcl_agent.tokens import estimate_tokens, module_tokens, truncate_to_tokens
+
+def test_estimate_tokens():
+    assert estimate_tokens(None) == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("привет") == 3 # 12 UTF-8 bytes
+
+def test_truncate_to_tokens_keeps_characters_whole():
+    assert truncate_to_tokens("abcdefgh", 1) == "abcd"
+    assert truncate_to_tokens("short", 10) == "short"
+    assert truncate_to_tokens("привет", 1) == "пр"
+
+def test_loader_precomputes_token_counts(tmp_path):
+    (tmp_path / "op.yaml").write_text("id: write\nversion: 1.0\ntype: OPERATOR\ncontent: Write.", encoding="utf-8")
+    (tmp_path / "data.txt").write_text("x" * 400, encoding="utf-8")
+    for lazy in (False, True):
+        registry = PromptModuleRegistry()
+        Loader(registry, lazy=lazy).load_bundles([str(tmp_path)])
+        modules = {module_id: registry._modules[module_id] for module_id in registry.list_modules()}
+        assert modules["write/1.0"].token_count == 14
+        assert modules[f"{tmp_path.name}/data.txt"].token_count == 100
+
+def test_module_tokens_falls_back_to_estimate():
+    module = PromptModule(id="m", version="1", type="MODIFIER", content="x" * 40)
+    assert module_tokens(module) == 10
+
+ZERO = estimate_tokens(zero_context_frame.content)
+
+@pytest.fixture
+def registry():
+    reg = PromptModuleRegistry()
+    reg.register(PromptModule(id="write", version="1.0", type="OPERATOR", content="o" * 400))      # 100 tokens
+    reg.register(PromptModule(id="lens", version="1.0", type="MODIFIER", content="m" * 400))      # 100 tokens
+    reg.register(PromptModule(id="goal", version="1.0", type="GOAL", content="g" * 400))          # 100 tokens
+    reg.register(PromptModule(id="onto", version="1.0", type="MODIFIER", content="s" * 4000))     # 1000 tokens
+    return reg
+
+@pytest.fixture
+def instruction():
+    return Instruction(
+        action="write",
+        operand=Entity(type="ANY", value="Text"),
+        modifiers=[ResourceRef(id="lens")],
+        goals=[ResourceRef(id="goal")],
+        sources=[ResourceRef(id="onto")],
+        original_dcl_instruction="WRITE"
+    )
+
+def test_large_budget_matches_native_strategy(registry, instruction):
+    ctx = TokenBudgetStrategy(max_tokens=100_000).assemble(instruction, registry)
+    native = GeminiNativeStrategy().assemble(instruction, registry)
+    assert ctx.frames == native.frames
+    report = ctx.metadata["token_budget"]
+    assert report["truncated"] == [] and report["dropped"] == []
+    assert report["used_tokens"] == ZERO + 2 + 1 + 1300
+
+def test_source_is_truncated_first(registry, instruction):
+    budget = ZERO + 3 + 300 + 150
+    ctx = TokenBudgetStrategy(max_tokens=budget).assemble(instruction, registry)
+
+    assert ctx.frames[-1].content == "s" * 600
+    report = ctx.metadata["token_budget"]
+    assert report["truncated"] == [{"id": "onto", "role": "source", "tokens": 1000, "kept": 150}]
+    assert report["used_tokens"] == budget
+
+def test_small_remainder_drops_instead_of_truncating(registry, instruction):
+    ctx = TokenBudgetStrategy(max_tokens=ZERO + 3 + 300 + 10).assemble(instruction, registry)
+    assert ctx.metadata["token_budget"]["dropped"] == [{"id": "onto", "role": "source", "tokens": 1000}]
+    assert all("s" not in frame.content[:1] for frame in ctx.frames)
+
+def test_priority_order(registry, instruction):
+    ctx = TokenBudgetStrategy(max_tokens=ZERO + 3 + 150, truncate=False).assemble(instruction, registry)
+    report = ctx.metadata["token_budget"]
+    assert [d["id"] for d in report["dropped"]] == ["lens", "goal", "onto"]
+    assert "o" * 400 in [frame.content for frame in ctx.frames]
+
+def test_prefix_stable_budget(registry, instruction):
+    ctx = TokenBudgetStrategy(max_tokens=100_000, prefix_stable=True).assemble(instruction, registry)
+    assert ctx.prefix_frames == 4
+    assert ctx.frames[4].content == "WRITE"